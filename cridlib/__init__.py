@@ -1,15 +1,28 @@
 """Generate RaBe Content Reference Idenitifier Spcification (CRID) Identifiers.
 
-* [`cridlib.get(timestamp=None, fragment='')`](./get/#cridlib.get.get)
+* [`cridlib.get(timestamp=None, fragment='', show=None)`](./get/#cridlib.get.get)
+* [`cridlib.aget(timestamp=None, fragment='', show=None)`](./get/#cridlib.get.aget)
+* [`cridlib.get_many(timestamps, fragment='')`](./get/#cridlib.get.get_many)
 * [`cridlib.parse(value)`](./parse/#gridlib.parse.parse)
+* [`cridlib.parse_many(values)`](./parse/#cridlib.parse.parse_many)
+* [`cridlib.parse_file(path)`](./parse/#cridlib.parse.parse_file)
+* [`cridlib.prefetch(start, end)`](./prefetch/#cridlib.prefetch.prefetch)
 """
 
-from .get import get
+from .batch import CRIDBatch
+from .get import aget, get, get_many
 from .lib import CRIDError
-from .parse import parse
+from .parse import parse, parse_file, parse_many
+from .prefetch import prefetch
 
 __all__ = [
+    "CRIDBatch",
     "CRIDError",
+    "aget",
     "get",
+    "get_many",
     "parse",
+    "parse_file",
+    "parse_many",
+    "prefetch",
 ]
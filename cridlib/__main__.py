@@ -0,0 +1,5 @@
+"""Run the command line interface with `python -m cridlib`."""
+
+from .cli import main
+
+raise SystemExit(main())
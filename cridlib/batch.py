@@ -0,0 +1,171 @@
+"""Columnar storage for many CRIDs."""
+
+from __future__ import annotations
+
+from array import array
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Self
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .lib import CRID
+
+_EPOCH = datetime(1970, 1, 1)  # noqa: DTZ001
+_MILLISECOND = timedelta(milliseconds=1)
+
+NO_SHOW = -1
+"""Show code for CRIDs without a show."""
+NO_START = -(2**63)
+"""Start value for CRIDs without a start time, `NaT` in NumPy."""
+
+
+class CRIDBatch:
+    """Show and start times of many CRIDs stored in columns.
+
+    Shows are dictionary encoded, `show_codes` holds an index into `shows`
+    for every CRID. Start times are stored as milliseconds since the epoch.
+    Both columns are compact [`array`](https://docs.python.org/3/library/array.html)
+    instances that can be viewed as NumPy arrays without copying.
+
+    Examples
+    --------
+        ```python
+        >>> from cridlib import parse_many
+        >>> batch = CRIDBatch.from_crids(parse_many([
+        ...     "crid://rabe.ch/v1/klangbecken#t=clock=19930301T000000.00Z",
+        ...     "crid://rabe.ch/v1/info#t=clock=19930301T110000.00Z",
+        ...     "crid://rabe.ch/v1/klangbecken#t=clock=19930301T120000.00Z",
+        ... ]))
+        >>> len(batch), batch.shows
+        (3, ['klangbecken', 'info'])
+        >>> list(batch.show_codes)
+        [0, 1, 0]
+        >>> batch.count_by_show()
+        {'klangbecken': 2, 'info': 1}
+
+        ```
+
+    """
+
+    __slots__ = ("_show_index", "show_codes", "shows", "starts")
+
+    def __init__(self: Self) -> None:
+        """Create new empty batch."""
+        self.shows: list[str] = []
+        self.show_codes = array("l")
+        self.starts = array("q")
+        self._show_index: dict[str, int] = {}
+
+    @classmethod
+    def from_crids(cls: type[Self], crids: Iterable[CRID]) -> Self:
+        """Create new batch from CRIDs.
+
+        Args:
+        ----
+            crids: CRIDs to add, i.e. from [`parse_many`][cridlib.parse.parse_many].
+
+        Returns:
+        -------
+            The new batch.
+
+        """
+        batch = cls()
+        batch.extend(crids)
+        return batch
+
+    def __len__(self: Self) -> int:
+        """Return number of CRIDs in batch."""
+        return len(self.show_codes)
+
+    def append(self: Self, crid: CRID) -> None:
+        """Add a CRID to the batch.
+
+        Args:
+        ----
+            crid: CRID to add.
+
+        """
+        _show = crid.show
+        if _show is None:
+            self.show_codes.append(NO_SHOW)
+        else:
+            _code = self._show_index.get(_show)
+            if _code is None:
+                _code = self._show_index[_show] = len(self.shows)
+                self.shows.append(_show)
+            self.show_codes.append(_code)
+        _start = crid.start
+        self.starts.append(
+            NO_START if _start is None else (_start - _EPOCH) // _MILLISECOND,
+        )
+
+    def extend(self: Self, crids: Iterable[CRID]) -> None:
+        """Add many CRIDs to the batch.
+
+        Args:
+        ----
+            crids: CRIDs to add.
+
+        """
+        for _crid in crids:
+            self.append(_crid)
+
+    def count_by_show(self: Self) -> dict[str, int]:
+        """Count CRIDs per show, CRIDs without a show are not counted.
+
+        Returns
+        -------
+            Number of CRIDs per show.
+
+        """
+        _counts = [0] * len(self.shows)
+        for _code in self.show_codes:
+            if _code != NO_SHOW:
+                _counts[_code] += 1
+        return dict(zip(self.shows, _counts, strict=True))
+
+    def to_numpy(self: Self) -> dict[str, Any]:
+        """Get the columns as NumPy arrays.
+
+        The arrays share memory with the batch, they need to be copied if the
+        batch is changed afterwards. Needs the `numpy` extra.
+
+        Returns
+        -------
+            `show_codes` as integer array and `starts` as `datetime64[ms]`
+            array with `NaT` for CRIDs without a start time.
+
+        """
+        import numpy as np  # noqa: PLC0415 optional dependency
+
+        _codes = np.frombuffer(self.show_codes, dtype=self.show_codes.typecode)
+        _starts = np.frombuffer(self.starts, dtype=np.int64)
+        return {"show_codes": _codes, "starts": _starts.view("datetime64[ms]")}
+
+    def to_pandas(self: Self) -> Any:  # noqa: ANN401
+        """Get the batch as pandas DataFrame.
+
+        The `show` column is categorical and the `start` column holds
+        timestamps. Needs the `pandas` extra. Use
+        [`pyarrow.Table.from_pandas`](https://arrow.apache.org/docs/python/pandas.html)
+        to get an Arrow table with a dictionary encoded `show` column.
+
+        Returns
+        -------
+            DataFrame with `show` and `start` columns.
+
+        """
+        import pandas as pd  # type: ignore[import-untyped]  # noqa: PLC0415
+
+        _columns = self.to_numpy()
+        return pd.DataFrame(
+            {
+                "show": pd.Categorical.from_codes(
+                    _columns["show_codes"],
+                    categories=self.shows,
+                ),
+                "start": _columns["starts"],
+            },
+            copy=False,
+        )
@@ -0,0 +1,101 @@
+"""Circuit breaker for upstream lookups."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Self
+
+
+class CircuitOpenError(Exception):
+    """Lookup skipped because the circuit breaker of the resolver is open."""
+
+
+class CircuitBreaker:
+    """Stop asking an upstream host for a while after it failed repeatedly.
+
+    The breaker opens after `threshold` consecutive failures. While it is
+    open, [`allow`][cridlib.breaker.CircuitBreaker.allow] returns False so
+    lookups fail fast instead of waiting for timeouts and retries. After
+    `reset_timeout` seconds a single trial lookup is allowed, the breaker
+    closes again if it succeeds and stays open for another `reset_timeout`
+    if it fails.
+
+    Examples
+    --------
+        ```python
+        >>> breaker = CircuitBreaker(threshold=2, reset_timeout=30)
+        >>> breaker.record_failure()
+        >>> breaker.allow()
+        True
+        >>> breaker.record_failure()
+        >>> breaker.allow(), breaker.state
+        (False, 'open')
+
+        ```
+
+    """
+
+    def __init__(self: Self, threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        """Create new closed breaker.
+
+        Args:
+        ----
+            threshold: Number of consecutive failures that open the breaker.
+            reset_timeout: Seconds to wait before allowing a trial lookup.
+
+        """
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial = False
+
+    @property
+    def state(self: Self) -> str:
+        """State of the breaker.
+
+        Returns
+        -------
+            `closed` if lookups are allowed, `open` if they get skipped and
+            `half-open` if the next lookup is a trial.
+
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._trial or time.monotonic() - self._opened_at < self.reset_timeout:
+                return "open"
+            return "half-open"
+
+    def allow(self: Self) -> bool:
+        """Check if a lookup may go to the upstream host.
+
+        Returns
+        -------
+            True if the breaker is closed or this is the trial lookup.
+
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial or time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self: Self) -> None:
+        """Close the breaker after a successful lookup."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self: Self) -> None:
+        """Count a failed lookup, opening the breaker if there were too many."""
+        with self._lock:
+            self._failures += 1
+            if self._trial or self._failures >= self.threshold:
+                self._opened_at = time.monotonic()
+                self._trial = False
@@ -0,0 +1,399 @@
+"""Caches for show lookups."""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from bisect import bisect_right, insort
+from collections import OrderedDict
+from typing import TYPE_CHECKING, NamedTuple, Protocol, Self
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class ShowCache(Protocol):
+    """Interface of caches for show lookups by time interval."""
+
+    def get(self: Self, when: datetime) -> str | None:
+        """Get the value for the interval containing `when`."""
+
+    def put(
+        self: Self,
+        start: datetime,
+        end: datetime,
+        value: str,
+        ttl: float | None = None,
+    ) -> None:
+        """Cache `value` for the interval from `start` to `end`."""
+
+    def clear(self: Self) -> None:
+        """Remove all intervals."""
+
+
+class _Entry(NamedTuple):
+    end: float
+    value: str
+    expires: float | None
+
+
+class IntervalCache:
+    """Bounded LRU cache for values that are valid during a time interval.
+
+    Lookups find the interval containing a timestamp with a bisect over the
+    sorted interval starts, so every timestamp inside a cached interval is a
+    hit. Intervals are half-open, i.e. a show ending at 12:00 does not match
+    a lookup for 12:00 when the next show starts then.
+
+    Examples
+    --------
+        ```python
+        >>> from datetime import datetime, timezone
+        >>> cache = IntervalCache(maxsize=10)
+        >>> cache.put(
+        ...     datetime(1993, 3, 1, 13, tzinfo=timezone.utc),
+        ...     datetime(1993, 3, 1, 14, tzinfo=timezone.utc),
+        ...     "test",
+        ... )
+        >>> cache.get(datetime(1993, 3, 1, 13, 12, tzinfo=timezone.utc))
+        'test'
+        >>> cache.get(datetime(1993, 3, 1, 14, tzinfo=timezone.utc)) is None
+        True
+
+        ```
+
+    """
+
+    def __init__(self: Self, maxsize: int = 1024) -> None:
+        """Create new cache.
+
+        Args:
+        ----
+            maxsize: Maximum number of intervals to keep, the least recently
+                used intervals get evicted first.
+
+        """
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._starts: list[float] = []
+        self._entries: OrderedDict[float, _Entry] = OrderedDict()
+
+    def __len__(self: Self) -> int:
+        """Return number of cached intervals."""
+        return len(self._entries)
+
+    def get(self: Self, when: datetime) -> str | None:
+        """Get the value for the interval containing `when`.
+
+        Args:
+        ----
+            when: Timestamp to look up.
+
+        Returns:
+        -------
+            The cached value or None if no valid interval contains `when`.
+
+        """
+        _when = when.timestamp()
+        with self._lock:
+            _idx = bisect_right(self._starts, _when) - 1
+            if _idx < 0:
+                return None
+            _start = self._starts[_idx]
+            _entry = self._entries[_start]
+            if _when >= _entry.end:
+                return None
+            if _entry.expires is not None and _entry.expires <= time.monotonic():
+                self._remove(_start)
+                return None
+            self._entries.move_to_end(_start)
+            return _entry.value
+
+    def put(
+        self: Self,
+        start: datetime,
+        end: datetime,
+        value: str,
+        ttl: float | None = None,
+    ) -> None:
+        """Cache `value` for the interval from `start` to `end`.
+
+        Args:
+        ----
+            start: Start of the interval (inclusive).
+            end: End of the interval (exclusive).
+            value: Value to cache.
+            ttl: Seconds after which the entry expires, None to keep it until
+                it gets evicted.
+
+        """
+        _start = start.timestamp()
+        _expires = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            if _start in self._entries:
+                self._remove(_start)
+            insort(self._starts, _start)
+            self._entries[_start] = _Entry(end.timestamp(), value, _expires)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self: Self) -> None:
+        """Remove all intervals."""
+        with self._lock:
+            self._starts.clear()
+            self._entries.clear()
+
+    def _remove(self: Self, start: float) -> None:
+        del self._entries[start]
+        del self._starts[bisect_right(self._starts, start) - 1]
+
+
+class IntervalIndex:
+    """Immutable index of values that are valid during a time interval.
+
+    Holds a complete schedule, i.e. all shows of the next week, for lookups
+    with a bisect over the sorted interval starts. Intervals are half-open
+    like in [`IntervalCache`][cridlib.cache.IntervalCache].
+
+    Examples
+    --------
+        ```python
+        >>> from datetime import datetime, timezone
+        >>> index = IntervalIndex([
+        ...     (
+        ...         datetime(1993, 3, 1, 13, tzinfo=timezone.utc),
+        ...         datetime(1993, 3, 1, 14, tzinfo=timezone.utc),
+        ...         "test",
+        ...     ),
+        ... ])
+        >>> index.get(datetime(1993, 3, 1, 13, 12, tzinfo=timezone.utc))
+        'test'
+
+        ```
+
+    """
+
+    __slots__ = ("_ends", "_starts", "_values")
+
+    def __init__(
+        self: Self,
+        intervals: Iterable[tuple[datetime, datetime, str]],
+    ) -> None:
+        """Create new index.
+
+        Args:
+        ----
+            intervals: Start, end and value of every interval.
+
+        """
+        _intervals = sorted(
+            (_start.timestamp(), _end.timestamp(), _value)
+            for _start, _end, _value in intervals
+        )
+        self._starts = [_interval[0] for _interval in _intervals]
+        self._ends = [_interval[1] for _interval in _intervals]
+        self._values = [_interval[2] for _interval in _intervals]
+
+    def __len__(self: Self) -> int:
+        """Return number of intervals."""
+        return len(self._starts)
+
+    def get(self: Self, when: datetime) -> str | None:
+        """Get the value for the interval containing `when`.
+
+        Args:
+        ----
+            when: Timestamp to look up.
+
+        Returns:
+        -------
+            The value or None if no interval contains `when`.
+
+        """
+        _when = when.timestamp()
+        _idx = bisect_right(self._starts, _when) - 1
+        if _idx < 0 or _when >= self._ends[_idx]:
+            return None
+        return self._values[_idx]
+
+
+class SQLiteIntervalCache:
+    """Persistent cache for values that are valid during a time interval.
+
+    Works like [`IntervalCache`][cridlib.cache.IntervalCache] but stores the
+    intervals in an SQLite database, so many processes can share the
+    lookups. The database uses write-ahead logging so readers don't block
+    each other or the writer. Expiry uses wall-clock time since it needs to
+    work across processes.
+
+    Errors from the database, i.e. when it stays locked for too long, are
+    logged and treated like cache misses.
+
+    Examples
+    --------
+        ```python
+        >>> from cridlib.strategy import past
+        >>> past.set_cache(SQLiteIntervalCache("/tmp/cridlib.sqlite"))  # doctest: +SKIP
+
+        ```
+
+    """
+
+    # how often puts check if the cache grew too large
+    _EVICT_EVERY = 64
+    # how long a hit keeps its position in the LRU order before it gets updated
+    _TOUCH_AFTER = 60.0
+
+    def __init__(
+        self: Self,
+        path: str | os.PathLike[str],
+        maxsize: int = 100_000,
+        timeout: float = 10.0,
+    ) -> None:
+        """Create new cache.
+
+        Args:
+        ----
+            path: Database file, gets created if missing.
+            maxsize: Maximum number of intervals to keep, the least recently
+                used intervals get evicted first.
+            timeout: Seconds to wait for other processes to unlock the database.
+
+        """
+        self.path = os.fspath(path)
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._pid: int | None = None
+        self._puts = 0
+
+    def __len__(self: Self) -> int:
+        """Return number of cached intervals, 0 if the database can't be read."""
+        with self._lock:
+            try:
+                _conn = self._connect()
+                _row = _conn.execute("SELECT COUNT(*) FROM intervals").fetchone()
+            except sqlite3.Error:
+                logger.exception("Failed to read from %s", self.path)
+                return 0
+            return int(_row[0])
+
+    def get(self: Self, when: datetime) -> str | None:
+        """Get the value for the interval containing `when`.
+
+        Args:
+        ----
+            when: Timestamp to look up.
+
+        Returns:
+        -------
+            The cached value or None if no valid interval contains `when`.
+
+        """
+        _when = when.timestamp()
+        _now = time.time()
+        with self._lock:
+            try:
+                _conn = self._connect()
+                _row = _conn.execute(
+                    "SELECT start, end, value, expires, used FROM intervals"
+                    " WHERE start <= ? ORDER BY start DESC LIMIT 1",
+                    (_when,),
+                ).fetchone()
+                if _row is None or _when >= _row[1]:
+                    return None
+                _start, _, _value, _expires, _used = _row
+                if _expires is not None and _expires <= _now:
+                    _conn.execute("DELETE FROM intervals WHERE start = ?", (_start,))
+                    return None
+                if _used < _now - self._TOUCH_AFTER:
+                    _conn.execute(
+                        "UPDATE intervals SET used = ? WHERE start = ?",
+                        (_now, _start),
+                    )
+            except sqlite3.Error:
+                logger.exception("Failed to read from %s", self.path)
+                return None
+            return str(_value)
+
+    def put(
+        self: Self,
+        start: datetime,
+        end: datetime,
+        value: str,
+        ttl: float | None = None,
+    ) -> None:
+        """Cache `value` for the interval from `start` to `end`.
+
+        Args:
+        ----
+            start: Start of the interval (inclusive).
+            end: End of the interval (exclusive).
+            value: Value to cache.
+            ttl: Seconds after which the entry expires, None to keep it until
+                it gets evicted.
+
+        """
+        _now = time.time()
+        _expires = _now + ttl if ttl is not None else None
+        with self._lock:
+            try:
+                _conn = self._connect()
+                _conn.execute(
+                    "INSERT OR REPLACE INTO intervals VALUES (?, ?, ?, ?, ?)",
+                    (start.timestamp(), end.timestamp(), value, _expires, _now),
+                )
+                self._puts += 1
+                if self._puts % self._EVICT_EVERY == 1:
+                    _conn.execute(
+                        "DELETE FROM intervals WHERE start IN (SELECT start"
+                        " FROM intervals ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                        (self.maxsize,),
+                    )
+            except sqlite3.Error:
+                logger.exception("Failed to write to %s", self.path)
+
+    def clear(self: Self) -> None:
+        """Remove all intervals."""
+        with self._lock:
+            try:
+                self._connect().execute("DELETE FROM intervals")
+            except sqlite3.Error:
+                logger.exception("Failed to write to %s", self.path)
+
+    def close(self: Self) -> None:
+        """Close the database connection, it gets reopened on next use."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+
+    def _connect(self: Self) -> sqlite3.Connection:
+        """Get a connection, connections are not shared with forked children."""
+        if self._conn is None or self._pid != os.getpid():
+            _conn = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            _conn.execute("PRAGMA journal_mode=WAL")
+            _conn.execute("PRAGMA synchronous=NORMAL")
+            _conn.execute(
+                "CREATE TABLE IF NOT EXISTS intervals (start REAL PRIMARY KEY,"
+                " end REAL NOT NULL, value TEXT NOT NULL, expires REAL,"
+                " used REAL NOT NULL)",
+            )
+            _conn.execute(
+                "CREATE INDEX IF NOT EXISTS intervals_used ON intervals (used)",
+            )
+            self._conn = _conn
+            self._pid = os.getpid()
+        return self._conn
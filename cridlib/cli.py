@@ -0,0 +1,226 @@
+"""Command line interface for minting, parsing and validating CRIDs.
+
+Reads one value per line from the given files or stdin and writes one
+result per line to stdout, so a single process can handle a whole
+pipeline:
+
+```bash
+# mint CRIDs for ISO 8601 timestamps, naive timestamps are UTC
+echo 1993-03-01T13:12:00Z | cridlib get
+
+# parse CRIDs into JSON lines on all cores
+cridlib parse --format json --jobs 0 crids.txt
+
+# check CRIDs, exits with 1 if any of them is invalid
+cridlib validate --format csv crids.txt
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import fileinput
+import json
+import sys
+from datetime import datetime, timezone
+from itertools import islice
+from typing import IO, TYPE_CHECKING, Any
+
+from .lib import CRID, CRIDError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+_FIELDS = {
+    "get": ["timestamp", "crid"],
+    "parse": ["crid", "version", "show", "start", "fragment"],
+    "validate": ["line", "value", "valid", "error"],
+}
+_TEXT_FIELDS = {
+    "get": ["crid"],
+    "parse": _FIELDS["parse"],
+    "validate": ["value", "status"],
+}
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the command line interface.
+
+    Args:
+    ----
+        argv: Command line arguments without the program name, defaults to
+            `sys.argv[1:]`.
+
+    Returns:
+    -------
+        Exit code, 1 if some input was invalid.
+
+    """
+    _args = _parser().parse_args(argv)
+    _lines = _read(_args.files)
+    if _args.command == "get":
+        _rows = _get(_lines, _args)
+    elif _args.jobs == 1:
+        _rows = map(_check, _lines)
+    else:
+        _rows = _check_parallel(_lines, _args.jobs)
+    return _write(_args.command, _rows, _args.format, sys.stdout)
+
+
+def _parser() -> argparse.ArgumentParser:
+    _parser = argparse.ArgumentParser(
+        prog="cridlib",
+        description="Mint, parse and validate RaBe CRIDs.",
+    )
+    _commands = _parser.add_subparsers(dest="command", required=True)
+
+    _get = _commands.add_parser("get", help="mint CRIDs for timestamps")
+    _get.add_argument("--fragment", default="", help="fragment to add to CRIDs")
+    _get.add_argument("--show", help="use this show instead of looking it up")
+    _get.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="timestamps to look up together (default: %(default)s)",
+    )
+    _get.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="parallel show lookups per batch (default: one after the other)",
+    )
+
+    for _command, _help in [
+        ("parse", "parse CRIDs into their fields"),
+        ("validate", "check if values are valid CRIDs"),
+    ]:
+        _sub = _commands.add_parser(_command, help=_help)
+        _sub.add_argument(
+            "--jobs",
+            type=int,
+            default=1,
+            help="processes to use, 0 for one per core (default: %(default)s)",
+        )
+
+    for _sub in _commands.choices.values():
+        _sub.add_argument(
+            "--format",
+            choices=["text", "json", "csv"],
+            default="text",
+            help="output format (default: %(default)s)",
+        )
+        _sub.add_argument(
+            "files",
+            nargs="*",
+            help="files to read, - or nothing for stdin",
+        )
+    return _parser
+
+
+def _read(files: list[str]) -> Iterator[tuple[int, str]]:
+    """Get line number and stripped value of every non-empty line."""
+    with fileinput.input(files or ["-"], encoding="utf-8") as _input:
+        for _lineno, _line in enumerate(_input, 1):
+            _value = _line.strip()
+            if _value:
+                yield _lineno, _value
+
+
+def _get(
+    lines: Iterable[tuple[int, str]],
+    args: argparse.Namespace,
+) -> Iterator[dict[str, Any]]:
+    from .get import get, get_many  # noqa: PLC0415
+
+    _lines = iter(lines)
+    while _batch := list(islice(_lines, args.batch_size)):
+        _timestamps = []
+        for _lineno, _value in _batch:
+            try:
+                _timestamps.append(_parse_timestamp(_value))
+            except ValueError:  # noqa: PERF203
+                yield {"line": _lineno, "value": _value, "error": "invalid timestamp"}
+        if args.show is not None:
+            _crids = [get(_ts, args.fragment, show=args.show) for _ts in _timestamps]
+        else:
+            _crids = get_many(_timestamps, args.fragment, max_workers=args.workers)
+        for _ts, _crid in zip(_timestamps, _crids, strict=True):
+            yield {"timestamp": _ts.isoformat(), "crid": str(_crid)}
+
+
+def _parse_timestamp(value: str) -> datetime:
+    _ts = datetime.fromisoformat(value)
+    if _ts.tzinfo is None:
+        return _ts.replace(tzinfo=timezone.utc)
+    return _ts
+
+
+def _check(line: tuple[int, str]) -> dict[str, Any]:
+    """Parse a CRID, runs in worker processes when parsing in parallel."""
+    _lineno, _value = line
+    try:
+        _crid = CRID(_value)
+    except CRIDError as ex:
+        return {
+            "line": _lineno,
+            "value": _value,
+            "valid": False,
+            "error": type(ex).__name__,
+            "status": type(ex).__name__,
+        }
+    return {
+        "line": _lineno,
+        "value": _value,
+        "valid": True,
+        "error": "",
+        "status": "ok",
+        "crid": str(_crid),
+        "version": _crid.version,
+        "show": _crid.show or "",
+        "start": _crid.start.isoformat() if _crid.start else "",
+        "fragment": _crid.fragment or "",
+    }
+
+
+def _check_parallel(
+    lines: Iterable[tuple[int, str]],
+    jobs: int,
+) -> Iterator[dict[str, Any]]:
+    from multiprocessing import Pool  # noqa: PLC0415
+
+    with Pool(jobs or None) as _pool:
+        yield from _pool.imap(_check, lines, chunksize=1000)
+
+
+def _write(
+    command: str,
+    rows: Iterable[dict[str, Any]],
+    output_format: str,
+    out: IO[str],
+) -> int:
+    """Write results, invalid values of get and parse go to stderr."""
+    _fields = _FIELDS[command]
+    _writer = csv.DictWriter(out, _fields, extrasaction="ignore")
+    if output_format == "csv":
+        _writer.writeheader()
+    _status = 0
+    for _row in rows:
+        if _row.get("error"):
+            _status = 1
+            if command != "validate":
+                print(  # noqa: T201
+                    f"line {_row['line']}: {_row['error']}: {_row['value']}",
+                    file=sys.stderr,
+                )
+                continue
+        if output_format == "json":
+            out.write(json.dumps({_field: _row[_field] for _field in _fields}) + "\n")
+        elif output_format == "csv":
+            _writer.writerow(_row)
+        else:
+            out.write(
+                "\t".join(str(_row[_field]) or "-" for _field in _TEXT_FIELDS[command])
+                + "\n",
+            )
+    return _status
@@ -0,0 +1,112 @@
+"""Format and parse the clock code of the t=clock media fragment.
+
+Clock codes look like `19930301T131200.00Z`, a UTC timestamp with a
+resolution of 1/100 of a second. These routines work on the fixed-width
+fields directly instead of going through `strftime` and `strptime` and
+remember the date part of the last timestamp, since bulk minting and
+parsing usually handles many timestamps of the same day in a row.
+
+Examples
+--------
+    ```python
+    >>> from datetime import datetime
+    >>> format_clock(datetime(1993, 3, 1, 13, 12, 0, 123456))
+    '19930301T131200.12Z'
+    >>> parse_clock("19930301T131200.12Z")
+    datetime.datetime(1993, 3, 1, 13, 12, 0, 120000)
+
+    ```
+
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+_DIGITS = frozenset("0123456789")
+
+# ordinal and formatted date of the last formatted timestamp
+_format_date: tuple[int, str] = (0, "")
+# date part and parsed date of the last parsed clock code
+_parse_date: tuple[str, int, int, int] = ("", 0, 0, 0)
+
+
+def format_clock(start: datetime) -> str:
+    """Format a timestamp as clock code.
+
+    The output is the same as that of
+    `f"{start.strftime('%Y%m%dT%H%M%S.%f')[:-4]}Z"`, the timezone of `start`
+    is ignored.
+
+    Args:
+    ----
+        start: Timestamp to format.
+
+    Returns:
+    -------
+        The clock code, including the trailing `Z`.
+
+    """
+    global _format_date  # noqa: PLW0603
+    if start.year < 1000:  # noqa: PLR2004
+        # strftime doesn't zero-pad years before 1000 on every platform
+        return f"{start.strftime('%Y%m%dT%H%M%S.%f')[:-4]}Z"
+    _ordinal = start.toordinal()
+    _cached = _format_date
+    if _cached[0] == _ordinal:
+        _date = _cached[1]
+    else:
+        _date = f"{start.year}{start.month:02d}{start.day:02d}"
+        _format_date = (_ordinal, _date)
+    return (
+        f"{_date}T{start.hour:02d}{start.minute:02d}{start.second:02d}"
+        f".{start.microsecond // 10000:02d}Z"
+    )
+
+
+def parse_clock(clock: str) -> datetime:
+    """Parse a clock code.
+
+    Accepts everything `datetime.strptime(clock, "%Y%m%dT%H%M%S.%fZ")`
+    accepts and returns the same timestamp.
+
+    Args:
+    ----
+        clock: The clock code, including the trailing `Z`.
+
+    Returns:
+    -------
+        The naive timestamp.
+
+    Raises:
+    ------
+        ValueError: If `clock` is not a valid clock code.
+
+    """
+    global _parse_date  # noqa: PLW0603
+    if (
+        len(clock) != 19  # noqa: PLR2004
+        or clock[8] != "T"
+        or clock[15] != "."
+        or clock[18] != "Z"
+        or not _DIGITS.issuperset(clock[:8])
+        or not _DIGITS.issuperset(clock[9:15])
+        or not _DIGITS.issuperset(clock[16:18])
+    ):
+        # uncommon widths of the fields are left to strptime
+        return datetime.strptime(clock, "%Y%m%dT%H%M%S.%fZ")  # noqa: DTZ007
+    _cached = _parse_date
+    if _cached[0] == clock[:8]:
+        _, _year, _month, _day = _cached
+    else:
+        _year, _month, _day = int(clock[0:4]), int(clock[4:6]), int(clock[6:8])
+        _parse_date = (clock[:8], _year, _month, _day)
+    return datetime(  # noqa: DTZ001
+        _year,
+        _month,
+        _day,
+        int(clock[9:11]),
+        int(clock[11:13]),
+        int(clock[13:15]),
+        int(clock[16:18]) * 10000,
+    )
@@ -0,0 +1,469 @@
+"""Local stand-in for the upstream APIs for load tests on offline machines.
+
+[`FakeUpstream`][cridlib.fake.FakeUpstream] serves the parts of the
+[raar](https://github.com/radiorabe/raar) archive, the songticker and
+LibreTime that the strategies use, over real sockets with configurable
+latency, error rate and payload size. All three APIs answer from the same
+generated week [`schedule`][cridlib.fake.schedule], so every timestamp
+has a show and the results of lookups can be checked.
+
+Run it standalone with `python -m cridlib.fake --port 8080 --latency 0.02`
+or from Python, pointing the strategies at it:
+
+Examples
+--------
+    ```python
+    >>> from datetime import datetime, timezone
+    >>> import cridlib
+    >>> from cridlib.strategy import past
+    >>> with FakeUpstream(latency=0.001) as upstream, upstream.redirect():
+    ...     past.clear_cache()
+    ...     str(cridlib.get(datetime(1993, 3, 1, 6, 30, tzinfo=timezone.utc)))
+    'crid://rabe.ch/v1/der-morgen#t=clock=19930301T063000.00Z'
+    >>> upstream.requests
+    Counter({'archive': 1})
+    >>> past.clear_cache()
+
+    ```
+
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+from datetime import time as dtime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any, Self
+from urllib.parse import parse_qs, urlsplit
+from zoneinfo import ZoneInfo
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+    from types import TracebackType
+
+_TZ = ZoneInfo("Europe/Zurich")
+
+# start of every slot of a day in local time, None for slots of rotating shows
+_SLOTS: tuple[tuple[dtime, str | None], ...] = (
+    (dtime(0), "Klangbecken"),
+    (dtime(6), "Der Morgen"),
+    (dtime(9), None),
+    (dtime(11), "Info"),
+    (dtime(11, 30), None),
+    (dtime(13), "Klangbecken"),
+    (dtime(16), None),
+    (dtime(18), "Info"),
+    (dtime(18, 30), None),
+    (dtime(20), None),
+    (dtime(22), "Klangbecken"),
+)
+_SHOWS = (
+    "Bounce",
+    "Jazz Zyt",
+    "La Hora Latina",
+    "Punk Rock Pyjama",
+    "Rabe am Mittag",
+    "Radio Tonfall",
+    "Sounds of Silence",
+    "Subcity Radio",
+    "Sunday Special",
+    "World Music Box",
+)
+_TICKER = """<?xml version='1.0' encoding='UTF-8'?>
+<ticker xmlns="http://rabe.ch/schema/ticker.xsd"
+        xmlns:xlink="http://www.w3.org/1999/xlink">
+  <identifier>ticker-{id}</identifier>
+  <creator>now-playing daemon v1</creator>
+  <date>{date}</date>
+  <show id="{id}">
+    <name>{name}</name>
+    <link xlink:type="simple" xlink:href="{url}" xlink:show="replace">{url}</link>
+    <startTime>{start}</startTime>
+    <endTime>{end}</endTime>
+  </show>
+</ticker>
+"""
+
+
+def schedule(day: date) -> list[tuple[datetime, datetime, str]]:
+    """Get the broadcasts the fake upstream APIs report for a day.
+
+    Days have the same slots, the shows in the slots between the fixed
+    ones like `Info` and `Klangbecken` change from day to day.
+
+    Args:
+    ----
+        day: Day in Europe/Zurich time.
+
+    Returns:
+    -------
+        Start, end and show of every broadcast, covering the whole day
+        without gaps.
+
+    """
+    _starts = [datetime.combine(day, _slot, tzinfo=_TZ) for _slot, _ in _SLOTS]
+    _starts.append(datetime.combine(day + timedelta(days=1), dtime(), tzinfo=_TZ))
+    return [
+        (
+            _starts[_index],
+            _starts[_index + 1],
+            _name or _SHOWS[(day.toordinal() * 3 + _index) % len(_SHOWS)],
+        )
+        for _index, (_, _name) in enumerate(_SLOTS)
+    ]
+
+
+class FakeUpstream:
+    """HTTP server faking the archive, songticker and LibreTime APIs.
+
+    Serves the archive broadcasts at `/api/broadcasts/`, the songticker at
+    `/songticker/0.9.3/current.xml` and LibreTime at
+    `/api/live-info-v2/format/json`. Requests are handled in a thread each
+    with HTTP keep-alive, like the real servers.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self: Self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        padding: int = 0,
+        page_size: int = 20,
+        now: datetime | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """Create the server, it only answers requests once started.
+
+        Args:
+        ----
+            host: Address to listen on.
+            port: Port to listen on, 0 for a free port.
+            latency: Seconds every request takes at least.
+            jitter: Up to this many seconds get added to the latency of
+                every request at random.
+            error_rate: Share of requests that fail with `error_status`.
+            error_status: HTTP status code of failing requests.
+            padding: Length of the description of every show, to get the
+                payload sizes of real schedules.
+            page_size: Broadcasts per page of archive listings.
+            now: Time the songticker and LibreTime answer for, the current
+                time if not set.
+            seed: Seed for latency and errors, to repeat a load test.
+
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.padding = padding
+        self.page_size = page_size
+        self.now = now
+        self.requests: Counter[str] = Counter()
+        """Number of requests served per API, `archive`, `songticker` or `libretime`."""
+        self._random = random.Random(seed)  # noqa: S311
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.upstream = self  # type: ignore[attr-defined]
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self: Self) -> str:
+        """Base URL of the server, i.e. `http://127.0.0.1:8080`."""
+        _host, _port = self._server.server_address[:2]
+        return f"http://{_host!s}:{_port}"
+
+    def start(self: Self) -> Self:
+        """Serve requests in a background thread.
+
+        Returns
+        -------
+            The server itself.
+
+        """
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            name="cridlib-fake-upstream",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self: Self) -> None:
+        """Serve requests in the current thread until interrupted."""
+        self._server.serve_forever()
+
+    def stop(self: Self) -> None:
+        """Stop serving requests and close the socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self: Self) -> Self:
+        """Start serving when used as context manager."""
+        return self.start()
+
+    def __exit__(
+        self: Self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop serving at the end of the with statement."""
+        self.stop()
+
+    @contextmanager
+    def redirect(self: Self) -> Iterator[Self]:
+        """Point the strategies at this server for the duration of a with statement.
+
+        Caches of the strategies are left alone, clear them if they hold
+        shows from the real upstream APIs.
+
+        Yields
+        ------
+            The server itself.
+
+        """
+        from .strategy import future, now, past  # noqa: PLC0415
+
+        _urls = [
+            (past, "__ARCHIV_BROADCASTS_URL", f"{self.url}/api/broadcasts/"),
+            (now, "__SONGTICKER_URL", f"{self.url}/songticker/0.9.3/current.xml"),
+            (
+                future,
+                "__LIBRETIME_INFOV2_URL",
+                f"{self.url}/api/live-info-v2/format/json",
+            ),
+        ]
+        _previous = [getattr(_module, _name) for _module, _name, _ in _urls]
+        for _module, _name, _url in _urls:
+            setattr(_module, _name, _url)
+        try:
+            yield self
+        finally:
+            for (_module, _name, _), _url in zip(_urls, _previous, strict=True):
+                setattr(_module, _name, _url)
+
+    def _delay(self: Self) -> tuple[float, bool]:
+        """Get the latency of a request and whether it fails."""
+        with self._lock:
+            return (
+                self.latency + self._random.uniform(0, self.jitter),
+                self._random.random() < self.error_rate,
+            )
+
+    def _count(self: Self, api: str) -> None:
+        with self._lock:
+            self.requests[api] += 1
+
+    def _now(self: Self) -> datetime:
+        return self.now or datetime.now(timezone.utc)
+
+    def _archive(self: Self, path: str, query: dict[str, list[str]]) -> Any:  # noqa: ANN401
+        """Answer archive requests for a single broadcast or a whole day."""
+        _parts = path.removeprefix("/api/broadcasts/").split("/")
+        _day = date(int(_parts[0]), int(_parts[1]), int(_parts[2]))
+        _broadcasts = schedule(_day)
+        if len(_parts) > 3:  # noqa: PLR2004
+            _at = datetime.combine(
+                _day,
+                datetime.strptime(_parts[3], "%H%M%S").time(),  # noqa: DTZ007
+                tzinfo=_TZ,
+            )
+            return {
+                "data": [
+                    self._broadcast(_broadcast)
+                    for _broadcast in _broadcasts
+                    if _broadcast[0] <= _at < _broadcast[1]
+                ],
+            }
+        _page = int(query.get("page[number]", ["1"])[0])
+        _first = (_page - 1) * self.page_size
+        _result: dict[str, Any] = {
+            "data": [
+                self._broadcast(_broadcast)
+                for _broadcast in _broadcasts[_first : _first + self.page_size]
+            ],
+        }
+        if _first + self.page_size < len(_broadcasts):
+            _result["links"] = {
+                "next": f"{self.url}{path}?page[number]={_page + 1}",
+            }
+        return _result
+
+    def _broadcast(self: Self, broadcast: tuple[datetime, datetime, str]) -> Any:  # noqa: ANN401
+        _start, _end, _name = broadcast
+        return {
+            "id": _start.strftime("%Y%m%d%H%M%S"),
+            "type": "broadcasts",
+            "attributes": {
+                "label": _name,
+                "started_at": _start.isoformat(),
+                "finished_at": _end.isoformat(),
+                "details": "x" * self.padding,
+            },
+        }
+
+    def _songticker(self: Self) -> str:
+        _now = self._now()
+        _start, _end, _name = next(
+            _broadcast
+            for _broadcast in schedule(_now.astimezone(_TZ).date())
+            if _broadcast[0] <= _now < _broadcast[1]
+        )
+        return _TICKER.format(
+            id=_start.strftime("%Y%m%d%H%M%S"),
+            date=_now.isoformat(),
+            name=_name,
+            url=f"https://rabe.ch/{_show_path(_name)}",
+            start=_start.isoformat(),
+            end=_end.isoformat(),
+        )
+
+    def _libretime(self: Self, query: dict[str, list[str]]) -> Any:  # noqa: ANN401
+        """Answer with the current and the upcoming shows like live-info-v2."""
+        _now = self._now()
+        _days = int(query.get("days", ["2"])[0])
+        _limit = int(query.get("shows", ["5"])[0])
+        _today = _now.astimezone(_TZ).date()
+        _broadcasts = [
+            _broadcast
+            for _offset in range(_days + 1)
+            for _broadcast in schedule(_today + timedelta(days=_offset))
+            if _broadcast[1] > _now
+        ]
+        _shows = [
+            self._show(_index, _broadcast)
+            for _index, _broadcast in enumerate(_broadcasts[: _limit + 1])
+        ]
+        return {
+            "station": {"timezone": "UTC"},
+            "shows": {
+                "previous": [],
+                "current": _shows[0] if _shows else None,
+                "next": _shows[1:],
+            },
+        }
+
+    def _show(self: Self, index: int, broadcast: tuple[datetime, datetime, str]) -> Any:  # noqa: ANN401
+        _start, _end, _name = broadcast
+        return {
+            "name": _name,
+            "description": "x" * self.padding,
+            "genre": "",
+            "id": _SHOWS.index(_name) if _name in _SHOWS else len(_SHOWS),
+            "instance_id": index,
+            "record": 0,
+            "url": f"https://rabe.ch/{_show_path(_name)}",
+            "image_path": "",
+            "starts": _start.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+            "ends": _end.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self: Self) -> None:
+        _upstream: FakeUpstream = self.server.upstream  # type: ignore[attr-defined]
+        _latency, _fail = _upstream._delay()  # noqa: SLF001
+        time.sleep(_latency)
+        _url = urlsplit(self.path)
+        _query = parse_qs(_url.query)
+        if _url.path.startswith("/api/broadcasts/"):
+            _api = "archive"
+        elif _url.path == "/songticker/0.9.3/current.xml":
+            _api = "songticker"
+        elif _url.path == "/api/live-info-v2/format/json":
+            _api = "libretime"
+        else:
+            self._send(404, "application/json", '{"errors": ["not found"]}')
+            return
+        _upstream._count(_api)  # noqa: SLF001
+        if _fail:
+            self._send(_upstream.error_status, "application/json", '{"errors": []}')
+        elif _api == "archive":
+            _data = _upstream._archive(_url.path, _query)  # noqa: SLF001
+            self._send(200, "application/json", json.dumps(_data))
+        elif _api == "songticker":
+            self._send(200, "application/xml", _upstream._songticker())  # noqa: SLF001
+        else:
+            _data = _upstream._libretime(_query)  # noqa: SLF001
+            self._send(200, "application/json", json.dumps(_data))
+
+    def _send(self: Self, status: int, content_type: str, body: str) -> None:
+        _data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(_data)))
+        self.end_headers()
+        self.wfile.write(_data)
+
+    def log_message(self: Self, format: str, *args: Any) -> None:  # noqa: A002, ANN401
+        pass
+
+
+def _show_path(name: str) -> str:
+    return name.lower().replace(" ", "-")
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Serve the fake upstream APIs until interrupted.
+
+    Args:
+    ----
+        argv: Command line arguments without the program name, defaults to
+            `sys.argv[1:]`.
+
+    """
+    _parser = argparse.ArgumentParser(
+        prog="python -m cridlib.fake",
+        description="Serve fake archive, songticker and LibreTime APIs.",
+    )
+    _parser.add_argument("--host", default="127.0.0.1")
+    _parser.add_argument("--port", type=int, default=8080)
+    _parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    _parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    _parser.add_argument("--error-rate", type=float, default=0.0)
+    _parser.add_argument("--error-status", type=int, default=503)
+    _parser.add_argument("--padding", type=int, default=0, help="bytes per show")
+    _parser.add_argument("--page-size", type=int, default=20)
+    _parser.add_argument("--seed", type=int)
+    _args = _parser.parse_args(argv)
+    _upstream = FakeUpstream(
+        _args.host,
+        _args.port,
+        latency=_args.latency,
+        jitter=_args.jitter,
+        error_rate=_args.error_rate,
+        error_status=_args.error_status,
+        padding=_args.padding,
+        page_size=_args.page_size,
+        seed=_args.seed,
+    )
+    print(f"Serving fake upstream APIs on {_upstream.url}")  # noqa: T201
+    try:
+        _upstream.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        _upstream.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,21 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
 
+from . import instrument
 from .lib import CRID, canonicalize_show
-from .strategy import future, now, past
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable
 
-def get(timestamp: datetime | None = None, fragment: str = "") -> CRID:
+
+def get(
+    timestamp: datetime | None = None,
+    fragment: str = "",
+    show: str | None = None,
+) -> CRID:
     """Get a RaBe CRID.
 
     Examples:
@@ -31,11 +39,23 @@ def get(timestamp: datetime | None = None, fragment: str = "") -> CRID:
 
         ```
 
+        If you already know the show, no upstream lookup is needed.
+
+        ```python
+        >>> str(get(datetime(2020, 3, 1, 0, 0), show="Klangbecken"))
+        'crid://rabe.ch/v1/klangbecken#t=clock=20200301T000000.00Z'
+
+        ```
+
     Args:
     ----
         timestamp: Exact time you want a CRID for.
             If left empty, a CRID for the current time is generated.
         fragment: Optional fragment to add to the end of the CRID.
+        show: Name of the show running at `timestamp` if you know it, i.e.
+            from your playout system. It still gets canonicalized but the
+            upstream APIs don't get asked. An empty string gets a CRID
+            without show.
 
     Returns:
     -------
@@ -44,18 +64,144 @@ def get(timestamp: datetime | None = None, fragment: str = "") -> CRID:
     """
     _now = datetime.now(timezone.utc)
     _ts = timestamp or _now
-    _show = ""
-    if _ts == _now:
-        _show = now.get_show()
-    elif _ts < _now:
-        _show = past.get_show(past=_ts)
-    elif _ts > _now:  # pragma: no cover
-        _show = future.get_show(future=_ts)
+    _show = show
+    if _show is None:
+        # the strategies pull in the HTTP stack, only load them for lookups
+        from . import strategy  # noqa: PLC0415
 
+        _show = strategy.get_show(_ts, _now)
     if _show:
-        _show = canonicalize_show(_show)
+        with instrument.timed("canonicalize", "show"):
+            _show = canonicalize_show(_show)
+
+    return CRID.from_parts(_show, _ts, fragment)
+
+
+async def aget(
+    timestamp: datetime | None = None,
+    fragment: str = "",
+    show: str | None = None,
+) -> CRID:
+    """Get a RaBe CRID without blocking the event loop.
+
+    Works like [`get`][cridlib.get.get] but looks up the show with
+    [`strategy.aget_show`][cridlib.strategy.aget_show]. Concurrent calls
+    that need the same upstream request share it.
+
+    Examples:
+    --------
+        ```python
+        >>> import asyncio
+        >>> from datetime import datetime
+        >>> crid = asyncio.run(aget(datetime(2020, 3, 1, 0, 0), show="Klangbecken"))
+        >>> str(crid)
+        'crid://rabe.ch/v1/klangbecken#t=clock=20200301T000000.00Z'
+
+        ```
+
+    Args:
+    ----
+        timestamp: Exact time you want a CRID for.
+            If left empty, a CRID for the current time is generated.
+        fragment: Optional fragment to add to the end of the CRID.
+        show: Name of the show running at `timestamp` if you know it.
+
+    Returns:
+    -------
+        CRID: The generated CRID.
+
+    """
+    _now = datetime.now(timezone.utc)
+    _ts = timestamp or _now
+    _show = show
+    if _show is None:
+        from . import strategy  # noqa: PLC0415
+
+        _show = await strategy.aget_show(_ts, _now)
+    if _show:
+        with instrument.timed("canonicalize", "show"):
+            _show = canonicalize_show(_show)
+
+    return CRID.from_parts(_show, _ts, fragment)
+
+
+def get_many(
+    timestamps: Iterable[datetime | None],
+    fragment: str = "",
+    max_workers: int | None = None,
+) -> list[CRID]:
+    """Get RaBe CRIDs for many timestamps at once.
+
+    Works like [`get`][cridlib.get.get] but looks up each distinct timestamp
+    only once. Timestamps are looked up in chronological order so lookups for
+    timestamps during the same broadcast get answered from the cache, and the
+    show names are only canonicalized once per show.
+
+    Examples:
+    --------
+        ```python
+        >>> from unittest.mock import patch
+        >>> from datetime import datetime
+        >>> from pytz import timezone
+        >>> with patch("cridlib.strategy.past.get_session") as mock_gs:
+        ...     mock_gs.return_value.get.return_value.json.return_value = {
+        ...         "data": [{"attributes": {"label": "Klangbecken"}}],
+        ...     }
+        ...     crids = get_many([
+        ...         datetime(2020, 3, 1, 0, 0, tzinfo=timezone('UTC')),
+        ...         datetime(2020, 3, 1, 0, 1, tzinfo=timezone('UTC')),
+        ...     ])
+        >>> [str(crid) for crid in crids]  # doctest: +NORMALIZE_WHITESPACE
+        ['crid://rabe.ch/v1/klangbecken#t=clock=20200301T000000.00Z',
+         'crid://rabe.ch/v1/klangbecken#t=clock=20200301T000100.00Z']
+
+        ```
+
+    Args:
+    ----
+        timestamps: Times you want CRIDs for, None gets a CRID for the
+            current time.
+        fragment: Optional fragment to add to the end of every CRID.
+        max_workers: Look up shows with this many parallel requests, see
+            [`resolve_shows`][cridlib.resolve.resolve_shows]. Lookups are
+            done one after the other if not set.
+
+    Returns:
+    -------
+        list[CRID]: The generated CRIDs in the same order as `timestamps`.
+
+    """
+    from . import strategy  # noqa: PLC0415
+    from .resolve import resolve_shows  # noqa: PLC0415
+
+    _now = datetime.now(timezone.utc)
+    _timestamps = [timestamp or _now for timestamp in timestamps]
+
+    _distinct = sorted(set(_timestamps))
+    if max_workers:
+        _shows = resolve_shows(_distinct, now=_now, max_workers=max_workers)
+    else:
+        _shows = [strategy.get_show(_ts, _now) for _ts in _distinct]
 
-    _tscode = f"t=clock={_ts.strftime('%Y%m%dT%H%M%S.%f')[:-4]}Z"
-    _fragment = f"{_tscode}{'&' + fragment if fragment else ''}"
+    _slugs: dict[str, str] = {}
+    for _show in set(_shows):
+        if _show:
+            with instrument.timed("canonicalize", "show"):
+                _slugs[_show] = canonicalize_show(_show)
+    _by_instant = dict(zip(_distinct, _shows, strict=True))
 
-    return CRID(f"crid://rabe.ch/v1{'/' + _show if _show else ''}#{_fragment}")
+    # the clock code uses the wall clock of each timestamp, so timestamps of
+    # the same instant in different timezones share the lookup but not the CRID
+    _crids: dict[tuple[datetime, timedelta | None], CRID] = {}
+    _result = []
+    for _ts in _timestamps:
+        _key = (_ts, _ts.utcoffset())
+        _crid = _crids.get(_key)
+        if _crid is None:
+            _crid = _crids[_key] = CRID.from_parts(
+                _slugs.get(_by_instant[_ts]),
+                _ts,
+                fragment,
+            )
+        _result.append(_crid)
+    return _result
@@ -0,0 +1,255 @@
+"""Local index of broadcasts for lookups without network access.
+
+The index is a single binary file holding the start, end and show of every
+broadcast sorted by start. It gets memory-mapped when loaded, so lookups
+bisect the file contents directly and loading does not depend on its size.
+
+Examples
+--------
+    ```python
+    >>> import os, tempfile
+    >>> from datetime import datetime, timezone
+    >>> path = os.path.join(tempfile.mkdtemp(), "broadcasts.idx")
+    >>> build_index(path, from_raar({"data": [{"attributes": {
+    ...     "label": "Klangbecken",
+    ...     "started_at": "1993-03-01T00:00:00+01:00",
+    ...     "finished_at": "1993-03-01T08:00:00+01:00",
+    ... }}]}))
+    1
+    >>> with BroadcastIndex(path) as index:
+    ...     index.get(datetime(1993, 3, 1, 6, tzinfo=timezone.utc))
+    'klangbecken'
+
+    ```
+
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_right
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Self
+
+from .records import libretime_shows, raar_broadcasts
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from types import TracebackType
+
+# magic, byte order marker, number of broadcasts, size of show table, first
+# start and last end, followed by the starts, ends and show codes columns and
+# the show table with NUL separated show names
+_HEADER = struct.Struct("=8sQQQdd")
+_MAGIC = b"CRIDIDX1"
+_BYTE_ORDER = 0x0102030405060708
+
+
+def build_index(
+    path: str | os.PathLike[str],
+    broadcasts: Iterable[tuple[datetime, datetime, str]],
+) -> int:
+    """Write a broadcast index file.
+
+    The file gets replaced atomically, processes that already loaded an
+    older version of it keep using that until they load it again.
+
+    Args:
+    ----
+        path: File to write the index to.
+        broadcasts: Start, end and show of every broadcast, i.e. from
+            [`from_raar`][cridlib.index.from_raar] or
+            [`from_libretime`][cridlib.index.from_libretime]. A later
+            broadcast replaces an earlier one with the same start.
+
+    Returns:
+    -------
+        Number of broadcasts in the index.
+
+    """
+    _broadcasts = {
+        _start.timestamp(): (_end.timestamp(), _show)
+        for _start, _end, _show in broadcasts
+    }
+    _starts = array("d", sorted(_broadcasts))
+    _ends = array("d")
+    _codes = array("I")
+    _shows: dict[str, int] = {}
+    for _start in _starts:
+        _end, _show = _broadcasts[_start]
+        _ends.append(_end)
+        _codes.append(_shows.setdefault(_show, len(_shows)))
+    _names = "\0".join(_shows).encode()
+
+    _tmp = f"{os.fspath(path)}.{os.getpid()}.tmp"
+    with open(_tmp, "wb") as _file:  # noqa: PTH123
+        _file.write(
+            _HEADER.pack(
+                _MAGIC,
+                _BYTE_ORDER,
+                len(_starts),
+                len(_names),
+                _starts[0] if _starts else 0.0,
+                max(_ends, default=0.0),
+            ),
+        )
+        _starts.tofile(_file)
+        _ends.tofile(_file)
+        _codes.tofile(_file)
+        _file.write(_names)
+    os.replace(_tmp, path)  # noqa: PTH105
+    return len(_starts)
+
+
+def from_raar(data: dict[str, Any]) -> Iterator[tuple[datetime, datetime, str]]:
+    """Get the broadcasts from a [raar](https://github.com/radiorabe/raar) export.
+
+    Args:
+    ----
+        data: Response of the raar broadcasts API, broadcasts without start
+            or end are skipped.
+
+    Returns:
+    -------
+        Start, end and show of every broadcast.
+
+    """
+    return raar_broadcasts(data)
+
+
+def from_libretime(data: dict[str, Any]) -> Iterator[tuple[datetime, datetime, str]]:
+    """Get the shows from a LibreTime `live-info-v2` dump.
+
+    Args:
+    ----
+        data: Response of the LibreTime `live-info-v2` API.
+
+    Returns:
+    -------
+        Start, end and show of every scheduled show.
+
+    """
+    return iter(libretime_shows(data))
+
+
+class BroadcastIndex:
+    """Memory-mapped index file from [`build_index`][cridlib.index.build_index].
+
+    Lookups work like in [`IntervalIndex`][cridlib.cache.IntervalIndex] but
+    use the columns in the mapped file, so they don't allocate anything
+    besides the result.
+    """
+
+    __slots__ = (
+        "_codes",
+        "_ends",
+        "_mmap",
+        "_shows",
+        "_starts",
+        "_view",
+        "end",
+        "start",
+    )
+
+    def __init__(self: Self, path: str | os.PathLike[str]) -> None:
+        """Load an index file.
+
+        Args:
+        ----
+            path: File written by [`build_index`][cridlib.index.build_index].
+
+        Raises:
+        ------
+            ValueError: If the file is not an index or was written on a
+                machine with different byte order.
+
+        """
+        with open(path, "rb") as _file:  # noqa: PTH123
+            self._mmap = mmap.mmap(_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            _magic, _order, _count, _size, _start, _end = _HEADER.unpack_from(
+                self._mmap,
+            )
+        except struct.error:
+            _magic = _order = None
+        if _magic != _MAGIC:
+            self._mmap.close()
+            msg = f"{os.fspath(path)} is not a broadcast index"
+            raise ValueError(msg)
+        if _order != _BYTE_ORDER:
+            self._mmap.close()
+            msg = f"{os.fspath(path)} was built on a machine with other byte order"
+            raise ValueError(msg)
+        self._view = memoryview(self._mmap)
+        _offset = _HEADER.size
+        self._starts = self._view[_offset : _offset + 8 * _count].cast("d")
+        _offset += 8 * _count
+        self._ends = self._view[_offset : _offset + 8 * _count].cast("d")
+        _offset += 8 * _count
+        self._codes = self._view[_offset : _offset + 4 * _count].cast("I")
+        _offset += 4 * _count
+        _names = bytes(self._view[_offset : _offset + _size]).decode()
+        self._shows = _names.split("\0") if _count else []
+        self.start = datetime.fromtimestamp(_start, tz=timezone.utc)
+        """Start of the first broadcast."""
+        self.end = datetime.fromtimestamp(_end, tz=timezone.utc)
+        """End of the last broadcast."""
+
+    def __len__(self: Self) -> int:
+        """Return number of broadcasts."""
+        return len(self._starts)
+
+    def __enter__(self: Self) -> Self:
+        """Use the index as context manager that closes it on exit."""
+        return self
+
+    def __exit__(
+        self: Self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the index."""
+        self.close()
+
+    def covers(self: Self, when: datetime) -> bool:
+        """Check if `when` is between the first and the last broadcast.
+
+        Args:
+        ----
+            when: Timestamp to check.
+
+        Returns:
+        -------
+            True if the index knows what was on air at `when`, even if that
+            was no show.
+
+        """
+        return self.start <= when < self.end
+
+    def get(self: Self, when: datetime) -> str | None:
+        """Get the show of the broadcast running at `when`.
+
+        Args:
+        ----
+            when: Timestamp to look up.
+
+        Returns:
+        -------
+            The show or None if no broadcast was running at `when`.
+
+        """
+        _when = when.timestamp()
+        _idx = bisect_right(self._starts, _when) - 1
+        if _idx < 0 or _when >= self._ends[_idx]:
+            return None
+        return self._shows[self._codes[_idx]]
+
+    def close(self: Self) -> None:
+        """Unmap the index file, the index can't be used afterwards."""
+        for _view in (self._starts, self._ends, self._codes, self._view):
+            _view.release()
+        self._mmap.close()
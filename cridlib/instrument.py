@@ -0,0 +1,153 @@
+"""Optional instrumentation of lookups, requests and caches.
+
+Instrumentation is off by default. Install a hook with
+[`set_hook`][cridlib.instrument.set_hook] to get an
+[`Event`][cridlib.instrument.Event] for everything worth measuring:
+
+* `resolve` with the resolver name, i.e. `past`, and the latency of a
+  whole lookup including retries
+* `request` with the upstream host, the latency until the response headers
+  arrived and the HTTP status code as outcome
+* `retry` with the upstream host and the reason for the retry as outcome
+* `parse` with the strategy name and the time spent parsing the response
+* `cache` with the strategy name and `hit` or `miss` as outcome
+* `canonicalize` with the time spent getting the show slug
+* `coalesce` with the strategy name when a lookup shares the request of
+  another concurrent lookup
+
+Events of failed operations have the name of the exception as outcome. Feed
+them into your metrics library, i.e. record the durations in an
+OpenTelemetry histogram with `kind` and `name` as attributes.
+
+Examples
+--------
+    ```python
+    >>> from collections import Counter
+    >>> import cridlib
+    >>> outcomes = Counter()
+    >>> set_hook(lambda event: outcomes.update([(event.kind, event.outcome)]))
+    >>> _ = cridlib.get(show="Klangbecken")
+    >>> outcomes
+    Counter({('canonicalize', 'ok'): 1})
+    >>> set_hook(None)
+
+    ```
+
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+from contextlib import AbstractContextManager, nullcontext
+from typing import TYPE_CHECKING, NamedTuple, Self
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+logger = logging.getLogger(__name__)
+
+
+class Event(NamedTuple):
+    """Something measured by the instrumentation."""
+
+    kind: str
+    """What was measured, i.e. `resolve` or `cache`."""
+    name: str
+    """Which resolver, strategy or host it was measured for."""
+    duration: float | None = None
+    """Seconds it took, None for events without duration."""
+    outcome: str = "ok"
+    """`ok`, the name of an exception, a cache result or an HTTP status."""
+
+
+Hook = Callable[[Event], None]
+
+_hook: Hook | None = None
+_NULL_CONTEXT = nullcontext()
+
+
+def set_hook(hook: Hook | None) -> None:
+    """Install a function that gets called with every event.
+
+    The hook gets called from the thread doing the lookup, so it should be
+    fast and thread-safe. Errors raised by the hook get logged and ignored.
+
+    Args:
+    ----
+        hook: Function to call, None to turn instrumentation off.
+
+    """
+    global _hook  # noqa: PLW0603
+    _hook = hook
+
+
+def emit(
+    kind: str,
+    name: str,
+    duration: float | None = None,
+    outcome: str = "ok",
+) -> None:
+    """Report an event to the hook, does nothing if no hook is installed.
+
+    Args:
+    ----
+        kind: What was measured.
+        name: Which resolver, strategy or host it was measured for.
+        duration: Seconds it took.
+        outcome: Result of what was measured.
+
+    """
+    _current = _hook
+    if _current is None:
+        return
+    try:
+        _current(Event(kind, name, duration, outcome))
+    except Exception:
+        logger.exception("Instrumentation hook failed for %s %s", kind, name)
+
+
+def timed(kind: str, name: str) -> AbstractContextManager[object]:
+    """Measure the duration of a block and report it as event.
+
+    Args:
+    ----
+        kind: What gets measured.
+        name: Which resolver, strategy or host it gets measured for.
+
+    Returns:
+    -------
+        Context manager that reports the event when the block is done, with
+        the name of the exception as outcome if the block raised one.
+
+    """
+    if _hook is None:
+        return _NULL_CONTEXT
+    return _Timer(kind, name)
+
+
+class _Timer(AbstractContextManager[object]):
+    __slots__ = ("_kind", "_name", "_start")
+
+    def __init__(self: Self, kind: str, name: str) -> None:
+        self._kind = kind
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self: Self) -> Self:
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(
+        self: Self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        emit(
+            self._kind,
+            self._name,
+            time.perf_counter() - self._start,
+            "ok" if exc_type is None else exc_type.__name__,
+        )
@@ -2,19 +2,48 @@
 
 from __future__ import annotations
 
+import re
+from calendar import monthrange
 from datetime import datetime
+from functools import lru_cache, total_ordering
 from pathlib import PurePath
-from typing import Self
-from urllib.parse import parse_qs
+from typing import TYPE_CHECKING, Any, NamedTuple, Self
+from urllib.parse import parse_qs, quote
 
-from slugify import slugify
-from uritools import uricompose, urisplit  # type: ignore[import-untyped]
+from .clock import format_clock, parse_clock
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+# there are only a few hundred shows, so this holds all of them
+@lru_cache(maxsize=4096)
+def _slugify(show: str) -> str:
+    # slugify and its unidecode tables are only loaded when first needed
+    from slugify import slugify  # noqa: PLC0415
+
+    return slugify(show)
+
+
+class SlugCacheInfo(NamedTuple):
+    """Statistics of the show slug cache."""
+
+    hits: int
+    """Number of show names that were already cached."""
+    misses: int
+    """Number of show names that had to be slugified."""
+    maxsize: int
+    """Maximum number of cached show names."""
+    currsize: int
+    """Number of cached show names."""
 
 
 def canonicalize_show(show: str) -> str:
     """Get the slug for a show.
 
-    Uses [python-slugify](https://github.com/un33k/python-slugify).
+    Uses [python-slugify](https://github.com/un33k/python-slugify). Slugs
+    get cached so every show name only gets slugified once, see
+    [`slug_cache_info`][cridlib.lib.slug_cache_info].
 
     Args:
     ----
@@ -25,7 +54,61 @@ def canonicalize_show(show: str) -> str:
         slugified show name.
 
     """
-    return slugify(show)
+    return _slugify(show)
+
+
+def seed_slugs(shows: Iterable[str]) -> int:
+    """Slugify show names ahead of time.
+
+    The strategies call this with the shows from the archive and LibreTime
+    schedules they download, so later lookups find the slugs in the cache.
+
+    Args:
+    ----
+        shows: Show names to slugify.
+
+    Returns:
+    -------
+        Number of show names that were not cached yet.
+
+    """
+    _misses = _slugify.cache_info().misses
+    for _show in shows:
+        _slugify(_show)
+    return _slugify.cache_info().misses - _misses
+
+
+def slug_cache_info() -> SlugCacheInfo:
+    """Get statistics of the show slug cache.
+
+    Examples
+    --------
+        ```python
+        >>> clear_slug_cache()
+        >>> canonicalize_show("Der Morgen"), canonicalize_show("Der Morgen")
+        ('der-morgen', 'der-morgen')
+        >>> slug_cache_info()
+        SlugCacheInfo(hits=1, misses=1, maxsize=4096, currsize=1)
+
+        ```
+
+    Returns
+    -------
+        Hits, misses and size of the cache.
+
+    """
+    _info = _slugify.cache_info()
+    return SlugCacheInfo(
+        _info.hits,
+        _info.misses,
+        _info.maxsize or 0,
+        _info.currsize,
+    )
+
+
+def clear_slug_cache() -> None:
+    """Forget all cached show slugs and reset the statistics."""
+    _slugify.cache_clear()
 
 
 class CRIDError(Exception):
@@ -52,12 +135,38 @@ class CRIDMalformedMediaFragmentError(CRIDError):
     """Missing media-fragment with clock code."""
 
 
+class CRIDImmutableError(CRIDError, AttributeError):
+    """CRIDs can't be changed after creation."""
+
+
 CRIDPath = PurePath
 
+# characters of fragments that need no escaping
+_FRAGMENT_SAFE = "!$&'()*+,;=:@/?"
+_FRAGMENT_CHARS = r"[A-Za-z0-9._~!$&'()*+,;=:@/?-]*"
+_FRAGMENT_RE = re.compile(_FRAGMENT_CHARS)
+
+# Matches the common crid://rabe.ch/v1/<show>#t=clock=<clock>[&<more>] form
+# with characters that need no escaping, anything else gets parsed the slow way.
+_CRID_FAST_RE = re.compile(
+    r"crid://rabe\.ch(?P<path>/v1(?:/(?P<show>[A-Za-z0-9_-]+))?)"
+    r"(?:#(?P<fragment>t=clock="
+    r"(?P<clock>\d{4}(?:0[1-9]|1[0-2])(?:0[1-9]|[12]\d|3[01])"
+    r"T(?:[01]\d|2[0-3])[0-5]\d[0-5]\d\.\d{2}Z)"
+    rf"(?:&{_FRAGMENT_CHARS})?))?",
+)
 
+# marks the start time of a CRID as not parsed yet
+_UNPARSED: Any = object()
+
+
+@total_ordering
 class CRID:
     """Represent CRIDs and can parse, validate and render them.
 
+    CRIDs are immutable values. They compare equal if their URLs are equal,
+    can be used as dict keys and sort by show and start time.
+
     Examples
     --------
         Generate a CRID from an URL and render it's repr:
@@ -74,8 +183,31 @@ class CRID:
 
         ```
 
+        Sort CRIDs:
+        ```python
+        >>> sorted([
+        ...     CRID("crid://rabe.ch/v1/test#t=clock=19930301T131200.00Z"),
+        ...     CRID("crid://rabe.ch/v1/info#t=clock=19930301T131200.00Z"),
+        ...     CRID("crid://rabe.ch/v1/test#t=clock=19930301T120000.00Z"),
+        ... ])  # doctest: +NORMALIZE_WHITESPACE
+        [<class 'cridlib.lib.CRID' for 'crid://rabe.ch/v1/info#t=clock=19930301T131200.00Z'>,
+         <class 'cridlib.lib.CRID' for 'crid://rabe.ch/v1/test#t=clock=19930301T120000.00Z'>,
+         <class 'cridlib.lib.CRID' for 'crid://rabe.ch/v1/test#t=clock=19930301T131200.00Z'>]
+
+        ```
+
     """
 
+    __slots__ = ("_clock", "_fragment", "_path", "_show", "_start", "_str", "_version")
+
+    _clock: str | None
+    _fragment: str | None
+    _path: str
+    _show: str | None
+    _start: datetime | None
+    _str: str
+    _version: str
+
     def __init__(self: Self, uri: str | None = None) -> None:
         """Create new CRID.
 
@@ -84,34 +216,168 @@ class CRID:
             uri: CRID URL to base the new CRID off of.
 
         """
-        self._show: str | None = None
-        self._start: datetime | None = None
-
-        self._uri = urisplit(uri)
-        if self.scheme != "crid":
-            raise CRIDSchemeMismatchError(self.scheme, uri)
-        if self.authority != "rabe.ch":
-            raise CRIDSchemeAuthorityMismatchError(self.authority, uri)
+        if not self._parse_fast(uri):
+            self._parse_uri(uri)
+
+    def _parse_fast(self: Self, uri: str | None) -> bool:
+        """Parse common CRIDs with a regex, returns False if `uri` is unusual."""
+        _match = _CRID_FAST_RE.fullmatch(uri) if uri else None
+        # a show called v1 looks like a version to the generic parser
+        if _match is None or _match["show"] == "v1":
+            return False
+        _clock = _match["clock"]
+        # the regex checks the ranges of all fields but not the days per month
+        if _clock and int(_clock[6:8]) > 28:  # noqa: PLR2004
+            _days = monthrange(int(_clock[0:4]), int(_clock[4:6]))[1]
+            if int(_clock[6:8]) > _days:
+                raise CRIDMalformedMediaFragmentError(_match["fragment"], uri)
+        self._init(
+            uri=_match[0],
+            path=_match["path"],
+            fragment=_match["fragment"],
+            show=_match["show"],
+            clock=_clock,
+            start=_UNPARSED if _clock else None,
+        )
+        return True
+
+    def _parse_uri(self: Self, uri: str | None) -> None:
+        """Parse and validate any CRID with a generic URI parser."""
+        # most CRIDs take the fast path, so uritools is only loaded when needed
+        from uritools import (  # type: ignore[import-untyped]  # noqa: PLC0415
+            uricompose,
+            urisplit,
+        )
+
+        _uri = urisplit(uri)
+        if _uri.scheme != "crid":
+            raise CRIDSchemeMismatchError(_uri.scheme, uri)
+        if _uri.authority != "rabe.ch":
+            raise CRIDSchemeAuthorityMismatchError(_uri.authority, uri)
+        _path = CRIDPath(_uri.path)
         # parent.stem contains version in /v1/foo paths, stem in generic root /v1 path
-        if self.path.parent.stem != "v1" and self.path.stem != "v1":
-            raise CRIDUnsupportedVersionError(self.path, uri)
-        self._version = self.path.parent.stem or self.path.stem
+        if _path.parent.stem != "v1" and _path.stem != "v1":
+            raise CRIDUnsupportedVersionError(_path, uri)
+        _version = _path.parent.stem or _path.stem
         # only store show if we have one
-        if self.path.stem != "v1":
-            self._show = self.path.relative_to(self.path.parent).stem
+        _show = None
+        if _path.stem != "v1":
+            _show = _path.relative_to(_path.parent).stem
         # fragments are optional, but if provided we want them to contain t=code
-        if self.fragment:
+        _start = None
+        if _uri.fragment:
             try:
                 # TODO(hairmare): investigate noqa for bug
                 # https://github.com/radiorabe/python-rabe-cridlib/issues/244
-                self._start = datetime.strptime(  # noqa: DTZ007
-                    parse_qs(parse_qs(self.fragment)["t"][0])["clock"][0],
-                    "%Y%m%dT%H%M%S.%fZ",
+                _start = parse_clock(
+                    parse_qs(parse_qs(_uri.fragment)["t"][0])["clock"][0],
                 )
             except KeyError as ex:
-                raise CRIDMissingMediaFragmentError(self.fragment, uri) from ex
-            except ValueError as ex:  # pragma: no cover
-                raise CRIDMalformedMediaFragmentError(self.fragment, uri) from ex
+                raise CRIDMissingMediaFragmentError(_uri.fragment, uri) from ex
+            except ValueError as ex:
+                raise CRIDMalformedMediaFragmentError(_uri.fragment, uri) from ex
+        self._init(
+            # compose from the decoded fragment so escapes don't get escaped again
+            uri=uricompose(
+                _uri.scheme,
+                _uri.authority,
+                _uri.path,
+                _uri.query,
+                _uri.getfragment(),
+            ),
+            path=_uri.path,
+            fragment=_uri.fragment,
+            show=_show,
+            clock=None,
+            start=_start,
+            version=_version,
+        )
+
+    def _init(  # noqa: PLR0913
+        self: Self,
+        *,
+        uri: str,
+        path: str,
+        fragment: str | None,
+        show: str | None,
+        clock: str | None,
+        start: datetime | None,
+        version: str = "v1",
+    ) -> None:
+        """Set all fields of a new CRID, they can't be changed afterwards."""
+        _set = object.__setattr__
+        _set(self, "_str", uri)
+        _set(self, "_path", path)
+        _set(self, "_fragment", fragment)
+        _set(self, "_version", version)
+        _set(self, "_show", show)
+        _set(self, "_clock", clock)
+        _set(self, "_start", start)
+
+    @classmethod
+    def from_parts(
+        cls: type[Self],
+        show: str | None,
+        start: datetime,
+        fragment: str = "",
+    ) -> Self:
+        """Create new CRID from its parts without parsing an URI.
+
+        Examples:
+        --------
+            ```python
+            >>> from datetime import datetime
+            >>> CRID.from_parts("test", datetime(1993, 3, 1, 13, 12))
+            <class 'cridlib.lib.CRID' for 'crid://rabe.ch/v1/test#t=clock=19930301T131200.00Z'>
+
+            ```
+
+        Args:
+        ----
+            show: Show slug, see [`canonicalize_show`][cridlib.lib.canonicalize_show].
+            start: Start time for the media fragment.
+            fragment: Optional fragment to add to the end of the CRID.
+
+        Returns:
+        -------
+            The new CRID.
+
+        """
+        _path = f"/v1/{show}" if show else "/v1"
+        _clock = f"t=clock={format_clock(start)}"
+        _fragment = f"{_clock}&{fragment}" if fragment else _clock
+        _uri = f"crid://rabe.ch{_path}#{_fragment}"
+        if fragment and not _FRAGMENT_RE.fullmatch(fragment):
+            # escape the fragment like uricompose does for parsed CRIDs
+            _uri = (
+                f"crid://rabe.ch{_path}#{_clock}&{quote(fragment, safe=_FRAGMENT_SAFE)}"
+            )
+        crid = cls.__new__(cls)
+        crid._init(  # noqa: SLF001
+            uri=_uri,
+            path=_path,
+            fragment=_fragment,
+            show=show or None,
+            clock=None,
+            # the media fragment only has a resolution of 1/100 of a second
+            start=start.replace(
+                microsecond=start.microsecond // 10000 * 10000,
+                tzinfo=None,
+            ),
+        )
+        return crid
+
+    def __setattr__(self: Self, name: str, value: object) -> None:
+        """Prevent changes, CRIDs are immutable."""
+        raise CRIDImmutableError(self, name)
+
+    def __delattr__(self: Self, name: str) -> None:
+        """Prevent changes, CRIDs are immutable."""
+        raise CRIDImmutableError(self, name)
+
+    def __reduce__(self: Self) -> tuple[type[Self], tuple[str]]:
+        """Pickle CRIDs by their URL."""
+        return (self.__class__, (self._str,))
 
     def __str__(self: Self) -> str:
         """Stringfy.
@@ -121,13 +387,32 @@ class CRID:
             CRID URL rendered as string.
 
         """
-        return uricompose(*self._uri)
+        return self._str
 
     def __repr__(self: Self) -> str:
         """Repr."""
         _fqcn = f"{self.__class__.__module__}.{self.__class__.__qualname__}"
         return f"<class '{_fqcn}' for '{self!s}'>"
 
+    def __eq__(self: Self, other: object) -> bool:
+        """Compare CRIDs by URL."""
+        if not isinstance(other, CRID):
+            return NotImplemented
+        return self._str == other._str
+
+    def __lt__(self: Self, other: object) -> bool:
+        """Order CRIDs by show and start time."""
+        if not isinstance(other, CRID):
+            return NotImplemented
+        return self._sort_key() < other._sort_key()
+
+    def __hash__(self: Self) -> int:
+        """Hash CRIDs by URL."""
+        return hash(self._str)
+
+    def _sort_key(self: Self) -> tuple[str, datetime, str]:
+        return (self._show or "", self.start or datetime.min, self._str)  # noqa: DTZ901
+
     @property
     def scheme(self: Self) -> str:
         """Scheme.
@@ -137,7 +422,7 @@ class CRID:
             Scheme part of the CRID.
 
         """
-        return self._uri.scheme
+        return "crid"
 
     @property
     def authority(self: Self) -> str:
@@ -148,7 +433,7 @@ class CRID:
             Authority part (aka hostname) of CRID.
 
         """
-        return self._uri.authority
+        return "rabe.ch"
 
     @property
     def path(self: Self) -> CRIDPath:
@@ -159,10 +444,10 @@ class CRID:
             Path part of CRID.
 
         """
-        return CRIDPath(self._uri.path)
+        return CRIDPath(self._path)
 
     @property
-    def fragment(self: Self) -> str:
+    def fragment(self: Self) -> str | None:
         """Fragment.
 
         Returns
@@ -170,7 +455,7 @@ class CRID:
             Fragment part of CRID.
 
         """
-        return self._uri.fragment
+        return self._fragment
 
     @property
     def version(self: Self) -> str:
@@ -198,9 +483,14 @@ class CRID:
     def start(self: Self) -> datetime | None:
         """Start time.
 
+        The start time gets parsed on first access.
+
         Returns
         -------
             Start time form CRIDs media fragment.
 
         """
+        if self._start is _UNPARSED:
+            # the clock code got validated when parsing the CRID
+            object.__setattr__(self, "_start", parse_clock(str(self._clock)))
         return self._start
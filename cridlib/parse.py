@@ -1,6 +1,27 @@
 """Parse an existing CRID."""
 
-from .lib import CRID
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Literal, NamedTuple
+
+from .lib import CRID, CRIDError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from os import PathLike
+
+OnError = Literal["raise", "skip", "collect"]
+
+
+class InvalidCRID(NamedTuple):
+    """A value that failed to parse as CRID."""
+
+    lineno: int
+    """Line number of the value, starting at 1."""
+    value: str
+    """The value that failed to parse."""
+    error: CRIDError
+    """Why the value is not a valid CRID."""
 
 
 def parse(value: str) -> CRID:
@@ -16,3 +37,114 @@ def parse(value: str) -> CRID:
 
     """
     return CRID(value)
+
+
+def parse_many(
+    values: Iterable[str],
+    on_error: OnError = "raise",
+    errors: list[InvalidCRID] | None = None,
+) -> Iterator[CRID]:
+    """Parse many CRIDs, one per value.
+
+    Values are parsed lazily one by one, so this works on iterables of any
+    size in constant memory. Surrounding whitespace is stripped and empty
+    values are ignored.
+
+    Examples:
+    --------
+        ```python
+        >>> errors = []
+        >>> crids = parse_many(
+        ...     ["crid://rabe.ch/v1/test", " https://rabe.ch/v1/test "],
+        ...     on_error="collect",
+        ...     errors=errors,
+        ... )
+        >>> list(crids)
+        [<class 'cridlib.lib.CRID' for 'crid://rabe.ch/v1/test'>]
+        >>> errors[0].lineno, errors[0].value, type(errors[0].error).__name__
+        (2, 'https://rabe.ch/v1/test', 'CRIDSchemeMismatchError')
+
+        ```
+
+    Args:
+    ----
+        values: CRID URLs as strings.
+        on_error: What to do with invalid values. `raise` raises the
+            [`CRIDError`][cridlib.lib.CRIDError] with the line number added
+            as note, `skip` ignores the value and `collect` appends it to
+            `errors` as [`InvalidCRID`][cridlib.parse.InvalidCRID].
+        errors: List to collect invalid values in, needed for `collect`.
+
+    Returns:
+    -------
+        Iterator[CRID]: The parsed CRIDs.
+
+    """
+    _check_on_error(on_error, errors)
+    return _parse_many(values, on_error, errors)
+
+
+def _parse_many(
+    values: Iterable[str],
+    on_error: OnError,
+    errors: list[InvalidCRID] | None,
+) -> Iterator[CRID]:
+    for _lineno, _value in enumerate(values, 1):
+        _crid = _value.strip()
+        if not _crid:
+            continue
+        try:
+            yield CRID(_crid)
+        except CRIDError as ex:
+            if on_error == "raise":
+                ex.add_note(f"line {_lineno}: {_crid}")
+                raise
+            if errors is not None and on_error == "collect":
+                errors.append(InvalidCRID(_lineno, _crid, ex))
+
+
+def parse_file(
+    path: str | PathLike[str],
+    on_error: OnError = "raise",
+    errors: list[InvalidCRID] | None = None,
+    encoding: str = "utf-8",
+) -> Iterator[CRID]:
+    """Parse a file with one CRID per line.
+
+    The file is read through a large buffer and parsed line by line, see
+    [`parse_many`][cridlib.parse.parse_many] for how invalid lines get
+    handled.
+
+    Args:
+    ----
+        path: File to read.
+        on_error: What to do with invalid lines.
+        errors: List to collect invalid lines in, needed for `collect`.
+        encoding: Encoding of the file.
+
+    Returns:
+    -------
+        Iterator[CRID]: The parsed CRIDs.
+
+    """
+    _check_on_error(on_error, errors)
+    return _parse_file(path, on_error, errors, encoding)
+
+
+def _parse_file(
+    path: str | PathLike[str],
+    on_error: OnError,
+    errors: list[InvalidCRID] | None,
+    encoding: str,
+) -> Iterator[CRID]:
+    with open(path, encoding=encoding, buffering=1 << 20) as _file:  # noqa: PTH123
+        yield from _parse_many(_file, on_error, errors)
+
+
+def _check_on_error(on_error: OnError, errors: list[InvalidCRID] | None) -> None:
+    if on_error not in ("raise", "skip", "collect"):
+        msg = f"unknown on_error policy: {on_error}"
+        raise ValueError(msg)
+    if on_error == "collect" and errors is None:
+        msg = "errors list is needed to collect invalid values"
+        raise ValueError(msg)
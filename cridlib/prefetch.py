@@ -0,0 +1,51 @@
+"""Prefetch show info for batch CRID generation."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+
+def prefetch(start: datetime, end: datetime) -> int:
+    """Prefetch show info for all past broadcasts between `start` and `end`.
+
+    Use this before calling [`cridlib.get`][cridlib.get.get] for many
+    timestamps in a known range. The archive gets asked once per day in the
+    range and all following lookups in the range get answered from memory.
+
+    Examples:
+    --------
+        ```python
+        >>> from datetime import datetime
+        >>> from unittest.mock import patch
+        >>> from pytz import timezone
+        >>> import cridlib
+        >>> day = datetime(2020, 3, 1, tzinfo=timezone('Europe/Zurich'))
+        >>> with patch("cridlib.strategy.past.get_session") as mock_gs:
+        ...     mock_gs.return_value.get.return_value.json.return_value = {
+        ...         "data": [{"attributes": {
+        ...             "label": "Klangbecken",
+        ...             "started_at": "2020-03-01T00:00:00+01:00",
+        ...             "finished_at": "2020-03-01T06:00:00+01:00",
+        ...         }}],
+        ...     }
+        ...     cridlib.prefetch(day, day)
+        1
+
+        ```
+
+    Args:
+    ----
+        start: Start of the range.
+        end: End of the range.
+
+    Returns:
+    -------
+        Number of broadcasts that were prefetched.
+
+    """
+    from .strategy import past  # noqa: PLC0415
+
+    return past.prefetch(start, end)
@@ -0,0 +1,76 @@
+"""Read broadcast records of the upstream APIs.
+
+Used by the strategies and by [`index`][cridlib.index], so building and
+reading an offline index does not load the HTTP stack.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import PurePath
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+def raar_show(attributes: dict[str, Any]) -> str:
+    """Get the show slug of a [raar](https://github.com/radiorabe/raar) broadcast.
+
+    Args:
+    ----
+        attributes: Attributes of the broadcast.
+
+    Returns:
+    -------
+        The slug of the broadcast label.
+
+    """
+    return str(attributes.get("label")).lower().replace(" ", "-")
+
+
+def raar_broadcasts(data: dict[str, Any]) -> Iterator[tuple[datetime, datetime, str]]:
+    """Get the broadcasts from a response of the raar broadcasts API.
+
+    Args:
+    ----
+        data: Response of the raar broadcasts API, broadcasts without start
+            or end are skipped.
+
+    Returns:
+    -------
+        Start, end and show of every broadcast.
+
+    """
+    for _broadcast in data.get("data") or []:
+        _attributes = _broadcast.get("attributes") or {}
+        if _attributes.get("started_at") and _attributes.get("finished_at"):
+            yield (
+                datetime.fromisoformat(_attributes["started_at"]),
+                datetime.fromisoformat(_attributes["finished_at"]),
+                raar_show(_attributes),
+            )
+
+
+def libretime_shows(data: dict[str, Any]) -> list[tuple[datetime, datetime, str]]:
+    """Get the upcoming shows from a LibreTime `live-info-v2` response.
+
+    Args:
+    ----
+        data: Response of the LibreTime `live-info-v2` API.
+
+    Returns:
+    -------
+        Start, end and show slug of every upcoming show.
+
+    """
+    from uritools import urisplit  # type: ignore[import-untyped]  # noqa: PLC0415
+
+    return [
+        (
+            datetime.fromisoformat(_show.get("starts")).replace(tzinfo=timezone.utc),
+            datetime.fromisoformat(_show.get("ends")).replace(tzinfo=timezone.utc),
+            PurePath(urisplit(_show.get("url")).path).stem,
+        )
+        for _show in data["shows"]["next"]
+    ]
@@ -0,0 +1,99 @@
+"""Resolve shows for many timestamps concurrently."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+from . import strategy
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+def resolve_shows(
+    timestamps: Iterable[datetime],
+    now: datetime | None = None,
+    max_workers: int = 8,
+    max_per_host: int = 4,
+) -> list[str]:
+    """Look up the show names for many timestamps in parallel threads.
+
+    Each distinct timestamp is only looked up once. Lookups of past
+    timestamps on the same day wait for each other's requests to the
+    archive, so call [`cridlib.prefetch`][cridlib.prefetch.prefetch] first
+    when resolving many timestamps of the same day.
+
+    Args:
+    ----
+        timestamps: Times to get show names for.
+        now: Current time, defaults to `datetime.now()`. Timestamps equal to
+            it get the currently running show.
+        max_workers: Maximum number of lookups in flight.
+        max_per_host: Maximum number of lookups in flight per upstream host.
+
+    Returns:
+    -------
+        Show names (not canonicalized) in the same order as `timestamps`.
+
+    """
+    _now = now or datetime.now(timezone.utc)
+    _timestamps = list(timestamps)
+    _limits = {
+        _name: threading.BoundedSemaphore(max_per_host)
+        for _name in {strategy.name(_ts, _now) for _ts in _timestamps}
+    }
+
+    def _resolve(timestamp: datetime) -> str:
+        with _limits[strategy.name(timestamp, _now)]:
+            return strategy.get_show(timestamp, _now)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as _executor:
+        _futures = {
+            _ts: _executor.submit(_resolve, _ts) for _ts in dict.fromkeys(_timestamps)
+        }
+        return [_futures[_ts].result() for _ts in _timestamps]
+
+
+async def aresolve_shows(
+    timestamps: Iterable[datetime],
+    now: datetime | None = None,
+    max_per_host: int = 4,
+) -> list[str]:
+    """Look up the show names for many timestamps from asyncio code.
+
+    Works like [`resolve_shows`][cridlib.resolve.resolve_shows] but does not
+    block the event loop. The lookups use
+    [`strategy.aget_show`][cridlib.strategy.aget_show], so they share
+    requests with concurrent lookups in other coroutines and threads.
+
+    Args:
+    ----
+        timestamps: Times to get show names for.
+        now: Current time, defaults to `datetime.now()`. Timestamps equal to
+            it get the currently running show.
+        max_per_host: Maximum number of lookups in flight per upstream host.
+
+    Returns:
+    -------
+        Show names (not canonicalized) in the same order as `timestamps`.
+
+    """
+    _now = now or datetime.now(timezone.utc)
+    _timestamps = list(timestamps)
+    _limits = {
+        _name: asyncio.Semaphore(max_per_host)
+        for _name in {strategy.name(_ts, _now) for _ts in _timestamps}
+    }
+
+    async def _resolve(timestamp: datetime) -> str:
+        async with _limits[strategy.name(timestamp, _now)]:
+            return await strategy.aget_show(timestamp, _now)
+
+    _tasks = {
+        _ts: asyncio.ensure_future(_resolve(_ts)) for _ts in dict.fromkeys(_timestamps)
+    }
+    return list(await asyncio.gather(*(_tasks[_ts] for _ts in _timestamps)))
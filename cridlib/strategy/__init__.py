@@ -3,4 +3,510 @@
 * [`cridlib.strategy.past`](./past/)
 * [`cridlib.strategy.present`](./present/)
 * [`cridlib.strategy.future`](./future/)
+* [`cridlib.strategy.local`](./local/)
+
+Lookups go through a chain of resolvers. Every resolver decides which
+timestamps it accepts, the first resolver in the chain that accepts a
+timestamp gets asked for the show. If it fails or doesn't answer within its
+timeout, the next resolver that accepts the timestamp gets asked.
+
+Resolvers that talk to an upstream host have a
+[`CircuitBreaker`][cridlib.breaker.CircuitBreaker], so a host that is down
+gets skipped right away instead of every lookup waiting for its timeouts and
+retries. [`set_budget`][cridlib.strategy.set_budget] bounds the time a
+lookup may take over the whole chain and
+[`set_degrade`][cridlib.strategy.set_degrade] makes failed lookups return
+no show instead of raising.
+
+The default chain asks the songticker for the current show, then a local
+index if one is set, then the archive for the past and LibreTime for the
+future. Use [`register`][cridlib.strategy.register] and
+[`set_chain`][cridlib.strategy.set_chain] to add your own resolvers, i.e.
+to route lookups to a faster source first.
+
+Resolvers with a timeout get asked in a thread of their own, so the caller
+can stop waiting for them. Only a few lookups per resolver may run at the
+same time, further lookups fail right away while the resolver hangs.
+Resolvers with a `uses_deadline` attribute that is true pass the timeout
+down to their requests with [`util.deadline`][cridlib.util.deadline]
+instead, like the built-in ones, and get asked in the calling thread.
+
+[`aget_show`][cridlib.strategy.aget_show] goes through the same chain
+without blocking the event loop. Resolvers with an `aget_show` coroutine
+method get awaited, all others get asked in a thread.
+
+Examples
+--------
+    ```python
+    >>> from datetime import datetime, timezone
+    >>> class Playout:
+    ...     def accepts(self, timestamp, now_):
+    ...         return True
+    ...     def get_show(self, timestamp, now_):
+    ...         return "Klangbecken"
+    >>> register("playout", Playout(), timeout=0.5)
+    >>> set_chain(["playout", *get_chain()])
+    >>> _now = datetime.now(timezone.utc)
+    >>> name(_now, _now), get_show(_now, _now)
+    ('playout', 'Klangbecken')
+    >>> reset()
+
+    ```
+
 """
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, NamedTuple, Protocol, Self
+
+from cridlib import instrument, util
+from cridlib.breaker import CircuitBreaker, CircuitOpenError
+
+from . import future, local, now, past
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class Resolver(Protocol):
+    """Interface of show resolvers."""
+
+    def accepts(self: Self, timestamp: datetime, now_: datetime) -> bool:
+        """Check if the resolver can look up the show at `timestamp`."""
+
+    def get_show(self: Self, timestamp: datetime, now_: datetime) -> str:
+        """Get the show name at `timestamp`, an empty string if there is none."""
+
+
+class ResolverBusyError(Exception):
+    """Lookup skipped because too many lookups of the resolver are still running."""
+
+
+class _Registered(NamedTuple):
+    resolver: Resolver
+    timeout: float | None
+    breaker: CircuitBreaker | None
+    max_in_flight: int
+
+
+class _Now:
+    uses_deadline = True
+
+    def accepts(self: Self, timestamp: datetime, now_: datetime) -> bool:
+        return timestamp == now_
+
+    def get_show(self: Self, timestamp: datetime, now_: datetime) -> str:  # noqa: ARG002
+        return now.get_show()
+
+    async def aget_show(self: Self, timestamp: datetime, now_: datetime) -> str:  # noqa: ARG002
+        return await now.aget_show()
+
+
+class _Local:
+    uses_deadline = True
+
+    def accepts(self: Self, timestamp: datetime, now_: datetime) -> bool:  # noqa: ARG002
+        return local.covers(timestamp)
+
+    def get_show(self: Self, timestamp: datetime, now_: datetime) -> str:  # noqa: ARG002
+        return local.get_show(timestamp)
+
+    async def aget_show(self: Self, timestamp: datetime, now_: datetime) -> str:  # noqa: ARG002
+        # the index is memory mapped, lookups don't need a thread
+        return local.get_show(timestamp)
+
+
+class _Past:
+    uses_deadline = True
+
+    def accepts(self: Self, timestamp: datetime, now_: datetime) -> bool:
+        return timestamp < now_
+
+    def get_show(self: Self, timestamp: datetime, now_: datetime) -> str:  # noqa: ARG002
+        return past.get_show(past=timestamp)
+
+    async def aget_show(self: Self, timestamp: datetime, now_: datetime) -> str:  # noqa: ARG002
+        return await past.aget_show(past=timestamp)
+
+
+class _Future:
+    uses_deadline = True
+
+    def accepts(self: Self, timestamp: datetime, now_: datetime) -> bool:
+        return timestamp > now_
+
+    def get_show(self: Self, timestamp: datetime, now_: datetime) -> str:  # noqa: ARG002
+        return future.get_show(future=timestamp)
+
+    async def aget_show(self: Self, timestamp: datetime, now_: datetime) -> str:  # noqa: ARG002
+        return await future.aget_show(future=timestamp)
+
+
+_DEFAULT_CHAIN = ("now", "local", "past", "future")
+
+_lock = threading.Lock()
+_registry: dict[str, _Registered] = {}
+_chain: tuple[tuple[str, _Registered], ...] = ()
+_budget: float | None = None
+_degrade = False
+# lookups running in threads of their own by resolver name
+_in_flight: dict[str, int] = {}
+
+
+def register(
+    name: str,
+    resolver: Resolver,
+    timeout: float | None = None,
+    breaker: CircuitBreaker | None = None,
+    max_in_flight: int = 8,
+) -> None:
+    """Register a resolver, replacing any resolver with the same name.
+
+    Registering a resolver does not add it to the chain unless it replaces
+    a resolver that is part of it, see [`set_chain`][cridlib.strategy.set_chain].
+
+    Args:
+    ----
+        name: Name of the resolver, also used to limit concurrent lookups
+            per resolver in [`resolve_shows`][cridlib.resolve.resolve_shows].
+        resolver: The resolver.
+        timeout: Seconds to wait for an answer before asking the next
+            resolver, None to wait as long as the resolver takes. Lookups
+            of resolvers without `uses_deadline` keep running in their
+            thread after a timeout.
+        breaker: Circuit breaker to skip the resolver after it failed or
+            timed out repeatedly, None to always ask it.
+        max_in_flight: Number of lookups that may run in threads of their
+            own at the same time, further lookups raise
+            [`ResolverBusyError`][cridlib.strategy.ResolverBusyError]
+            until one of them finished.
+
+    """
+    global _chain  # noqa: PLW0603
+    with _lock:
+        _registry[name] = _Registered(resolver, timeout, breaker, max_in_flight)
+        _chain = tuple((_name, _registry[_name]) for _name, _ in _chain)
+
+
+def set_chain(names: Iterable[str]) -> None:
+    """Set the order in which resolvers get asked.
+
+    Args:
+    ----
+        names: Names of registered resolvers.
+
+    Raises:
+    ------
+        ValueError: If a resolver is not registered.
+
+    """
+    global _chain  # noqa: PLW0603
+    _names = list(names)
+    with _lock:
+        _unknown = [_name for _name in _names if _name not in _registry]
+        if _unknown:
+            msg = f"unknown resolvers: {', '.join(_unknown)}"
+            raise ValueError(msg)
+        _chain = tuple((_name, _registry[_name]) for _name in _names)
+
+
+def get_chain() -> list[str]:
+    """Get the names of the resolvers in the chain.
+
+    Returns
+    -------
+        Names in the order the resolvers get asked.
+
+    """
+    return [_name for _name, _ in _chain]
+
+
+def reset() -> None:
+    """Restore the default resolvers, chain, budget and degraded mode."""
+    global _chain, _budget, _degrade  # noqa: PLW0603
+    with _lock:
+        _registry.clear()
+        _chain = ()
+        _budget = None
+        _degrade = False
+    register("now", _Now(), breaker=CircuitBreaker())
+    register("local", _Local())
+    register("past", _Past(), breaker=CircuitBreaker())
+    register("future", _Future(), breaker=CircuitBreaker())
+    set_chain(_DEFAULT_CHAIN)
+
+
+def set_budget(seconds: float | None) -> None:
+    """Limit how long a lookup may take over all resolvers in the chain.
+
+    Resolvers get asked with a timeout of whatever is left of the budget.
+    The built-in resolvers use it as timeout of their requests and stop
+    retrying once it is used up, so a slow upstream can't block the caller
+    for much longer than the budget and no requests keep running after it.
+
+    Args:
+    ----
+        seconds: Latency budget per lookup, None for no limit.
+
+    """
+    global _budget  # noqa: PLW0603
+    _budget = seconds
+
+
+def set_degrade(degrade: bool) -> None:  # noqa: FBT001
+    """Configure what happens when every resolver failed.
+
+    Args:
+    ----
+        degrade: Return an empty string, i.e. a CRID without show, instead
+            of raising the error of the last resolver.
+
+    """
+    global _degrade  # noqa: PLW0603
+    _degrade = degrade
+
+
+def name(timestamp: datetime, now_: datetime) -> str:
+    """Get the name of the first resolver in the chain accepting `timestamp`.
+
+    The built-in resolvers talk to exactly one upstream host each, so the
+    name also identifies the host a lookup goes to. The `local` resolver
+    answers from a local index without network access, see
+    [`local.set_index`][cridlib.strategy.local.set_index].
+
+    Args:
+    ----
+        timestamp: Time to get a show for.
+        now_: Current time, `timestamp` is equal to it for the current show.
+
+    Returns:
+    -------
+        One of `now`, `local`, `past`, `future` or the name of a registered
+        resolver, an empty string if no resolver accepts `timestamp`.
+
+    """
+    for _name, _registered in _chain:
+        if _registered.resolver.accepts(timestamp, now_):
+            return _name
+    return ""
+
+
+def get_show(timestamp: datetime, now_: datetime) -> str:
+    """Get the show name for `timestamp` from the resolver chain.
+
+    Args:
+    ----
+        timestamp: Time to get a show for.
+        now_: Current time, `timestamp` is equal to it for the current show.
+
+    Returns:
+    -------
+        Name of the show or an empty string if there is no show.
+
+    Raises:
+    ------
+        Exception: The error of the last resolver if all resolvers that
+            accept `timestamp` failed and degraded mode is off. That is a
+            `TimeoutError` if it timed out or used up the budget, a
+            [`CircuitOpenError`][cridlib.breaker.CircuitOpenError] if its
+            circuit breaker is open and a
+            [`ResolverBusyError`][cridlib.strategy.ResolverBusyError] if
+            too many of its lookups are still running.
+
+    """
+    _deadline = time.monotonic() + _budget if _budget is not None else None
+    _error: Exception | None = None
+    for _name, _registered in _chain:
+        if not _registered.resolver.accepts(timestamp, now_):
+            continue
+        try:
+            with instrument.timed("resolve", _name):
+                return _call(_name, _registered, timestamp, now_, _deadline)
+        except Exception as ex:  # noqa: BLE001
+            logger.warning("Resolver %s failed for %s", _name, timestamp, exc_info=True)
+            _error = ex
+    if _error is None:
+        return ""
+    if _degrade:
+        logger.warning("Returning no show for %s", timestamp)
+        return ""
+    raise _error
+
+
+async def aget_show(timestamp: datetime, now_: datetime) -> str:
+    """Get the show name for `timestamp` without blocking the event loop.
+
+    Works like [`get_show`][cridlib.strategy.get_show], with the same
+    timeouts, circuit breakers, budget and degraded mode. Timeouts cancel
+    waiting for the lookup but not the upstream request, so other
+    coroutines waiting for the same request still get its result.
+
+    Args:
+    ----
+        timestamp: Time to get a show for.
+        now_: Current time, `timestamp` is equal to it for the current show.
+
+    Returns:
+    -------
+        Name of the show or an empty string if there is no show.
+
+    Raises:
+    ------
+        Exception: The error of the last resolver, like
+            [`get_show`][cridlib.strategy.get_show].
+
+    """
+    _deadline = time.monotonic() + _budget if _budget is not None else None
+    _error: Exception | None = None
+    for _name, _registered in _chain:
+        if not _registered.resolver.accepts(timestamp, now_):
+            continue
+        try:
+            with instrument.timed("resolve", _name):
+                return await _acall(_name, _registered, timestamp, now_, _deadline)
+        except Exception as ex:  # noqa: BLE001
+            logger.warning("Resolver %s failed for %s", _name, timestamp, exc_info=True)
+            _error = ex
+    if _error is None:
+        return ""
+    if _degrade:
+        logger.warning("Returning no show for %s", timestamp)
+        return ""
+    raise _error
+
+
+def _call(
+    name: str,
+    registered: _Registered,
+    timestamp: datetime,
+    now_: datetime,
+    deadline: float | None,
+) -> str:
+    """Ask a resolver, in a thread of its own if it can't keep its timeout."""
+    _timeout = _allow(name, registered, deadline)
+    _resolver = registered.resolver
+    _breaker = registered.breaker
+    try:
+        if _timeout is None:
+            _show = _resolver.get_show(timestamp, now_)
+        elif getattr(_resolver, "uses_deadline", False):
+            with util.deadline(_timeout):
+                _show = _resolver.get_show(timestamp, now_)
+        else:
+            _show = _call_in_thread(name, registered, timestamp, now_, _timeout)
+    except ResolverBusyError:
+        raise
+    except Exception:
+        if _breaker is not None:
+            _breaker.record_failure()
+        raise
+    if _breaker is not None:
+        _breaker.record_success()
+    return _show
+
+
+def _call_in_thread(
+    name: str,
+    registered: _Registered,
+    timestamp: datetime,
+    now_: datetime,
+    timeout: float,
+) -> str:
+    """Ask a resolver in a thread, so the caller can stop waiting after `timeout`."""
+    with _lock:
+        _running = _in_flight.get(name, 0)
+        if _running >= registered.max_in_flight:
+            msg = f"{_running} lookups of {name} still running"
+            raise ResolverBusyError(msg)
+        _in_flight[name] = _running + 1
+    _future: Future[str] = Future()
+    threading.Thread(
+        target=_run,
+        args=(name, _future, registered.resolver, timestamp, now_),
+        name=f"cridlib-resolver-{name}",
+        daemon=True,
+    ).start()
+    return _future.result(timeout=timeout)
+
+
+def _run(
+    name: str,
+    future: Future[str],
+    resolver: Resolver,
+    timestamp: datetime,
+    now_: datetime,
+) -> None:
+    try:
+        future.set_result(resolver.get_show(timestamp, now_))
+    except Exception as ex:  # noqa: BLE001
+        future.set_exception(ex)
+    finally:
+        with _lock:
+            _in_flight[name] -= 1
+
+
+async def _acall(
+    name: str,
+    registered: _Registered,
+    timestamp: datetime,
+    now_: datetime,
+    deadline: float | None,
+) -> str:
+    """Await a resolver, asking resolvers without coroutine in a thread."""
+    _timeout = _allow(name, registered, deadline)
+    _aget_show = getattr(registered.resolver, "aget_show", None)
+    if _aget_show is not None:
+        _lookup = _aget_show(timestamp, now_)
+    else:
+        _lookup = asyncio.to_thread(registered.resolver.get_show, timestamp, now_)
+    _breaker = registered.breaker
+    try:
+        with util.deadline(_timeout):
+            _show: str = await asyncio.wait_for(_lookup, _timeout)
+    except Exception:
+        if _breaker is not None:
+            _breaker.record_failure()
+        raise
+    if _breaker is not None:
+        _breaker.record_success()
+    return _show
+
+
+def _allow(name: str, registered: _Registered, deadline: float | None) -> float | None:
+    """Check budget and breaker before asking a resolver, returns its timeout."""
+    _timeout = registered.timeout
+    if deadline is not None:
+        _remaining = deadline - time.monotonic()
+        if _remaining <= 0:
+            msg = f"latency budget used up before asking {name}"
+            raise TimeoutError(msg)
+        _timeout = _remaining if _timeout is None else min(_timeout, _remaining)
+    _breaker = registered.breaker
+    if _breaker is not None and not _breaker.allow():
+        msg = f"circuit breaker of {name} is open"
+        raise CircuitOpenError(msg)
+    return _timeout
+
+
+def _after_fork_in_child() -> None:
+    """Replace the lock in forked children, it might have been held.
+
+    The threads of lookups in flight are gone in the child, so they don't
+    count against the limit of their resolver anymore.
+    """
+    global _lock  # noqa: PLW0603
+    _lock = threading.Lock()
+    _in_flight.clear()
+
+
+reset()
+os.register_at_fork(after_in_child=_after_fork_in_child)
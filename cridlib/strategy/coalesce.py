@@ -0,0 +1,166 @@
+"""Share in-flight upstream requests between concurrent lookups.
+
+Concurrent lookups that need the same upstream request, i.e. the same
+broadcast from the archive or the schedule from LibreTime, wait for a
+single request and share its result instead of each sending their own.
+This keeps a burst of lookups after process start or cache expiry from
+hitting the upstream APIs all at once. [`call`][cridlib.strategy.coalesce.call]
+shares requests between threads and
+[`acall`][cridlib.strategy.coalesce.acall] between coroutines. Waiting
+callers get reported to the instrumentation as `coalesce` event with the
+strategy name and `shared` as outcome.
+
+Examples
+--------
+    ```python
+    >>> import asyncio
+    >>> calls = []
+    >>> def fetch(url):
+    ...     calls.append(url)
+    ...     return url.upper()
+    >>> async def lookups():
+    ...     return await asyncio.gather(
+    ...         *(acall("example", "https://rabe.ch", fetch, "rabe") for _ in range(3)),
+    ...     )
+    >>> asyncio.run(lookups()), calls
+    (['RABE', 'RABE', 'RABE'], ['rabe'])
+
+    ```
+
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from concurrent.futures import Future
+from functools import partial
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from cridlib import instrument
+from cridlib.util import time_left
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+_T = TypeVar("_T")
+
+_lock = threading.Lock()
+# in-flight requests of threads by strategy name and key
+_calls: dict[tuple[str, Hashable], Future[Any]] = {}
+# in-flight requests of coroutines by event loop, strategy name and key
+_tasks: dict[tuple[asyncio.AbstractEventLoop, str, Hashable], asyncio.Task[Any]] = {}
+
+
+def call(
+    name: str,
+    key: Hashable,
+    func: Callable[..., _T],
+    *args: Any,  # noqa: ANN401
+) -> _T:
+    """Call a function, sharing the call with other threads.
+
+    Threads calling this with the same `name` and `key` while a call is in
+    flight wait for its result instead of calling `func` again, at most
+    until their [`deadline`][cridlib.util.deadline].
+
+    Args:
+    ----
+        name: Name of the strategy, for instrumentation.
+        key: What identifies the upstream request, i.e. its URL.
+        func: Function doing the request.
+        *args: Arguments for `func`.
+
+    Returns:
+    -------
+        What `func` returned.
+
+    Raises:
+    ------
+        Exception: What `func` raised, every waiting thread gets it.
+        TimeoutError: If a waiting thread's deadline passed first.
+
+    """
+    _key = (name, key)
+    with _lock:
+        _future = _calls.get(_key)
+        _leader = _future is None
+        if _future is None:
+            _future = _calls[_key] = Future()
+    if not _leader:
+        instrument.emit("coalesce", name, outcome="shared")
+        return _future.result(timeout=time_left())
+    try:
+        _result = func(*args)
+    except BaseException as ex:
+        _done(_key)
+        _future.set_exception(ex)
+        raise
+    _done(_key)
+    _future.set_result(_result)
+    return _result
+
+
+async def acall(
+    name: str,
+    key: Hashable,
+    func: Callable[..., _T],
+    *args: Any,  # noqa: ANN401
+) -> _T:
+    """Call a blocking function in a thread, sharing the call with other coroutines.
+
+    Coroutines of the same event loop calling this with the same `name` and
+    `key` while a call is in flight wait for its result instead of calling
+    `func` again. Cancelling a waiting coroutine does not cancel the call,
+    so the others still get its result.
+
+    Args:
+    ----
+        name: Name of the strategy, for instrumentation.
+        key: What identifies the upstream request, i.e. its URL.
+        func: Blocking function doing the request.
+        *args: Arguments for `func`.
+
+    Returns:
+    -------
+        What `func` returned.
+
+    Raises:
+    ------
+        Exception: What `func` raised, every waiting coroutine gets it.
+
+    """
+    _loop = asyncio.get_running_loop()
+    _key = (_loop, name, key)
+    _task = _tasks.get(_key)
+    if _task is None:
+        _task = _loop.create_task(asyncio.to_thread(func, *args))
+        _tasks[_key] = _task
+        _task.add_done_callback(partial(_forget, _key))
+    else:
+        instrument.emit("coalesce", name, outcome="shared")
+    return await asyncio.shield(_task)
+
+
+def _forget(key: tuple[Any, ...], task: asyncio.Task[Any]) -> None:
+    _tasks.pop(key, None)
+    if not task.cancelled():
+        # retrieve the error so it isn't logged if every waiter got cancelled
+        task.exception()
+
+
+def _done(key: tuple[str, Hashable]) -> None:
+    """Let threads calling after this start a new call."""
+    with _lock:
+        _calls.pop(key, None)
+
+
+def _after_fork_in_child() -> None:
+    """Forget the parent's calls in forked children, their threads are gone."""
+    global _lock  # noqa: PLW0603
+    _lock = threading.Lock()
+    _calls.clear()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -1,23 +1,41 @@
 """Handle shows in the future."""
 
-from datetime import datetime, timezone
-from pathlib import PurePath
+import threading
+import time
+from datetime import datetime
 
-from uritools import urisplit  # type: ignore[import-untyped]
-
-from cridlib.util import get_session
+from cridlib import instrument
+from cridlib.cache import IntervalIndex
+from cridlib.lib import seed_slugs
+from cridlib.records import libretime_shows
+from cridlib.strategy.coalesce import acall, call
+from cridlib.util import get_session, request_timeout
 
 __LIBRETIME_INFOV2_URL = (
     "https://airtime.service.int.rabe.ch/api/live-info-v2/format/json"
 )
 
+_lock = threading.Lock()
+_refresh_interval = 300.0
+_schedule: IntervalIndex | None = None
+_fetched_at = 0.0
+_etag: str | None = None
+_last_modified: str | None = None
+
 
-def get_show(future: datetime) -> str:  # pragma: no cover
+def get_show(future: datetime) -> str:
     """Return the slug for a show from LibreTime if it is in the next 7 days.
 
     Only returns a show for the next seven days because everything futher than
     that is considered unreliable as of early 2023.
 
+    The schedule for the next seven days gets downloaded once and is then
+    kept in memory until it is older than the refresh interval, see
+    [`set_refresh_interval`][cridlib.strategy.future.set_refresh_interval].
+    Refreshing uses a conditional request, so an unchanged schedule is not
+    downloaded again if LibreTime supports it. Lookups during a refresh wait
+    for it instead of downloading the schedule themselves.
+
     Args:
     ----
         future: Date to get the show name for.
@@ -27,25 +45,95 @@ def get_show(future: datetime) -> str:  # pragma: no cover
         Name of the show scheduled for `future`.
 
     """
-    _resp = get_session().get(
-        __LIBRETIME_INFOV2_URL,
-        params={
-            "days": 7,
-            "shows": 7000,
-        },
-        timeout=10,
-    )
-
-    _json = _resp.json()
-    _tz = _json.get("station").get("timezone")
-    _next = _json.get("shows").get("next")
-    for _show in _next:
-        _start = datetime.fromisoformat(_show.get("starts")).replace(
-            tzinfo=timezone.utc,
-        )
-        _end = datetime.fromisoformat(_show.get("ends")).replace(tzinfo=timezone.utc)
-        if _start <= future <= _end:
-            _path = PurePath(urisplit(_show.get("url")).path)
-            return _path.stem
+    return _get_schedule().get(future) or ""
+
+
+async def aget_show(future: datetime) -> str:
+    """Return the slug for a show from LibreTime without blocking the event loop.
+
+    Works like [`get_show`][cridlib.strategy.future.get_show] but downloads
+    the schedule in a thread. Concurrent lookups share the download, see
+    [`coalesce`][cridlib.strategy.coalesce].
+
+    Args:
+    ----
+        future: Date to get the show name for.
+
+    Returns:
+    -------
+        Name of the show scheduled for `future`.
+
+    """
+    _schedule_ = _fresh_schedule()
+    if _schedule_ is None:
+        _schedule_ = await acall("future", __LIBRETIME_INFOV2_URL, _get_schedule)
+    return _schedule_.get(future) or ""
+
+
+def set_refresh_interval(seconds: float) -> None:
+    """Set how long the schedule from LibreTime gets used before refreshing it.
+
+    Args:
+    ----
+        seconds: Age after which the schedule gets refreshed.
+
+    """
+    global _refresh_interval  # noqa: PLW0603
+    _refresh_interval = seconds
 
-    return ""
+
+def clear_cache() -> None:
+    """Forget the cached schedule, the next lookup downloads it again."""
+    global _schedule, _fetched_at, _etag, _last_modified
+    with _lock:
+        _schedule, _fetched_at, _etag, _last_modified = None, 0.0, None, None
+
+
+def _fresh_schedule() -> IntervalIndex | None:
+    """Get the schedule if it doesn't need a refresh."""
+    _schedule_ = _schedule
+    if _schedule_ is None or time.monotonic() - _fetched_at >= _refresh_interval:
+        return None
+    instrument.emit("cache", "future", outcome="hit")
+    return _schedule_
+
+
+def _get_schedule() -> IntervalIndex:
+    _schedule_ = _fresh_schedule()
+    if _schedule_ is None:
+        _schedule_ = call("future", __LIBRETIME_INFOV2_URL, _refresh)
+    return _schedule_
+
+
+def _refresh() -> IntervalIndex:
+    global _schedule, _fetched_at, _etag, _last_modified  # noqa: PLW0603
+    with _lock:
+        # another thread might have refreshed it since we checked
+        _schedule_ = _fresh_schedule()
+        if _schedule_ is not None:
+            return _schedule_
+        instrument.emit("cache", "future", outcome="miss")
+        _headers = {}
+        if _schedule is not None and _etag:
+            _headers["If-None-Match"] = _etag
+        if _schedule is not None and _last_modified:
+            _headers["If-Modified-Since"] = _last_modified
+        _resp = get_session().get(
+            __LIBRETIME_INFOV2_URL,
+            params={
+                "days": 7,
+                "shows": 7000,
+            },
+            headers=_headers,
+            timeout=request_timeout(10),
+        )
+        _fetched_at = time.monotonic()
+        if _schedule is not None and _resp.status_code == 304:  # noqa: PLR2004
+            return _schedule
+        with instrument.timed("parse", "future"):
+            _shows = libretime_shows(_resp.json())
+        seed_slugs(_show for _, _, _show in _shows)
+        _schedule = IntervalIndex(_shows)
+        _etag = _resp.headers.get("ETag")
+        _last_modified = _resp.headers.get("Last-Modified")
+        return _schedule
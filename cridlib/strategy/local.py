@@ -0,0 +1,69 @@
+"""Handle shows from a local broadcast index."""
+
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from cridlib.index import BroadcastIndex
+
+_index: BroadcastIndex | None = None
+
+
+def set_index(index: BroadcastIndex | str | os.PathLike[str] | None) -> None:
+    """Answer lookups from a local broadcast index instead of the network.
+
+    Timestamps between the first and the last broadcast of the index get
+    looked up in the index, everything else still goes to the archive or
+    LibreTime. The currently running show always comes from the songticker.
+
+    Args:
+    ----
+        index: Index or path of an index file written by
+            [`build_index`][cridlib.index.build_index], None to stop using
+            the index.
+
+    """
+    # only load the index module if an index gets used
+    from cridlib.index import BroadcastIndex  # noqa: PLC0415
+
+    global _index  # noqa: PLW0603
+    if index is None or isinstance(index, BroadcastIndex):
+        _index = index
+    else:
+        _index = BroadcastIndex(os.fspath(index))
+
+
+def covers(timestamp: datetime) -> bool:
+    """Check if the local index is responsible for `timestamp`.
+
+    Args:
+    ----
+        timestamp: Time to get a show for.
+
+    Returns:
+    -------
+        True if an index is set and covers `timestamp`.
+
+    """
+    return _index is not None and _index.covers(timestamp)
+
+
+def get_show(timestamp: datetime) -> str:
+    """Return the show from the local index.
+
+    Args:
+    ----
+        timestamp: Time to get the show name for.
+
+    Returns:
+    -------
+        Show name from the index or an empty string if there was no show.
+
+    """
+    if _index is None:
+        return ""
+    return _index.get(timestamp) or ""
@@ -1,27 +1,86 @@
 """Handle currently running show."""
 
+import threading
 import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
 from pathlib import PurePath
 
 from uritools import urisplit  # type: ignore[import-untyped]
 
-from cridlib.util import get_session
+from cridlib import instrument
+from cridlib.strategy.coalesce import acall
+from cridlib.util import get_session, request_timeout
 
 __SONGTICKER_URL = "https://songticker.rabe.ch/songticker/0.9.3/current.xml"
+__TICKER_NS = "{http://rabe.ch/schema/ticker.xsd}"
 
+# stop using a cached show a bit before it ends so we don't miss the next one
+__SAFETY_MARGIN = timedelta(seconds=10)
 
-def get_show() -> str:
+_lock = threading.Lock()
+_current: tuple[str, datetime] | None = None
+
+
+def get_show(*, refresh: bool = False) -> str:
     """Get the currently running show.
 
     Calls the the [nowplaying](https://github.com/radiorabe/nowplaying)
     songticker's API.
 
+    The show is cached until shortly before the end time reported by the
+    songticker, so the songticker only gets asked once per show.
+
+    Args:
+    ----
+        refresh: Ask the songticker even if the cached show is still running.
+
+    Returns:
+    -------
+        Name of the currently running show.
+
+    """
+    global _current  # noqa: PLW0603
+    with _lock:
+        if (
+            not refresh
+            and _current is not None
+            and datetime.now(timezone.utc) < _current[1]
+        ):
+            instrument.emit("cache", "now", outcome="hit")
+            return _current[0]
+        instrument.emit("cache", "now", outcome="miss")
+        _resp = get_session().get(__SONGTICKER_URL, timeout=request_timeout(10))
+        with instrument.timed("parse", "now"):
+            _tree = ET.fromstring(_resp.text)  # noqa: S314
+            _show = PurePath(urisplit(_tree[3][1].text).path).stem
+            _end = _tree[3].findtext(f"{__TICKER_NS}endTime")
+        _current = None
+        if _end:
+            _current = (_show, datetime.fromisoformat(_end) - __SAFETY_MARGIN)
+        return _show
+
+
+async def aget_show() -> str:
+    """Get the currently running show without blocking the event loop.
+
+    Works like [`get_show`][cridlib.strategy.now.get_show] but asks the
+    songticker in a thread. Concurrent lookups share the request, see
+    [`coalesce`][cridlib.strategy.coalesce].
+
     Returns
     -------
         Name of the currently running show.
 
     """
-    _resp = get_session().get(__SONGTICKER_URL, timeout=10)
-    _tree = ET.fromstring(_resp.text)  # noqa: S314
-    _path = PurePath(urisplit(_tree[3][1].text).path)
-    return _path.stem
+    _cached = _current
+    if _cached is not None and datetime.now(timezone.utc) < _cached[1]:
+        instrument.emit("cache", "now", outcome="hit")
+        return _cached[0]
+    return await acall("now", __SONGTICKER_URL, get_show)
+
+
+def clear_cache() -> None:
+    """Forget the cached show, the next lookup asks the songticker again."""
+    global _current  # noqa: PLW0603
+    with _lock:
+        _current = None
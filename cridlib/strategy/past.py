@@ -1,12 +1,28 @@
 """Handle shows from the past."""
 
-from datetime import datetime
+import logging
+from collections.abc import Iterator
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any
 from zoneinfo import ZoneInfo
 
-from cridlib.util import get_session
+from cridlib import instrument
+from cridlib.cache import IntervalCache, ShowCache
+from cridlib.lib import seed_slugs
+from cridlib.records import raar_broadcasts, raar_show
+from cridlib.strategy.coalesce import acall, call
+from cridlib.util import get_session, request_timeout
+
+logger = logging.getLogger(__name__)
 
 __ARCHIV_BROADCASTS_URL = "https://archiv.rabe.ch/api/broadcasts/"
 
+# broadcasts that ended less than this long ago might still get edited in the archive
+__RECENT = timedelta(days=2)
+__RECENT_TTL = 300.0
+
+_cache: ShowCache = IntervalCache()
+
 
 def get_show(past: datetime) -> str:
     """Return a show from the past.
@@ -16,6 +32,14 @@ def get_show(past: datetime) -> str:
     We always request the show info in Europe/Zurich timezone, as the archive
     works with local times.
 
+    Broadcasts returned by the archive get cached for their whole duration so
+    lookups for other timestamps during the same broadcast don't need to ask
+    the archive again. Recent broadcasts only get cached for a few minutes
+    because they might still change. Concurrent lookups on the same day
+    share one request, see [`coalesce`][cridlib.strategy.coalesce]: the
+    others check the cache once it is done and only ask the archive
+    themselves if the broadcast it returned doesn't cover their timestamp.
+
     Args:
     ----
         past: Date to get the show name for.
@@ -25,11 +49,193 @@ def get_show(past: datetime) -> str:
         Show name from the archive for `past`.
 
     """
+    _cached = _cache.get(past)
+    if _cached is not None:
+        instrument.emit("cache", "past", outcome="hit")
+        return _cached
+    instrument.emit("cache", "past", outcome="miss")
+    _url_ = _url(past)
+    while True:
+        _show = _shared(past, _url_, _fetch_day(_day(past), _url_))
+        if _show is not None:
+            return _show
+
+
+async def aget_show(past: datetime) -> str:
+    """Return a show from the past without blocking the event loop.
+
+    Works like [`get_show`][cridlib.strategy.past.get_show] but does the
+    request in a thread, shared with concurrent lookups on the same day in
+    other threads and coroutines.
+
+    Args:
+    ----
+        past: Date to get the show name for.
+
+    Returns:
+    -------
+        Show name from the archive for `past`.
+
+    """
+    _cached = _cache.get(past)
+    if _cached is not None:
+        instrument.emit("cache", "past", outcome="hit")
+        return _cached
+    instrument.emit("cache", "past", outcome="miss")
+    _url_ = _url(past)
+    _day_ = _day(past)
+    while True:
+        _result = await acall("past", _day_, _fetch_day, _day_, _url_)
+        _show = _shared(past, _url_, _result)
+        if _show is not None:
+            return _show
+
+
+def prefetch(start: datetime, end: datetime) -> int:
+    """Cache all broadcasts from the archive between `start` and `end`.
+
+    Fetches the broadcast listing of every day in the range with a single
+    request per day. Afterwards [`get_show`][cridlib.strategy.past.get_show]
+    answers every timestamp in the range from the cache, including the gaps
+    between broadcasts where the archive has no show. The slugs of all
+    shows in the range get cached as well.
+
+    Caches with a `maxsize` that is too small for the range, i.e. the
+    default cache for ranges longer than a few weeks, get grown so the
+    first days of the range don't get evicted by the last ones. Use
+    [`set_cache`][cridlib.strategy.past.set_cache] to shrink it again.
+
+    Args:
+    ----
+        start: Start of the range to prefetch.
+        end: End of the range to prefetch.
+
+    Returns:
+    -------
+        Number of broadcasts cached.
+
+    """
+    _tz = ZoneInfo("Europe/Zurich")
+    _day = start.astimezone(tz=_tz).date()
+    _last = end.astimezone(tz=_tz).date()
+    _count = 0
+    _shows: set[str] = set()
+    _intervals: list[tuple[datetime, datetime, str]] = []
+    while _day <= _last:
+        _day_start = datetime.combine(_day, time(), tzinfo=_tz)
+        _day_end = datetime.combine(_day + timedelta(days=1), time(), tzinfo=_tz)
+        _cursor = _day_start
+        for _start, _end, _show in _get_day(_day):
+            if _cursor < _start:
+                _intervals.append((_cursor, _start, ""))
+            _intervals.append((_start, _end, _show))
+            _shows.add(_show)
+            _cursor = max(_cursor, _end)
+            _count += 1
+        if _cursor < _day_end:
+            _intervals.append((_cursor, _day_end, ""))
+        _day += timedelta(days=1)
+
+    _maxsize = getattr(_cache, "maxsize", None)
+    if _maxsize is not None and _maxsize < len(_intervals):
+        logger.warning(
+            "Growing past show cache from %d to %d intervals for prefetch",
+            _maxsize,
+            len(_intervals),
+        )
+        _cache.maxsize = len(_intervals)  # type: ignore[attr-defined]
+    for _start, _end, _show in _intervals:
+        _cache.put(_start, _end, _show, ttl=_ttl(_end))
+    seed_slugs(_shows)
+    return _count
+
+
+def clear_cache() -> None:
+    """Forget all cached broadcasts."""
+    _cache.clear()
+
+
+def set_cache(cache: ShowCache) -> None:
+    """Replace the broadcast cache, i.e. to change its size.
+
+    Use a [`SQLiteIntervalCache`][cridlib.cache.SQLiteIntervalCache] to share
+    the cache between processes and keep it when they exit.
+
+    Args:
+    ----
+        cache: Cache to use for future lookups.
+
+    """
+    global _cache  # noqa: PLW0603
+    _cache = cache
+
+
+def _url(past: datetime) -> str:
+    """Get the archive URL for the broadcast at `past`."""
     _past = past.astimezone(tz=ZoneInfo("Europe/Zurich"))
-    _url = f"{__ARCHIV_BROADCASTS_URL}{_past.year}/{_past.month:02d}/{_past.day:02d}/{_past.hour:02d}{_past.minute:02d}{_past.second:02d}"  # noqa: E501
-    _resp = get_session().get(_url, timeout=10)
-    _json = _resp.json()
+    return f"{__ARCHIV_BROADCASTS_URL}{_past.year}/{_past.month:02d}/{_past.day:02d}/{_past.hour:02d}{_past.minute:02d}{_past.second:02d}"  # noqa: E501
+
+
+def _day(past: datetime) -> date:
+    """Get the day in the archive's timezone that `past` is on."""
+    return past.astimezone(tz=ZoneInfo("Europe/Zurich")).date()
+
+
+def _fetch_day(day: date, url: str) -> tuple[str, str]:
+    """Ask the archive for a broadcast, sharing the request of the same day."""
+    return call("past", day, _fetch, url)
+
+
+def _shared(past: datetime, url: str, result: tuple[str, str]) -> str | None:
+    """Get the show at `past` from a shared request, None to ask again.
+
+    Lookups that waited for the request of another timestamp check the
+    cache instead. If the broadcast it returned doesn't cover `past` they
+    need to ask the archive themselves.
+    """
+    _url_, _show = result
+    if _url_ == url:
+        return _show
+    return _cache.get(past)
+
+
+def _fetch(url: str) -> tuple[str, str]:
+    """Ask the archive for a broadcast and cache it."""
+    _resp = get_session().get(url, timeout=request_timeout(10))
+    with instrument.timed("parse", "past"):
+        _json = _resp.json()
     _data = _json.get("data")
-    _label = str(_data[0].get("attributes").get("label")) if len(_data) == 1 else ""
+    if len(_data) != 1:
+        return url, ""
+    _attributes = _data[0].get("attributes")
+    _show = raar_show(_attributes)
+    _cache_broadcast(_attributes, _show)
+    return url, _show
+
+
+def _cache_broadcast(attributes: dict[str, Any], show: str) -> None:
+    """Cache a broadcast if the archive told us when it started and finished."""
+    _started_at = attributes.get("started_at")
+    _finished_at = attributes.get("finished_at")
+    if not _started_at or not _finished_at:
+        return
+    _end = datetime.fromisoformat(_finished_at)
+    _cache.put(datetime.fromisoformat(_started_at), _end, show, ttl=_ttl(_end))
+
+
+def _ttl(end: datetime) -> float | None:
+    """Only cache recent broadcasts for a short while since they might change."""
+    if end > datetime.now(timezone.utc) - __RECENT:
+        return __RECENT_TTL
+    return None
+
 
-    return _label.lower().replace(" ", "-")
+def _get_day(day: date) -> Iterator[tuple[datetime, datetime, str]]:
+    """Get all broadcasts on a day, following pagination links."""
+    _url: str | None = (
+        f"{__ARCHIV_BROADCASTS_URL}{day.year}/{day.month:02d}/{day.day:02d}"
+    )
+    while _url:
+        _json = get_session().get(_url, timeout=request_timeout(10)).json()
+        yield from raar_broadcasts(_json)
+        _url = (_json.get("links") or {}).get("next")
@@ -1,14 +1,59 @@
 """Utility functions for cridlib."""
 
-from requests import Session
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Self
+from urllib.parse import urlsplit
+
+from requests import Response, Session
 from requests.adapters import HTTPAdapter, Retry
+from urllib3.exceptions import MaxRetryError
+
+from . import instrument
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from types import TracebackType
+
+    from urllib3.connectionpool import ConnectionPool
+    from urllib3.response import BaseHTTPResponse
+
+_SESSION_DEFAULTS: dict[str, Any] = {
+    "retries": 5,
+    "backoff_factor": 0.1,
+    "pool_connections": 10,
+    "pool_maxsize": 10,
+    "pool_block": False,
+    "keep_alive": True,
+}
+
+# monotonic time by which requests of the current lookup need to be done
+_deadline: ContextVar[float | None] = ContextVar("cridlib_deadline", default=None)
+
+_session_lock = threading.Lock()
+_session_config: dict[str, Any] = dict(_SESSION_DEFAULTS)
+_session: Session | None = None
+_session_pid: int | None = None
 
 
-def get_session(
+def new_session(  # noqa: PLR0913
     retries: int = 5,
     backoff_factor: float = 0.1,
+    pool_connections: int = 10,
+    pool_maxsize: int = 10,
+    *,
+    pool_block: bool = False,
+    keep_alive: bool = True,
 ) -> Session:
-    """Get a requests session with retry/backoff.
+    """Create a new requests session with retry/backoff and connection pooling.
+
+    Most callers want the shared session from [`get_session`][cridlib.util.get_session]
+    instead, this is only useful if you need a session that is not shared.
 
     Args:
     ----
@@ -21,16 +66,206 @@ def get_session(
             will sleep for [0.0s, 0.2s, 0.4s, ...] between retries. It will
             never be longer than `backoff_max`.
             By default, backoff is set to 0.1.
+        pool_connections: Number of per-host connection pools to cache.
+        pool_maxsize: Maximum number of connections kept open per host.
+        pool_block: Block when no free connection is available instead of
+            opening a connection that gets discarded after use.
+        keep_alive: Keep connections open between requests.
 
     """
     session = Session()
-    session.mount(
-        "https://",
-        HTTPAdapter(
-            max_retries=Retry(
-                total=retries,
-                backoff_factor=backoff_factor,
-            ),
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+        max_retries=_InstrumentedRetry(
+            total=retries,
+            backoff_factor=backoff_factor,
         ),
     )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    session.hooks["response"].append(_report_response)
     return session
+
+
+class _InstrumentedRetry(Retry):
+    """Retry that reports every retry to the instrumentation.
+
+    Gives up instead of retrying once the backoff would not fit in what is
+    left of the current [`deadline`][cridlib.util.deadline].
+    """
+
+    def increment(
+        self: Self,
+        method: str | None = None,
+        url: str | None = None,
+        response: BaseHTTPResponse | None = None,
+        error: Exception | None = None,
+        _pool: ConnectionPool | None = None,
+        _stacktrace: TracebackType | None = None,
+    ) -> Self:
+        if error is not None:
+            _reason = type(error).__name__
+        elif response is not None:
+            _reason = str(response.status)
+        else:
+            _reason = "unknown"
+        instrument.emit("retry", getattr(_pool, "host", None) or "", outcome=_reason)
+        _retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        _left = time_left()
+        if _left is not None and _left <= _retry.get_backoff_time():
+            raise MaxRetryError(_pool, url, error)  # type: ignore[arg-type]
+        return _retry
+
+
+def _report_response(response: Response, *_args: Any, **_kwargs: Any) -> None:  # noqa: ANN401
+    """Report the latency of every response to the instrumentation."""
+    instrument.emit(
+        "request",
+        urlsplit(response.url).hostname or "",
+        response.elapsed.total_seconds(),
+        str(response.status_code),
+    )
+
+
+@contextmanager
+def deadline(seconds: float | None) -> Iterator[None]:
+    """Limit how long the requests of a lookup may take, retries included.
+
+    Requests of the strategies made inside the with block, also from
+    threads started with `asyncio.to_thread`, get at most the time left as
+    timeout, see [`request_timeout`][cridlib.util.request_timeout], and
+    don't get retried once the time is up. Nested deadlines can only
+    shorten the time left.
+
+    Args:
+    ----
+        seconds: Time the requests may take, None for no limit.
+
+    """
+    if seconds is None:
+        yield
+        return
+    _at = time.monotonic() + seconds
+    _outer = _deadline.get()
+    _token = _deadline.set(_at if _outer is None else min(_at, _outer))
+    try:
+        yield
+    finally:
+        _deadline.reset(_token)
+
+
+def time_left() -> float | None:
+    """Get the seconds left until the current deadline.
+
+    Returns
+    -------
+        Seconds left, can be negative, None outside of a deadline.
+
+    """
+    _at = _deadline.get()
+    if _at is None:
+        return None
+    return _at - time.monotonic()
+
+
+def request_timeout(default: float) -> float:
+    """Get the timeout for a request, bounded by the current deadline.
+
+    Args:
+    ----
+        default: Timeout to use if there is no deadline or it is further away.
+
+    Returns:
+    -------
+        The timeout in seconds.
+
+    Raises:
+    ------
+        TimeoutError: If the deadline already passed.
+
+    """
+    _left = time_left()
+    if _left is None:
+        return default
+    if _left <= 0:
+        msg = "deadline passed before sending the request"
+        raise TimeoutError(msg)
+    return min(default, _left)
+
+
+def get_session() -> Session:
+    """Get the shared requests session with retry/backoff.
+
+    All strategies share one session per process so connections to the
+    upstream APIs get reused. The session is created on first use with the
+    settings from [`configure_session`][cridlib.util.configure_session] and
+    recreated when used in a forked child process, since pooled sockets must
+    not be shared between processes.
+
+    Returns
+    -------
+        The shared session.
+
+    """
+    global _session, _session_pid  # noqa: PLW0603
+    with _session_lock:
+        if _session is None or _session_pid != os.getpid():
+            _session = new_session(**_session_config)
+            _session_pid = os.getpid()
+        return _session
+
+
+def configure_session(**kwargs: Any) -> None:  # noqa: ANN401
+    """Configure the shared session.
+
+    Takes the same keyword arguments as [`new_session`][cridlib.util.new_session].
+    Settings not passed keep their current value. The shared session is closed
+    and gets recreated with the new settings on next use.
+
+    Args:
+    ----
+        **kwargs: Settings to change.
+
+    """
+    unknown = set(kwargs) - set(_SESSION_DEFAULTS)
+    if unknown:
+        msg = f"unknown session settings: {', '.join(sorted(unknown))}"
+        raise TypeError(msg)
+    with _session_lock:
+        _session_config.update(kwargs)
+    close_session()
+
+
+def close_session() -> None:
+    """Close the shared session and its pooled connections.
+
+    The next call to [`get_session`][cridlib.util.get_session] creates a new one.
+    """
+    global _session, _session_pid
+    with _session_lock:
+        session, _session, _session_pid = _session, None, None
+    if session is not None:
+        session.close()
+
+
+def reset_session() -> None:
+    """Close the shared session and restore the default settings."""
+    with _session_lock:
+        _session_config.clear()
+        _session_config.update(_SESSION_DEFAULTS)
+    close_session()
+
+
+def _after_fork_in_child() -> None:
+    """Drop the parent's session in forked children without closing its sockets."""
+    global _session, _session_lock, _session_pid  # noqa: PLW0603
+    _session_lock = threading.Lock()
+    _session = None
+    _session_pid = None
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,87 @@
+"""Benchmark harness with stored baselines and local upstream servers.
+
+Every benchmark reports the best time per call over a few repeats and
+fails if it is more than `THRESHOLD` times slower than its baseline in
+`baseline.json`. The threshold is generous since CI machines differ a lot,
+it only catches real regressions like an extra request or a lost cache.
+
+Benchmarks are marked with `benchmark` and deselected by default, run
+them with `pytest -m benchmark --no-cov tests/benchmarks`. Add
+`CRIDLIB_BENCH_SAVE=1` to store new baselines after intentional changes.
+"""
+
+import json
+import os
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from cridlib.fake import FakeUpstream
+
+BASELINE = Path(__file__).with_name("baseline.json")
+THRESHOLD = 3.0
+
+_results: dict[str, float] = {}
+
+
+@pytest.fixture(name="upstream", scope="session")
+def fixture_upstream():
+    """Serve the upstream APIs locally with 1ms latency per request."""
+    with FakeUpstream(
+        latency=0.001,
+        now=datetime(1993, 3, 1, tzinfo=timezone.utc),
+    ) as upstream:
+        yield upstream
+
+
+@pytest.fixture(name="local_upstream")
+def fixture_local_upstream(upstream):
+    """Point the strategies at the local upstream servers."""
+    with upstream.redirect():
+        yield upstream
+
+
+@pytest.fixture(name="bench")
+def fixture_bench(request):
+    """Time a function and compare it to its baseline."""
+
+    def _bench(func, number=200, repeat=3):
+        per_call = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+        name = request.node.name
+        _results[name] = per_call
+        baseline = _load_baseline().get(name)
+        if baseline is not None and not os.environ.get("CRIDLIB_BENCH_SAVE"):
+            assert per_call <= baseline * THRESHOLD, (
+                f"{name} took {per_call * 1e6:.1f}us per call, "
+                f"baseline is {baseline * 1e6:.1f}us"
+            )
+        return per_call
+
+    return _bench
+
+
+def _load_baseline():
+    if not BASELINE.exists():
+        return {}
+    return json.loads(BASELINE.read_text())
+
+
+def pytest_sessionfinish(session, exitstatus):  # noqa: ARG001
+    if _results and os.environ.get("CRIDLIB_BENCH_SAVE"):
+        baseline = _load_baseline()
+        baseline.update(_results)
+        BASELINE.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _results:
+        return
+    baseline = _load_baseline()
+    terminalreporter.section("benchmarks")
+    for name, per_call in sorted(_results.items()):
+        line = f"{name:<40} {per_call * 1e6:>10.2f}us"
+        if name in baseline:
+            line += f" {per_call / baseline[name]:>6.2f}x baseline"
+        terminalreporter.write_line(line)
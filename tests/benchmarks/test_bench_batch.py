@@ -0,0 +1,21 @@
+"""Benchmarks for the batch APIs."""
+
+import pytest
+
+import cridlib
+
+pytestmark = pytest.mark.benchmark
+
+CRIDS = [
+    f"crid://rabe.ch/v1/show-{index % 10}#t=clock=19930301T{index % 24:02d}1200.00Z"
+    for index in range(1000)
+]
+
+
+def test_bench_parse_many(bench):
+    bench(lambda: list(cridlib.parse_many(CRIDS)), number=5)
+
+
+def test_bench_batch_from_crids(bench):
+    crids = list(cridlib.parse_many(CRIDS))
+    bench(lambda: cridlib.CRIDBatch.from_crids(crids), number=5)
@@ -0,0 +1,56 @@
+"""Benchmarks for show resolution against local upstream servers."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import cridlib
+from cridlib import strategy
+from cridlib.strategy import future, past
+
+pytestmark = pytest.mark.benchmark
+
+TIMESTAMP = datetime(1993, 3, 1, 13, 12, tzinfo=timezone.utc)
+
+
+def test_bench_get_past(bench, local_upstream):  # noqa: ARG001
+    def _get():
+        past.clear_cache()
+        cridlib.get(TIMESTAMP)
+
+    bench(_get, number=20)
+
+
+def test_bench_get_past_cached(bench, local_upstream):  # noqa: ARG001
+    cridlib.get(TIMESTAMP)
+    bench(lambda: cridlib.get(TIMESTAMP), number=2000)
+
+
+def test_bench_get_now(bench, local_upstream):  # noqa: ARG001
+    bench(cridlib.get, number=20)
+
+
+def test_bench_get_future(bench, local_upstream):  # noqa: ARG001
+    _now = datetime(1993, 3, 1, tzinfo=timezone.utc)
+
+    def _get():
+        future.clear_cache()
+        strategy.get_show(TIMESTAMP, _now)
+
+    bench(_get, number=20)
+
+
+def test_bench_get_future_cached(bench, local_upstream):  # noqa: ARG001
+    _now = datetime(1993, 3, 1, tzinfo=timezone.utc)
+    strategy.get_show(TIMESTAMP, _now)
+    bench(lambda: strategy.get_show(TIMESTAMP, _now), number=2000)
+
+
+def test_bench_get_many(bench, local_upstream):  # noqa: ARG001
+    timestamps = [TIMESTAMP + timedelta(seconds=second) for second in range(100)]
+
+    def _get_many():
+        past.clear_cache()
+        cridlib.get_many(timestamps)
+
+    bench(_get_many, number=10)
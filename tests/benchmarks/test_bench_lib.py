@@ -0,0 +1,71 @@
+"""Benchmarks for minting, parsing and rendering CRIDs."""
+
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+import cridlib
+from cridlib.clock import format_clock, parse_clock
+from cridlib.lib import CRID, canonicalize_show, clear_slug_cache
+
+pytestmark = pytest.mark.benchmark
+
+CRID_STR = "crid://rabe.ch/v1/klangbecken#t=clock=19930301T131200.00Z"
+TIMESTAMP = datetime(1993, 3, 1, 13, 12, tzinfo=timezone.utc)
+
+
+def test_bench_crid_init(bench):
+    bench(lambda: CRID(CRID_STR), number=2000)
+
+
+def test_bench_crid_init_generic(bench):
+    bench(lambda: CRID(f"{CRID_STR}&a=%20"), number=500)
+
+
+def test_bench_crid_start(bench):
+    bench(lambda: CRID(CRID_STR).start, number=2000)
+
+
+def test_bench_parse(bench):
+    bench(lambda: cridlib.parse(CRID_STR), number=2000)
+
+
+def test_bench_crid_str(bench):
+    crid = CRID(CRID_STR)
+    bench(lambda: str(crid), number=5000)
+
+
+def test_bench_canonicalize_show(bench):
+    bench(lambda: canonicalize_show("Der Morgen"), number=5000)
+
+
+def test_bench_canonicalize_show_uncached(bench):
+    def _canonicalize():
+        clear_slug_cache()
+        canonicalize_show("à suivre #42")
+
+    bench(_canonicalize, number=200)
+
+
+def test_bench_format_clock(bench):
+    bench(lambda: format_clock(TIMESTAMP), number=5000)
+
+
+def test_bench_parse_clock(bench):
+    bench(lambda: parse_clock("19930301T131200.00Z"), number=5000)
+
+
+def test_bench_get_known_show(bench):
+    bench(lambda: cridlib.get(TIMESTAMP, show="Klangbecken"), number=2000)
+
+
+def test_bench_import(bench):
+    bench(
+        lambda: subprocess.run(  # noqa: S603
+            [sys.executable, "-c", "import cridlib"],
+            check=True,
+        ),
+        number=3,
+    )
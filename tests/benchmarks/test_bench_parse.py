@@ -0,0 +1,19 @@
+"""Benchmarks for parsing CRIDs."""
+
+import timeit
+
+from cridlib.lib import CRID
+
+CRID_STR = "crid://rabe.ch/v1/klangbecken#t=clock=19930301T131200.00Z"
+
+
+def _parse_generic():
+    crid = CRID.__new__(CRID)
+    crid._parse_uri(CRID_STR)  # noqa: SLF001
+
+
+def test_fast_path_speedup():
+    """Parsing common CRIDs with the fast path is several times faster."""
+    fast = min(timeit.repeat(lambda: CRID(CRID_STR), number=500, repeat=3))
+    generic = min(timeit.repeat(_parse_generic, number=500, repeat=3))
+    assert fast * 3 < generic
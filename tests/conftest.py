@@ -6,6 +6,10 @@ import re
 
 import pytest
 
+from cridlib import instrument, lib, strategy, util
+from cridlib.cache import IntervalCache
+from cridlib.strategy import future, local, now, past
+
 
 @pytest.fixture(name="example_klangbecken_data")
 def fixture_example_klangbecken_data():
@@ -104,3 +108,64 @@ def fixture_libretime_mock(requests_mock):
             },
         },
     )
+
+
+@pytest.fixture(autouse=True)
+def _reset_state():
+    """Start every test with a fresh shared session and empty caches."""
+    # doctests don't use this fixture, don't let their slugs leak into tests
+    lib.clear_slug_cache()
+    yield
+    util.reset_session()
+    past.set_cache(IntervalCache())
+    future.clear_cache()
+    now.clear_cache()
+    local.set_index(None)
+    strategy.reset()
+    lib.clear_slug_cache()
+    instrument.set_hook(None)
+    future.set_refresh_interval(300)
+
+
+@pytest.fixture(name="archiv_day_mock")
+def fixture_archiv_day_mock(requests_mock):
+    """Mock broadcast listing of a day from Archiv, split over two pages."""
+    requests_mock.get(
+        "https://archiv.rabe.ch/api/broadcasts/1993/03/01",
+        json={
+            "data": [
+                {
+                    "attributes": {
+                        "label": "Klangbecken",
+                        "started_at": "1993-03-01T00:00:00+01:00",
+                        "finished_at": "1993-03-01T08:00:00+01:00",
+                    },
+                },
+                {
+                    "attributes": {
+                        "label": "Der Morgen",
+                        "started_at": "1993-03-01T08:00:00+01:00",
+                        "finished_at": "1993-03-01T11:00:00+01:00",
+                    },
+                },
+            ],
+            "links": {
+                "next": "https://archiv.rabe.ch/api/broadcasts/1993/03/01?page[number]=2",
+            },
+        },
+    )
+    return requests_mock.get(
+        "https://archiv.rabe.ch/api/broadcasts/1993/03/01?page[number]=2",
+        json={
+            "data": [
+                {"attributes": {"label": "no times"}},
+                {
+                    "attributes": {
+                        "label": "Info",
+                        "started_at": "1993-03-01T14:00:00+01:00",
+                        "finished_at": "1993-03-01T14:30:00+01:00",
+                    },
+                },
+            ],
+        },
+    )
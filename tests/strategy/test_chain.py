@@ -0,0 +1,316 @@
+"""Tests for the resolver registry and chain."""
+
+import asyncio
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import pytest
+import requests
+from freezegun import freeze_time
+
+import cridlib
+from cridlib import strategy
+from cridlib.breaker import CircuitBreaker, CircuitOpenError
+from cridlib.index import build_index
+from cridlib.strategy import local
+
+NOW = datetime(1993, 3, 1, 13, tzinfo=timezone.utc)
+PAST = datetime(1993, 3, 1, 12, tzinfo=timezone.utc)
+
+
+class Stub:
+    """Resolver that answers every lookup with the same show."""
+
+    def __init__(self, show, error=None, event=None):
+        self.show = show
+        self.error = error
+        self.event = event
+        self.calls = 0
+
+    def accepts(self, timestamp, now_):
+        return timestamp < now_
+
+    def get_show(self, timestamp, now_):  # noqa: ARG002
+        self.calls += 1
+        if self.event is not None:
+            self.event.wait()
+        if self.error is not None:
+            raise self.error
+        return self.show
+
+
+def test_default_chain():
+    """Test the built-in resolvers and their order."""
+    assert strategy.get_chain() == ["now", "local", "past", "future"]
+    assert strategy.name(NOW, NOW) == "now"
+    assert strategy.name(PAST, NOW) == "past"
+    assert strategy.name(NOW, PAST) == "future"
+
+
+def test_custom_resolver():
+    """Test routing lookups to a registered resolver first."""
+    strategy.register("stub", Stub("stub"))
+    assert strategy.get_chain() == ["now", "local", "past", "future"]
+    strategy.set_chain(["stub", "past"])
+    assert strategy.name(PAST, NOW) == "stub"
+    assert strategy.get_show(PAST, NOW) == "stub"
+
+    # replacing a registered resolver also replaces it in the chain
+    strategy.register("stub", Stub("replaced"))
+    assert strategy.get_show(PAST, NOW) == "replaced"
+
+    # nobody accepts the current show
+    assert strategy.name(NOW, NOW) == ""
+    assert strategy.get_show(NOW, NOW) == ""
+
+    with pytest.raises(ValueError, match="unknown resolvers: missing"):
+        strategy.set_chain(["stub", "missing"])
+
+
+def test_fallback(caplog):
+    """Test that failed resolvers fall back to the next one."""
+    failing = Stub("", error=ConnectionError("down"))
+    fallback = Stub("fallback")
+    strategy.register("failing", failing)
+    strategy.register("fallback", fallback)
+    strategy.set_chain(["failing", "fallback"])
+    with caplog.at_level(logging.WARNING):
+        assert strategy.get_show(PAST, NOW) == "fallback"
+    assert failing.calls == 1
+    assert fallback.calls == 1
+    assert caplog.records[0].message == f"Resolver failing failed for {PAST}"
+
+    strategy.set_chain(["failing"])
+    with pytest.raises(ConnectionError, match="down"):
+        strategy.get_show(PAST, NOW)
+
+
+def test_timeout():
+    """Test that slow resolvers fall back after their timeout."""
+    event = threading.Event()
+    strategy.register("slow", Stub("slow", event=event), timeout=0.01)
+    strategy.register("fast", Stub("fast"), timeout=1)
+    strategy.set_chain(["slow", "fast"])
+    assert strategy.get_show(PAST, NOW) == "fast"
+
+    strategy.set_chain(["slow"])
+    with pytest.raises(TimeoutError):
+        strategy.get_show(PAST, NOW)
+    event.set()
+
+
+def test_after_fork_in_child():
+    """Test that forked children get a new lock and no lookups in flight."""
+    strategy.register("fast", Stub("fast"), timeout=1)
+    strategy.set_chain(["fast"])
+    assert strategy.get_show(PAST, NOW) == "fast"
+    lock = strategy._lock  # noqa: SLF001
+    strategy._in_flight["fast"] = 8  # noqa: SLF001
+    strategy._after_fork_in_child()  # noqa: SLF001
+    assert strategy._lock is not lock  # noqa: SLF001
+    assert strategy._in_flight == {}  # noqa: SLF001
+    assert strategy.get_show(PAST, NOW) == "fast"
+
+
+class Sleepy(Stub):
+    """Healthy resolver that takes a while for every lookup."""
+
+    def get_show(self, timestamp, now_):
+        time.sleep(0.2)
+        return super().get_show(timestamp, now_)
+
+
+def test_budget_concurrent():
+    """Test that concurrent lookups don't use up the budget waiting for workers."""
+    breaker = CircuitBreaker(threshold=1)
+    strategy.register("sleepy", Sleepy("sleepy"), breaker=breaker, max_in_flight=50)
+    strategy.set_chain(["sleepy"])
+    strategy.set_budget(1)
+    with ThreadPoolExecutor(50) as executor:
+        shows = list(executor.map(lambda _: strategy.get_show(PAST, NOW), range(50)))
+    assert shows == ["sleepy"] * 50
+    assert breaker.state == "closed"
+
+
+def test_timeout_breaker():
+    """Test that timed out lookups count as failed."""
+    event = threading.Event()
+    breaker = CircuitBreaker(threshold=1)
+    strategy.register("slow", Stub("slow", event=event), timeout=0.01, breaker=breaker)
+    strategy.set_chain(["slow"])
+    with pytest.raises(TimeoutError):
+        strategy.get_show(PAST, NOW)
+    assert breaker.state == "open"
+    event.set()
+
+
+def test_max_in_flight():
+    """Test that hanging resolvers fail fast instead of piling up threads."""
+    event = threading.Event()
+    slow = Stub("slow", event=event)
+    strategy.register("slow", slow, timeout=0.01, max_in_flight=2)
+    strategy.set_chain(["slow"])
+    for _ in range(2):
+        with pytest.raises(TimeoutError):
+            strategy.get_show(PAST, NOW)
+    with pytest.raises(strategy.ResolverBusyError, match="2 lookups of slow"):
+        strategy.get_show(PAST, NOW)
+    assert slow.calls == 2  # noqa: PLR2004
+
+    event.set()
+    deadline = time.monotonic() + 5
+    while strategy._in_flight["slow"] and time.monotonic() < deadline:  # noqa: SLF001
+        time.sleep(0.01)
+    assert strategy.get_show(PAST, NOW) == "slow"
+    slow.error = ConnectionError("down")
+    with pytest.raises(ConnectionError, match="down"):
+        strategy.get_show(PAST, NOW)
+
+
+def test_budget_deadline(archiv_mock):
+    """Test that built-in resolvers use the budget as timeout of their requests."""
+    strategy.set_budget(0.5)
+    with freeze_time("1993-03-02 00:00:00 UTC"):
+        assert strategy.get_show(PAST, datetime.now(timezone.utc)) == "test"
+    assert 0 < archiv_mock.last_request.timeout <= 0.5  # noqa: PLR2004
+    assert "cridlib-resolver-past" not in [t.name for t in threading.enumerate()]
+
+
+def test_circuit_breaker():
+    """Test that resolvers get skipped while their breaker is open."""
+    failing = Stub("", error=ConnectionError("down"))
+    strategy.register(
+        "failing",
+        failing,
+        breaker=CircuitBreaker(threshold=2, reset_timeout=30),
+    )
+    strategy.register("fallback", Stub("fallback"))
+    strategy.set_chain(["failing", "fallback"])
+    with freeze_time("1993-03-01 13:00:00") as frozen:
+        for _ in range(3):
+            assert strategy.get_show(PAST, NOW) == "fallback"
+        assert failing.calls == 2  # noqa: PLR2004
+
+        strategy.set_chain(["failing"])
+        with pytest.raises(CircuitOpenError, match="circuit breaker of failing"):
+            strategy.get_show(PAST, NOW)
+
+        frozen.tick(30)
+        failing.error = None
+        assert strategy.get_show(PAST, NOW) == ""
+    assert failing.calls == 3  # noqa: PLR2004
+
+
+def test_budget():
+    """Test that the budget bounds lookups over the whole chain."""
+    event = threading.Event()
+    slow = Stub("slow", event=event)
+    strategy.register("slow", slow)
+    strategy.register("fast", Stub("fast"))
+    strategy.set_chain(["slow", "fast"])
+    strategy.set_budget(0.01)
+    with pytest.raises(TimeoutError, match="latency budget used up before asking fast"):
+        strategy.get_show(PAST, NOW)
+
+    strategy.register("slow", slow, timeout=1)
+    with pytest.raises(TimeoutError, match="latency budget used up before asking fast"):
+        strategy.get_show(PAST, NOW)
+    event.set()
+
+    strategy.set_chain(["fast"])
+    assert strategy.get_show(PAST, NOW) == "fast"
+
+
+def test_degrade(caplog, requests_mock):
+    """Test that failed lookups return no show in degraded mode."""
+    requests_mock.get(
+        re.compile("https://archiv.rabe.ch/api/broadcasts/.*"),
+        exc=requests.exceptions.ConnectionError,
+    )
+    strategy.set_degrade(True)
+    with freeze_time("1993-03-02 00:00:00 UTC"):
+        crid = cridlib.get(PAST)
+    assert crid.show is None
+    assert str(crid) == "crid://rabe.ch/v1#t=clock=19930301T120000.00Z"
+    assert caplog.records[-1].message == f"Returning no show for {PAST}"
+
+    strategy.set_degrade(False)
+    with (
+        freeze_time("1993-03-02 00:00:00 UTC"),
+        pytest.raises(requests.exceptions.ConnectionError),
+    ):
+        cridlib.get(PAST)
+
+
+def test_aget_show(caplog):
+    """Test the chain without blocking the event loop."""
+    event = threading.Event()
+    failing = Stub("", error=ConnectionError("down"))
+    strategy.register(
+        "failing",
+        failing,
+        breaker=CircuitBreaker(threshold=1, reset_timeout=30),
+    )
+    strategy.register("slow", Stub("slow", event=event), timeout=0.01)
+    strategy.register("fallback", Stub("fallback"))
+
+    async def lookups():
+        strategy.set_chain(["failing", "slow", "fallback"])
+        assert await strategy.aget_show(PAST, NOW) == "fallback"
+        assert await strategy.aget_show(PAST, NOW) == "fallback"
+
+        strategy.set_chain(["slow"])
+        with pytest.raises(TimeoutError):
+            await strategy.aget_show(PAST, NOW)
+        event.set()
+
+        strategy.set_chain(["failing"])
+        with pytest.raises(CircuitOpenError):
+            await strategy.aget_show(PAST, NOW)
+        strategy.set_degrade(True)
+        assert await strategy.aget_show(PAST, NOW) == ""
+
+        strategy.set_chain(["fallback"])
+        assert await strategy.aget_show(NOW, NOW) == ""
+
+    with caplog.at_level(logging.WARNING):
+        asyncio.run(lookups())
+    assert failing.calls == 1
+    assert caplog.records[-1].message == f"Returning no show for {PAST}"
+
+
+def test_aget_show_builtin(archiv_mock, tmp_path):  # noqa: ARG001
+    """Test the built-in resolvers without blocking the event loop."""
+    index = tmp_path / "broadcasts.idx"
+    build_index(index, [(PAST, NOW, "Local Show")])
+    local.set_index(index)
+    assert asyncio.run(strategy.aget_show(PAST, NOW)) == "Local Show"
+
+    local.set_index(None)
+    with freeze_time("1993-03-02 00:00:00 UTC", real_asyncio=True):
+        assert asyncio.run(strategy.aget_show(PAST, NOW)) == "test"
+
+
+class Hanging(Stub):
+    """Resolver with a coroutine that never answers."""
+
+    async def aget_show(self, timestamp, now_):  # noqa: ARG002
+        await asyncio.sleep(60)
+
+
+def test_aget_show_timeout_breaker():
+    """Test that timed out coroutines count as failed."""
+    breaker = CircuitBreaker(threshold=1)
+    strategy.register("hanging", Hanging(""), timeout=0.01, breaker=breaker)
+    strategy.set_chain(["hanging"])
+
+    async def lookup():
+        with pytest.raises(TimeoutError):
+            await strategy.aget_show(PAST, NOW)
+
+    asyncio.run(lookup())
+    assert breaker.state == "open"
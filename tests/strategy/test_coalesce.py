@@ -0,0 +1,165 @@
+"""Tests for sharing in-flight requests."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from cridlib import instrument, util
+from cridlib.strategy import coalesce
+
+
+def _share(func, count=3):
+    """Call `func` from `count` threads at once, returning all results."""
+    events = []
+    joined = threading.Semaphore(0)
+
+    def hook(event):
+        events.append(event)
+        joined.release()
+
+    instrument.set_hook(hook)
+    with ThreadPoolExecutor(count) as executor:
+        leader = executor.submit(coalesce.call, "test", "a", func)
+        func.started.wait()
+        followers = [
+            executor.submit(coalesce.call, "test", "a", func) for _ in range(count - 1)
+        ]
+        for _ in followers:
+            joined.acquire()
+        func.release.set()
+        results = [leader, *followers]
+        for result in results:
+            result.exception()
+    assert events == [instrument.Event("coalesce", "test", None, "shared")] * (
+        count - 1
+    )
+    assert coalesce._calls == {}  # noqa: SLF001
+    return results
+
+
+class Blocking:
+    """Function that blocks until released and counts its calls."""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.started.set()
+        self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return "done"
+
+
+def test_call():
+    """Test that concurrent threads with the same key share one call."""
+    func = Blocking()
+    results = _share(func)
+    assert [result.result() for result in results] == ["done"] * 3
+    assert func.calls == 1
+
+    # calls after the shared one is done call again
+    assert coalesce.call("test", "a", func) == "done"
+    assert func.calls == 2  # noqa: PLR2004
+
+
+def test_call_error():
+    """Test that every waiting thread gets the error."""
+    func = Blocking(error=ConnectionError("down"))
+    results = _share(func)
+    assert [str(result.exception()) for result in results] == ["down"] * 3
+    assert func.calls == 1
+
+
+def test_call_deadline():
+    """Test that waiting threads stop waiting at their deadline."""
+    func = Blocking()
+    with ThreadPoolExecutor(1) as executor:
+        leader = executor.submit(coalesce.call, "test", "a", func)
+        func.started.wait()
+        with util.deadline(0.01), pytest.raises(TimeoutError):
+            coalesce.call("test", "a", func)
+        func.release.set()
+        assert leader.result() == "done"
+    assert func.calls == 1
+
+
+def test_after_fork_in_child():
+    """Test that forked children forget the calls of the parent."""
+    coalesce._calls["test", "a"] = object()  # noqa: SLF001
+    coalesce._after_fork_in_child()  # noqa: SLF001
+    assert coalesce._calls == {}  # noqa: SLF001
+
+
+def test_acall():
+    """Test that concurrent calls with the same key share one call."""
+    calls = []
+    events = []
+    instrument.set_hook(events.append)
+
+    def fetch(value):
+        calls.append(value)
+        return value
+
+    async def lookups():
+        return await asyncio.gather(
+            coalesce.acall("test", "a", fetch, "a"),
+            coalesce.acall("test", "a", fetch, "a"),
+            coalesce.acall("test", "b", fetch, "b"),
+            coalesce.acall("other", "a", fetch, "c"),
+        )
+
+    assert asyncio.run(lookups()) == ["a", "a", "b", "c"]
+    assert sorted(calls) == ["a", "b", "c"]
+    assert events == [instrument.Event("coalesce", "test", None, "shared")]
+    assert coalesce._tasks == {}  # noqa: SLF001
+
+    # calls after the shared one is done call again
+    assert asyncio.run(lookups()) == ["a", "a", "b", "c"]
+    assert len(calls) == 6  # noqa: PLR2004
+
+
+def test_acall_error():
+    """Test that every waiting coroutine gets the error."""
+
+    def fail():
+        msg = "down"
+        raise ConnectionError(msg)
+
+    async def lookups():
+        return await asyncio.gather(
+            coalesce.acall("test", "a", fail),
+            coalesce.acall("test", "a", fail),
+            return_exceptions=True,
+        )
+
+    errors = asyncio.run(lookups())
+    assert [str(error) for error in errors] == ["down", "down"]
+    assert errors[0] is errors[1]
+
+
+def test_acall_cancel():
+    """Test that cancelling a waiting coroutine doesn't cancel the call."""
+    event = threading.Event()
+
+    def fetch():
+        event.wait()
+        return "done"
+
+    async def lookups():
+        first = asyncio.ensure_future(coalesce.acall("test", "a", fetch))
+        second = asyncio.ensure_future(coalesce.acall("test", "a", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        event.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(lookups()) == "done"
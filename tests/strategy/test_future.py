@@ -0,0 +1,138 @@
+"""Tests for LibreTime strategy."""
+
+import asyncio
+from datetime import datetime, timezone
+
+from freezegun import freeze_time
+
+import cridlib.lib
+import cridlib.strategy.future
+
+LIBRETIME_URL = "https://airtime.service.int.rabe.ch/api/live-info-v2/format/json"
+
+
+def test_get_show(libretime_mock):
+    """Test that the schedule only gets downloaded once."""
+    for hour, expected in [(0, "klangbecken"), (8, "der-morgen"), (11, "info")]:
+        show = cridlib.strategy.future.get_show(
+            datetime(1993, 3, 1, hour, 15, tzinfo=timezone.utc),
+        )
+        assert show == expected
+    assert (
+        cridlib.strategy.future.get_show(
+            datetime(1993, 3, 1, 11, 30, tzinfo=timezone.utc),
+        )
+        == ""
+    )
+    assert libretime_mock.call_count == 1
+    assert cridlib.lib.slug_cache_info().currsize == 3  # noqa: PLR2004
+
+
+def test_aget_show(libretime_mock):
+    """Test that concurrent lookups share the schedule download."""
+
+    async def lookups():
+        return await asyncio.gather(
+            *(
+                cridlib.strategy.future.aget_show(
+                    datetime(1993, 3, 1, hour, 15, tzinfo=timezone.utc),
+                )
+                for hour in (0, 8, 11)
+            ),
+        )
+
+    assert asyncio.run(lookups()) == ["klangbecken", "der-morgen", "info"]
+    assert asyncio.run(lookups()) == ["klangbecken", "der-morgen", "info"]
+    assert libretime_mock.call_count == 1
+
+
+def test_get_show_refresh_not_modified(requests_mock):
+    """Test conditional refresh of an unchanged schedule."""
+    requests_mock.get(
+        LIBRETIME_URL,
+        [
+            {
+                "json": {
+                    "shows": {
+                        "next": [
+                            {
+                                "url": "https://rabe.ch/info",
+                                "starts": "1993-03-01 11:00:00",
+                                "ends": "1993-03-01 11:30:00",
+                            },
+                        ],
+                    },
+                },
+                "headers": {
+                    "ETag": '"v1"',
+                    "Last-Modified": "Mon, 01 Mar 1993 00:00:00 GMT",
+                },
+            },
+            {"status_code": 304},
+        ],
+    )
+    _ts = datetime(1993, 3, 1, 11, 15, tzinfo=timezone.utc)
+    cridlib.strategy.future.set_refresh_interval(60)
+    with freeze_time("1993-03-01 00:00:00 UTC") as frozen:
+        assert cridlib.strategy.future.get_show(_ts) == "info"
+        frozen.tick(61)
+        assert cridlib.strategy.future.get_show(_ts) == "info"
+    assert requests_mock.call_count == 2  # noqa: PLR2004
+    assert "If-None-Match" not in requests_mock.request_history[0].headers
+    assert requests_mock.request_history[1].headers["If-None-Match"] == '"v1"'
+    assert (
+        requests_mock.request_history[1].headers["If-Modified-Since"]
+        == "Mon, 01 Mar 1993 00:00:00 GMT"
+    )
+
+
+def test_get_show_refresh_changed(requests_mock):
+    """Test refreshing a changed schedule."""
+    requests_mock.get(
+        LIBRETIME_URL,
+        [
+            {
+                "json": {
+                    "shows": {
+                        "next": [
+                            {
+                                "url": "https://rabe.ch/info",
+                                "starts": "1993-03-01 11:00:00",
+                                "ends": "1993-03-01 11:30:00",
+                            },
+                        ],
+                    },
+                },
+            },
+            {
+                "json": {
+                    "shows": {
+                        "next": [
+                            {
+                                "url": "https://rabe.ch/special",
+                                "starts": "1993-03-01 11:00:00",
+                                "ends": "1993-03-01 12:00:00",
+                            },
+                        ],
+                    },
+                },
+            },
+        ],
+    )
+    _ts = datetime(1993, 3, 1, 11, 15, tzinfo=timezone.utc)
+    with freeze_time("1993-03-01 00:00:00 UTC") as frozen:
+        assert cridlib.strategy.future.get_show(_ts) == "info"
+        frozen.tick(301)
+        assert cridlib.strategy.future.get_show(_ts) == "special"
+    assert "If-None-Match" not in requests_mock.request_history[1].headers
+    cridlib.strategy.future.clear_cache()
+    with freeze_time("1993-03-01 00:00:00 UTC"):
+        assert cridlib.strategy.future.get_show(_ts) == "special"
+    assert requests_mock.call_count == 3  # noqa: PLR2004
+
+
+def test_refresh_after_concurrent_refresh(libretime_mock):
+    """Test that a refresh is skipped if another thread just did it."""
+    schedule = cridlib.strategy.future._get_schedule()  # noqa: SLF001
+    assert cridlib.strategy.future._refresh() is schedule  # noqa: SLF001
+    assert libretime_mock.call_count == 1
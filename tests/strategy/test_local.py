@@ -0,0 +1,46 @@
+"""Tests for local index strategy."""
+
+from datetime import datetime, timezone
+
+from freezegun import freeze_time
+
+import cridlib
+from cridlib.index import BroadcastIndex, build_index
+from cridlib.strategy import local
+
+
+def test_get_show(tmp_path, requests_mock):
+    """Test that lookups covered by the index don't use the network."""
+    path = tmp_path / "broadcasts.idx"
+    build_index(
+        path,
+        [
+            (
+                datetime(1993, 3, 1, 13, tzinfo=timezone.utc),
+                datetime(1993, 3, 1, 14, tzinfo=timezone.utc),
+                "Test",
+            ),
+            (
+                datetime(1993, 3, 1, 15, tzinfo=timezone.utc),
+                datetime(1993, 3, 1, 16, tzinfo=timezone.utc),
+                "Other",
+            ),
+        ],
+    )
+    assert local.get_show(datetime(1993, 3, 1, 13, tzinfo=timezone.utc)) == ""
+
+    local.set_index(path)
+    with freeze_time("1993-03-10 00:00:00 UTC"):
+        assert str(cridlib.get(datetime(1993, 3, 1, 13, 12, tzinfo=timezone.utc))) == (
+            "crid://rabe.ch/v1/test#t=clock=19930301T131200.00Z"
+        )
+        crid = cridlib.get(datetime(1993, 3, 1, 14, 30, tzinfo=timezone.utc))
+        assert crid.show is None
+    assert requests_mock.call_count == 0
+
+    with BroadcastIndex(path) as index:
+        local.set_index(index)
+        assert local.covers(datetime(1993, 3, 1, 15, tzinfo=timezone.utc))
+        assert not local.covers(datetime(1993, 3, 1, 16, tzinfo=timezone.utc))
+        local.set_index(None)
+        assert not local.covers(datetime(1993, 3, 1, 15, tzinfo=timezone.utc))
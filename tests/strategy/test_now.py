@@ -1,5 +1,10 @@
 """Tests for nowplaying strategy."""
 
+import asyncio
+import re
+
+from freezegun import freeze_time
+
 import cridlib
 import cridlib.strategy.now
 
@@ -9,3 +14,52 @@ def test_get_show(klangbecken_mock):  # noqa: ARG001
 
     show = cridlib.strategy.now.get_show()
     assert show == "test"
+
+
+def test_get_show_cached(klangbecken_mock):
+    """Test that the show is cached until shortly before it ends."""
+    with freeze_time("1992-03-01 13:12:00 UTC") as frozen:
+        assert cridlib.strategy.now.get_show() == "test"
+        frozen.tick(49)
+        assert cridlib.strategy.now.get_show() == "test"
+        assert klangbecken_mock.call_count == 1
+        frozen.tick(1)
+        assert cridlib.strategy.now.get_show() == "test"
+        assert klangbecken_mock.call_count == 2  # noqa: PLR2004
+
+
+def test_aget_show(klangbecken_mock):
+    """Test that concurrent lookups share the request to the songticker."""
+
+    async def lookups():
+        return await asyncio.gather(
+            *(cridlib.strategy.now.aget_show() for _ in range(3)),
+        )
+
+    with freeze_time("1992-03-01 13:12:00 UTC", real_asyncio=True):
+        assert asyncio.run(lookups()) == ["test"] * 3
+        assert asyncio.run(cridlib.strategy.now.aget_show()) == "test"
+    assert klangbecken_mock.call_count == 1
+
+
+def test_get_show_refresh(klangbecken_mock):
+    """Test forcing a refresh."""
+    with freeze_time("1992-03-01 13:12:00 UTC"):
+        cridlib.strategy.now.get_show()
+        cridlib.strategy.now.get_show(refresh=True)
+        assert klangbecken_mock.call_count == 2  # noqa: PLR2004
+        cridlib.strategy.now.clear_cache()
+        cridlib.strategy.now.get_show()
+        assert klangbecken_mock.call_count == 3  # noqa: PLR2004
+
+
+def test_get_show_without_end(requests_mock, example_klangbecken_data):
+    """Test that shows without an end time don't get cached."""
+    ticker_mock = requests_mock.get(
+        "https://songticker.rabe.ch/songticker/0.9.3/current.xml",
+        text=re.sub(r"<endTime>.*</endTime>", "", example_klangbecken_data),
+    )
+    with freeze_time("1992-03-01 13:12:00 UTC"):
+        cridlib.strategy.now.get_show()
+        cridlib.strategy.now.get_show()
+    assert ticker_mock.call_count == 2  # noqa: PLR2004
@@ -1,11 +1,18 @@
 """Tests for nowplaying strategy."""
 
-from datetime import datetime
+import asyncio
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 
 from freezegun import freeze_time
 
 import cridlib
 import cridlib.strategy.past
+from cridlib import instrument
+from cridlib.cache import IntervalCache
 
 
 def test_get_show(archiv_mock):  # noqa: ARG001
@@ -22,3 +29,297 @@ def test_get_show_empty(empty_archiv_mock):  # noqa: ARG001
     with freeze_time("1993-03-01 13:12:00 UTC"):
         show = cridlib.strategy.past.get_show(datetime.now())  # noqa: DTZ005
     assert show == ""
+
+
+def test_get_show_cached(requests_mock):
+    """Test that timestamps during a known broadcast don't hit the archive."""
+    archiv_mock = requests_mock.get(
+        re.compile("https://archiv.rabe.ch/api/broadcasts/1993/03/01/.*"),
+        json={
+            "data": [
+                {
+                    "attributes": {
+                        "label": "Test Show",
+                        "started_at": "1993-03-01T14:00:00.000+01:00",
+                        "finished_at": "1993-03-01T15:00:00.000+01:00",
+                    },
+                },
+            ],
+        },
+    )
+    with freeze_time("1993-03-02 00:00:00 UTC"):
+        for minute in (12, 0, 59, 30):
+            show = cridlib.strategy.past.get_show(
+                datetime(1993, 3, 1, 13, minute, tzinfo=timezone.utc),
+            )
+            assert show == "test-show"
+        assert archiv_mock.call_count == 1
+
+        cridlib.strategy.past.get_show(
+            datetime(1993, 3, 1, 14, 0, tzinfo=timezone.utc),
+        )
+        assert archiv_mock.call_count == 2  # noqa: PLR2004
+
+
+def test_aget_show(requests_mock):
+    """Test that concurrent lookups share the request to the archive."""
+    archiv_mock = requests_mock.get(
+        re.compile("https://archiv.rabe.ch/api/broadcasts/1993/03/01/.*"),
+        json={
+            "data": [
+                {
+                    "attributes": {
+                        "label": "Test Show",
+                        "started_at": "1993-03-01T14:00:00.000+01:00",
+                        "finished_at": "1993-03-01T15:00:00.000+01:00",
+                    },
+                },
+            ],
+        },
+    )
+    past = datetime(1993, 3, 1, 13, 12, tzinfo=timezone.utc)
+
+    async def lookups():
+        return await asyncio.gather(
+            *(cridlib.strategy.past.aget_show(past) for _ in range(3)),
+        )
+
+    with freeze_time("1993-03-02 00:00:00 UTC", real_asyncio=True):
+        assert asyncio.run(lookups()) == ["test-show"] * 3
+        assert archiv_mock.call_count == 1
+        assert (
+            asyncio.run(
+                cridlib.strategy.past.aget_show(past.replace(minute=30)),
+            )
+            == "test-show"
+        )
+    assert archiv_mock.call_count == 1
+
+
+def test_aget_show_same_broadcast(requests_mock):
+    """Test that coroutines asking about one broadcast share a request."""
+    archiv_mock = requests_mock.get(
+        re.compile("https://archiv.rabe.ch/api/broadcasts/1993/03/01/.*"),
+        json={
+            "data": [
+                {
+                    "attributes": {
+                        "label": "Test",
+                        "started_at": "1993-03-01T14:00:00.000+01:00",
+                        "finished_at": "1993-03-01T15:00:00.000+01:00",
+                    },
+                },
+            ],
+        },
+    )
+
+    shared = []
+
+    def hook(event):
+        if event.kind == "coalesce":
+            shared.append(threading.current_thread())
+
+    instrument.set_hook(hook)
+
+    async def lookups():
+        return await asyncio.gather(
+            *(
+                cridlib.strategy.past.aget_show(
+                    datetime(1993, 3, 1, 13, minute, tzinfo=timezone.utc),
+                )
+                for minute in range(8)
+            ),
+        )
+
+    with freeze_time("1993-03-02 00:00:00 UTC", real_asyncio=True):
+        assert asyncio.run(lookups()) == ["test"] * 8
+    assert archiv_mock.call_count == 1
+    # the coroutines wait for one request instead of threads each
+    assert shared == [threading.current_thread()] * 7
+
+
+def test_aget_show_other_broadcast(archiv_mock):
+    """Test that coroutines not covered by the shared request ask again."""
+
+    async def lookups():
+        return await asyncio.gather(
+            *(
+                cridlib.strategy.past.aget_show(
+                    datetime(1993, 3, 1, 13, minute, tzinfo=timezone.utc),
+                )
+                for minute in range(3)
+            ),
+        )
+
+    with freeze_time("1993-03-02 00:00:00 UTC", real_asyncio=True):
+        assert asyncio.run(lookups()) == ["test"] * 3
+    assert archiv_mock.call_count == 3  # noqa: PLR2004
+
+
+def test_get_show_threads(requests_mock):
+    """Test that concurrent lookups of the same broadcast ask the archive once."""
+    archiv_mock = requests_mock.get(
+        re.compile("https://archiv.rabe.ch/api/broadcasts/1993/03/01/.*"),
+        json={
+            "data": [
+                {
+                    "attributes": {
+                        "label": "Test",
+                        "started_at": "1993-03-01T14:00:00.000+01:00",
+                        "finished_at": "1993-03-01T15:00:00.000+01:00",
+                    },
+                },
+            ],
+        },
+    )
+    past = datetime(1993, 3, 1, 13, 12, tzinfo=timezone.utc)
+    with (
+        freeze_time("1993-03-02 00:00:00 UTC"),
+        ThreadPoolExecutor(8) as executor,
+    ):
+        shows = list(executor.map(cridlib.strategy.past.get_show, [past] * 8))
+    assert shows == ["test"] * 8
+    assert archiv_mock.call_count == 1
+
+
+def test_get_show_threads_same_broadcast(requests_mock):
+    """Test that lookups of different timestamps in one broadcast ask once."""
+    shared = threading.Semaphore(0)
+
+    def hook(event):
+        if event.kind == "coalesce":
+            shared.release()
+
+    def broadcast(_request, _context):
+        # answer once the other threads wait for this request
+        for _ in range(7):
+            shared.acquire(timeout=5)
+        return {
+            "data": [
+                {
+                    "attributes": {
+                        "label": "Test",
+                        "started_at": "1993-03-01T14:00:00.000+01:00",
+                        "finished_at": "1993-03-01T15:00:00.000+01:00",
+                    },
+                },
+            ],
+        }
+
+    archiv_mock = requests_mock.get(
+        re.compile("https://archiv.rabe.ch/api/broadcasts/1993/03/01/.*"),
+        json=broadcast,
+    )
+    instrument.set_hook(hook)
+    timestamps = [
+        datetime(1993, 3, 1, 13, minute, tzinfo=timezone.utc) for minute in range(8)
+    ]
+    with (
+        freeze_time("1993-03-02 00:00:00 UTC"),
+        ThreadPoolExecutor(8) as executor,
+    ):
+        shows = list(executor.map(cridlib.strategy.past.get_show, timestamps))
+    assert shows == ["test"] * 8
+    assert archiv_mock.call_count == 1
+
+
+def test_get_show_threads_other_broadcast(requests_mock):
+    """Test that lookups not covered by the shared request ask again."""
+    archiv_mock = requests_mock.get(
+        re.compile("https://archiv.rabe.ch/api/broadcasts/1993/03/01/.*"),
+        json={"data": [{"attributes": {"label": "test"}}]},
+    )
+    timestamps = [
+        datetime(1993, 3, 1, 13, minute, tzinfo=timezone.utc) for minute in range(8)
+    ]
+    with (
+        freeze_time("1993-03-02 00:00:00 UTC"),
+        ThreadPoolExecutor(8) as executor,
+    ):
+        shows = list(executor.map(cridlib.strategy.past.get_show, timestamps))
+    assert shows == ["test"] * 8
+    assert archiv_mock.call_count == 8  # noqa: PLR2004
+
+
+def test_get_show_recent_ttl(requests_mock):
+    """Test that recent broadcasts expire from the cache."""
+    archiv_mock = requests_mock.get(
+        re.compile("https://archiv.rabe.ch/api/broadcasts/1993/03/01/.*"),
+        json={
+            "data": [
+                {
+                    "attributes": {
+                        "label": "test",
+                        "started_at": "1993-03-01T14:00:00+01:00",
+                        "finished_at": "1993-03-01T15:00:00+01:00",
+                    },
+                },
+            ],
+        },
+    )
+    _ts = datetime(1993, 3, 1, 13, 12, tzinfo=timezone.utc)
+    with freeze_time("1993-03-01 14:00:00 UTC") as frozen:
+        cridlib.strategy.past.get_show(_ts)
+        cridlib.strategy.past.get_show(_ts)
+        assert archiv_mock.call_count == 1
+        frozen.tick(301)
+        cridlib.strategy.past.get_show(_ts)
+        assert archiv_mock.call_count == 2  # noqa: PLR2004
+
+
+def test_set_cache(archiv_mock):  # noqa: ARG001
+    """Test replacing the cache."""
+    cache = IntervalCache(maxsize=1)
+    cridlib.strategy.past.set_cache(cache)
+    cache.put(
+        datetime(1993, 3, 1, 13, tzinfo=timezone.utc),
+        datetime(1993, 3, 1, 14, tzinfo=timezone.utc),
+        "cached",
+    )
+    show = cridlib.strategy.past.get_show(
+        datetime(1993, 3, 1, 13, 12, tzinfo=timezone.utc),
+    )
+    assert show == "cached"
+    cridlib.strategy.past.clear_cache()
+    assert len(cache) == 0
+
+
+def test_prefetch(archiv_day_mock, requests_mock):  # noqa: ARG001
+    """Test prefetching a day of broadcasts."""
+    _start = datetime(1993, 3, 1, 6, tzinfo=timezone.utc)
+    with freeze_time("1993-03-10 00:00:00 UTC"):
+        assert cridlib.strategy.past.prefetch(_start, _start) == 3  # noqa: PLR2004
+        request_count = requests_mock.call_count
+        assert cridlib.lib.slug_cache_info().currsize == 3  # noqa: PLR2004
+
+        for timestamp, expected in [
+            (datetime(1993, 2, 28, 23, 0, tzinfo=timezone.utc), "klangbecken"),
+            (datetime(1993, 3, 1, 7, 30, tzinfo=timezone.utc), "der-morgen"),
+            (datetime(1993, 3, 1, 10, 0, tzinfo=timezone.utc), ""),
+            (datetime(1993, 3, 1, 13, 15, tzinfo=timezone.utc), "info"),
+            (datetime(1993, 3, 1, 13, 30, tzinfo=timezone.utc), ""),
+            (datetime(1993, 3, 1, 22, 59, tzinfo=timezone.utc), ""),
+        ]:
+            assert cridlib.strategy.past.get_show(timestamp) == expected
+    assert requests_mock.call_count == request_count
+
+
+def test_prefetch_grows_cache(archiv_day_mock, requests_mock, caplog):  # noqa: ARG001
+    """Test that prefetching more intervals than fit grows the cache."""
+    cache = IntervalCache(maxsize=2)
+    cridlib.strategy.past.set_cache(cache)
+    _start = datetime(1993, 3, 1, 6, tzinfo=timezone.utc)
+    with freeze_time("1993-03-10 00:00:00 UTC"), caplog.at_level(logging.WARNING):
+        assert cridlib.strategy.past.prefetch(_start, _start) == 3  # noqa: PLR2004
+        request_count = requests_mock.call_count
+        assert (
+            cridlib.strategy.past.get_show(
+                datetime(1993, 2, 28, 23, 0, tzinfo=timezone.utc),
+            )
+            == "klangbecken"
+        )
+    assert requests_mock.call_count == request_count
+    assert cache.maxsize == len(cache) == 5  # noqa: PLR2004
+    assert caplog.records[-1].message == (
+        "Growing past show cache from 2 to 5 intervals for prefetch"
+    )
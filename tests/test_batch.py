@@ -0,0 +1,50 @@
+"""Tests for columnar CRID batches."""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd  # type: ignore[import-untyped]
+
+import cridlib
+from cridlib.batch import NO_SHOW, NO_START, CRIDBatch
+
+CRIDS = [
+    "crid://rabe.ch/v1/klangbecken#t=clock=19930301T000000.00Z",
+    "crid://rabe.ch/v1#t=clock=19930301T080000.00Z",
+    "crid://rabe.ch/v1/info#t=clock=19930301T110000.12Z",
+    "crid://rabe.ch/v1/klangbecken",
+]
+
+
+def test_batch():
+    batch = CRIDBatch.from_crids(cridlib.parse_many(CRIDS))
+    assert len(batch) == len(CRIDS)
+    assert batch.shows == ["klangbecken", "info"]
+    assert list(batch.show_codes) == [0, NO_SHOW, 1, 0]
+    assert list(batch.starts) == [
+        730_944_000_000,
+        730_972_800_000,
+        730_983_600_120,
+        NO_START,
+    ]
+    assert batch.count_by_show() == {"klangbecken": 2, "info": 1}
+
+
+def test_batch_to_numpy():
+    batch = CRIDBatch.from_crids(cridlib.parse_many(CRIDS))
+    columns = batch.to_numpy()
+    assert columns["show_codes"].tolist() == [0, NO_SHOW, 1, 0]
+    assert columns["starts"].dtype == np.dtype("datetime64[ms]")
+    assert columns["starts"][2] == np.datetime64("1993-03-01T11:00:00.120")
+    assert np.isnat(columns["starts"][3])
+    # zero-copy views on the batch
+    assert np.shares_memory(columns["starts"], np.frombuffer(batch.starts))
+
+
+def test_batch_to_pandas():
+    batch = CRIDBatch.from_crids(cridlib.parse_many(CRIDS))
+    frame = batch.to_pandas()
+    assert frame["show"].value_counts().to_dict() == {"klangbecken": 2, "info": 1}
+    assert frame["start"].iloc[0] == pd.Timestamp(datetime(1993, 3, 1))
+    assert pd.isna(frame["show"].iloc[1])
+    assert pd.isna(frame["start"].iloc[3])
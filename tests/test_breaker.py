@@ -0,0 +1,34 @@
+"""Tests for the circuit breaker."""
+
+from freezegun import freeze_time
+
+from cridlib.breaker import CircuitBreaker
+
+
+def test_circuit_breaker():
+    with freeze_time("1993-03-01 13:00:00") as frozen:
+        breaker = CircuitBreaker(threshold=2, reset_timeout=30)
+        assert breaker.state == "closed"
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == "open"
+        assert not breaker.allow()
+
+        # a single trial after the reset timeout
+        frozen.tick(30)
+        assert breaker.state == "half-open"
+        assert breaker.allow()
+        assert breaker.state == "open"
+        assert not breaker.allow()
+
+        # a failed trial opens the breaker again
+        breaker.record_failure()
+        assert not breaker.allow()
+        frozen.tick(30)
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == "closed"
+        assert breaker.allow()
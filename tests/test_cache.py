@@ -0,0 +1,178 @@
+"""Tests for show lookup caches."""
+
+import os
+import re
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from freezegun import freeze_time
+
+from cridlib.cache import IntervalCache, IntervalIndex, SQLiteIntervalCache
+from cridlib.strategy import past
+
+
+def _dt(hour, minute=0):
+    return datetime(1993, 3, 1, hour, minute, tzinfo=timezone.utc)
+
+
+def test_interval_cache_lookup():
+    cache = IntervalCache()
+    cache.put(_dt(13), _dt(14), "test")
+    cache.put(_dt(14), _dt(15), "next")
+    assert len(cache) == 2  # noqa: PLR2004
+    assert cache.get(_dt(12, 59)) is None
+    assert cache.get(_dt(13)) == "test"
+    assert cache.get(_dt(13, 59)) == "test"
+    assert cache.get(_dt(14)) == "next"
+    assert cache.get(_dt(15)) is None
+
+
+def test_interval_cache_replace():
+    cache = IntervalCache()
+    cache.put(_dt(13), _dt(14), "test")
+    cache.put(_dt(13), _dt(15), "longer")
+    assert len(cache) == 1
+    assert cache.get(_dt(14, 30)) == "longer"
+
+
+def test_interval_cache_lru():
+    cache = IntervalCache(maxsize=2)
+    cache.put(_dt(10), _dt(11), "a")
+    cache.put(_dt(11), _dt(12), "b")
+    assert cache.get(_dt(10, 30)) == "a"
+    cache.put(_dt(12), _dt(13), "c")
+    assert len(cache) == 2  # noqa: PLR2004
+    assert cache.get(_dt(10, 30)) == "a"
+    assert cache.get(_dt(11, 30)) is None
+    assert cache.get(_dt(12, 30)) == "c"
+
+
+def test_interval_cache_ttl():
+    cache = IntervalCache()
+    with freeze_time("1993-03-01 13:00:00") as frozen:
+        cache.put(_dt(13), _dt(14), "test", ttl=60)
+        assert cache.get(_dt(13, 30)) == "test"
+        frozen.tick(61)
+        assert cache.get(_dt(13, 30)) is None
+    assert len(cache) == 0
+
+
+def test_interval_cache_clear():
+    cache = IntervalCache()
+    cache.put(_dt(13), _dt(14), "test")
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.get(_dt(13, 30)) is None
+
+
+def test_interval_index():
+    index = IntervalIndex(
+        [
+            (_dt(14), _dt(15), "next"),
+            (_dt(13), _dt(14), "test"),
+            (_dt(16), _dt(17), "later"),
+        ],
+    )
+    assert len(index) == 3  # noqa: PLR2004
+    assert index.get(_dt(12)) is None
+    assert index.get(_dt(13, 59)) == "test"
+    assert index.get(_dt(14)) == "next"
+    assert index.get(_dt(15, 30)) is None
+    assert index.get(_dt(16, 30)) == "later"
+    assert index.get(_dt(17)) is None
+
+
+def test_sqlite_interval_cache(tmp_path):
+    cache = SQLiteIntervalCache(tmp_path / "cache.sqlite")
+    cache.put(_dt(13), _dt(14), "test")
+    cache.put(_dt(14), _dt(15), "next")
+    assert len(cache) == 2  # noqa: PLR2004
+    assert cache.get(_dt(12, 59)) is None
+    assert cache.get(_dt(13, 59)) == "test"
+    assert cache.get(_dt(14)) == "next"
+    assert cache.get(_dt(15)) is None
+
+    # other processes see the same data
+    other = SQLiteIntervalCache(tmp_path / "cache.sqlite")
+    assert other.get(_dt(13, 30)) == "test"
+    other.put(_dt(13), _dt(14), "replaced")
+    assert cache.get(_dt(13, 30)) == "replaced"
+
+    cache.clear()
+    assert len(other) == 0
+    cache.close()
+    other.close()
+    cache.close()
+
+
+def test_sqlite_interval_cache_ttl(tmp_path):
+    cache = SQLiteIntervalCache(tmp_path / "cache.sqlite")
+    with freeze_time("1993-03-01 13:00:00") as frozen:
+        cache.put(_dt(13), _dt(14), "test", ttl=60)
+        assert cache.get(_dt(13, 30)) == "test"
+        frozen.tick(61)
+        assert cache.get(_dt(13, 30)) is None
+    assert len(cache) == 0
+
+
+def test_sqlite_interval_cache_lru(tmp_path):
+    cache = SQLiteIntervalCache(tmp_path / "cache.sqlite", maxsize=2)
+    with freeze_time("1993-03-01 13:00:00") as frozen:
+        cache.put(_dt(10), _dt(11), "a")
+        frozen.tick(1)
+        cache.put(_dt(11), _dt(12), "b")
+        frozen.tick(61)
+        # recently used entries survive eviction
+        assert cache.get(_dt(10, 30)) == "a"
+        # the third put replaces the same interval until eviction runs again
+        for _ in range(SQLiteIntervalCache._EVICT_EVERY - 1):  # noqa: SLF001
+            cache.put(_dt(12), _dt(13), "c")
+    assert len(cache) == 2  # noqa: PLR2004
+    assert cache.get(_dt(10, 30)) == "a"
+    assert cache.get(_dt(11, 30)) is None
+    assert cache.get(_dt(12, 30)) == "c"
+
+
+def test_sqlite_interval_cache_fork(tmp_path):
+    cache = SQLiteIntervalCache(tmp_path / "cache.sqlite")
+    cache.put(_dt(13), _dt(14), "test")
+    with patch("cridlib.cache.os.getpid", return_value=os.getpid() + 1):
+        assert cache.get(_dt(13, 30)) == "test"
+
+
+def test_sqlite_interval_cache_errors(tmp_path, caplog):
+    cache = SQLiteIntervalCache(tmp_path)
+    cache.put(_dt(13), _dt(14), "test")
+    assert cache.get(_dt(13, 30)) is None
+    assert len(cache) == 0
+    cache.clear()
+    assert [record.message for record in caplog.records] == [
+        f"Failed to write to {tmp_path}",
+        f"Failed to read from {tmp_path}",
+        f"Failed to read from {tmp_path}",
+        f"Failed to write to {tmp_path}",
+    ]
+
+
+def test_past_with_sqlite_cache(tmp_path, requests_mock):
+    archiv_mock = requests_mock.get(
+        re.compile("https://archiv.rabe.ch/api/broadcasts/1993/03/01/.*"),
+        json={
+            "data": [
+                {
+                    "attributes": {
+                        "label": "test",
+                        "started_at": "1993-03-01T14:00:00+01:00",
+                        "finished_at": "1993-03-01T15:00:00+01:00",
+                    },
+                },
+            ],
+        },
+    )
+    with freeze_time("1993-03-10 00:00:00 UTC"):
+        past.set_cache(SQLiteIntervalCache(tmp_path / "cache.sqlite"))
+        assert past.get_show(_dt(13, 12)) == "test"
+        # a new process with an empty memory
+        past.set_cache(SQLiteIntervalCache(tmp_path / "cache.sqlite"))
+        assert past.get_show(_dt(13, 30)) == "test"
+    assert archiv_mock.call_count == 1
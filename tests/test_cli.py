@@ -0,0 +1,109 @@
+"""Tests for the command line interface."""
+
+import io
+import json
+import runpy
+import sys
+
+import pytest
+from freezegun import freeze_time
+
+from cridlib.cli import main
+
+CRIDS = """crid://rabe.ch/v1/klangbecken#t=clock=19930301T131200.00Z
+
+https://rabe.ch/v1/test
+crid://rabe.ch/v1
+"""
+
+
+@pytest.fixture(name="crids_file")
+def fixture_crids_file(tmp_path):
+    path = tmp_path / "crids.txt"
+    path.write_text(CRIDS)
+    return path
+
+
+def test_validate(crids_file, capsys):
+    assert main(["validate", str(crids_file)]) == 1
+    assert capsys.readouterr().out.splitlines() == [
+        "crid://rabe.ch/v1/klangbecken#t=clock=19930301T131200.00Z\tok",
+        "https://rabe.ch/v1/test\tCRIDSchemeMismatchError",
+        "crid://rabe.ch/v1\tok",
+    ]
+
+
+def test_validate_csv(crids_file, capsys):
+    assert main(["validate", "--format", "csv", "--jobs", "2", str(crids_file)]) == 1
+    assert capsys.readouterr().out.splitlines() == [
+        "line,value,valid,error",
+        "1,crid://rabe.ch/v1/klangbecken#t=clock=19930301T131200.00Z,True,",
+        "3,https://rabe.ch/v1/test,False,CRIDSchemeMismatchError",
+        "4,crid://rabe.ch/v1,True,",
+    ]
+
+
+def test_parse(crids_file, capsys):
+    assert main(["parse", "--format", "json", str(crids_file)]) == 1
+    captured = capsys.readouterr()
+    assert [json.loads(line) for line in captured.out.splitlines()] == [
+        {
+            "crid": "crid://rabe.ch/v1/klangbecken#t=clock=19930301T131200.00Z",
+            "version": "v1",
+            "show": "klangbecken",
+            "start": "1993-03-01T13:12:00",
+            "fragment": "t=clock=19930301T131200.00Z",
+        },
+        {
+            "crid": "crid://rabe.ch/v1",
+            "version": "v1",
+            "show": "",
+            "start": "",
+            "fragment": "",
+        },
+    ]
+    assert captured.err == "line 3: CRIDSchemeMismatchError: https://rabe.ch/v1/test\n"
+
+
+def test_parse_text(monkeypatch, capsys):
+    monkeypatch.setattr(sys, "stdin", io.StringIO("crid://rabe.ch/v1\n"))
+    assert main(["parse"]) == 0
+    assert capsys.readouterr().out == "crid://rabe.ch/v1\tv1\t-\t-\t-\n"
+
+
+def test_get(archiv_mock, monkeypatch, capsys):  # noqa: ARG001
+    monkeypatch.setattr(
+        sys,
+        "stdin",
+        io.StringIO(
+            "1993-03-01T13:12:00\n\nnot a timestamp\n1993-03-01T14:12:00+01:00\n",
+        ),
+    )
+    with freeze_time("1993-03-02 00:00:00 UTC"):
+        assert main(["get", "--fragment", "a=b", "--batch-size", "2", "-"]) == 1
+    captured = capsys.readouterr()
+    assert captured.out.splitlines() == [
+        "crid://rabe.ch/v1/test#t=clock=19930301T131200.00Z&a=b",
+        "crid://rabe.ch/v1/test#t=clock=19930301T141200.00Z&a=b",
+    ]
+    assert captured.err == "line 3: invalid timestamp: not a timestamp\n"
+
+
+def test_get_known_show(monkeypatch, capsys, requests_mock):
+    monkeypatch.setattr(sys, "stdin", io.StringIO("1993-03-01T13:12:00Z\n"))
+    assert main(["get", "--show", "Der Morgen", "--format", "csv"]) == 0
+    assert capsys.readouterr().out.splitlines() == [
+        "timestamp,crid",
+        "1993-03-01T13:12:00+00:00,"
+        "crid://rabe.ch/v1/der-morgen#t=clock=19930301T131200.00Z",
+    ]
+    assert requests_mock.call_count == 0
+
+
+def test_main_module(monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["cridlib", "validate"])
+    monkeypatch.setattr(sys, "stdin", io.StringIO("crid://rabe.ch/v1\n"))
+    with pytest.raises(SystemExit) as exit_info:
+        runpy.run_module("cridlib", run_name="__main__")
+    assert exit_info.value.code == 0
+    assert capsys.readouterr().out == "crid://rabe.ch/v1\tok\n"
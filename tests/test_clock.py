@@ -0,0 +1,61 @@
+"""Tests for clock code formatting and parsing."""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from cridlib.clock import format_clock, parse_clock
+
+
+def _timestamps():
+    _random = random.Random(1993)  # noqa: S311
+    _start = datetime(1000, 1, 1)
+    _span = (datetime(9999, 12, 31) - _start).total_seconds()
+    for _ in range(1000):
+        _ts = _start + timedelta(seconds=_random.uniform(0, _span))
+        yield _ts
+        # consecutive timestamps on the same day use the cached date
+        yield _ts.replace(hour=_random.randrange(24), microsecond=999999)
+
+
+def test_format_clock():
+    for ts in _timestamps():
+        assert format_clock(ts) == f"{ts.strftime('%Y%m%dT%H%M%S.%f')[:-4]}Z"
+    ts = datetime(999, 12, 31, 23, 59, 59, 990000)
+    assert format_clock(ts) == f"{ts.strftime('%Y%m%dT%H%M%S.%f')[:-4]}Z"
+    ts = datetime(1993, 3, 1, 13, 12, tzinfo=timezone(timedelta(hours=1)))
+    assert format_clock(ts) == "19930301T131200.00Z"
+
+
+def test_parse_clock():
+    for ts in _timestamps():
+        clock = format_clock(ts)
+        assert parse_clock(clock) == datetime.strptime(clock, "%Y%m%dT%H%M%S.%fZ")  # noqa: DTZ007
+    # other field widths are parsed like strptime does
+    assert parse_clock("19930301T131200.5Z") == datetime(1993, 3, 1, 13, 12, 0, 500000)
+    assert parse_clock("19930301T131200.123456Z") == datetime(
+        1993,
+        3,
+        1,
+        13,
+        12,
+        0,
+        123456,
+    )
+
+
+@pytest.mark.parametrize(
+    "clock",
+    [
+        "19930230T131200.00Z",
+        "19930301T241200.00Z",
+        "19930301T131200.00",
+        "19930301 131200.00Z",
+        "1993030aT131200.00Z",
+        "",
+    ],
+)
+def test_parse_clock_invalid(clock):
+    with pytest.raises(ValueError):  # noqa: PT011
+        parse_clock(clock)
@@ -0,0 +1,113 @@
+"""Tests for the fake upstream APIs."""
+
+import runpy
+import sys
+from datetime import date, datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer
+from itertools import pairwise
+
+import pytest
+import requests
+
+from cridlib import fake
+from cridlib.strategy import future, now, past
+
+NOW = datetime(1993, 3, 1, 11, tzinfo=timezone.utc)
+
+
+@pytest.fixture(name="upstream")
+def fixture_upstream():
+    with fake.FakeUpstream(now=NOW, page_size=4) as upstream, upstream.redirect():
+        yield upstream
+
+
+def test_schedule():
+    """Test that the schedule covers whole days, also when DST starts."""
+    for day in (date(1993, 3, 1), date(1993, 3, 28)):
+        broadcasts = fake.schedule(day)
+        assert broadcasts[0][0] == datetime.combine(day, datetime.min.time(), fake._TZ)  # noqa: SLF001
+        assert broadcasts[-1][1] == broadcasts[0][0] + timedelta(days=1)
+        for (_, end, _), (start, _, _) in pairwise(broadcasts):
+            assert end == start
+    assert [show for _, _, show in fake.schedule(date(1993, 3, 1))][:4] == [
+        "Klangbecken",
+        "Der Morgen",
+        "Jazz Zyt",
+        "Info",
+    ]
+    assert fake.schedule(date(1993, 3, 2))[2][2] == "Rabe am Mittag"
+
+
+def test_archive(upstream):
+    """Test lookups and prefetching from the fake archive."""
+    assert past.get_show(NOW) == "punk-rock-pyjama"
+    assert past.prefetch(NOW, NOW) == len(fake._SLOTS)  # noqa: SLF001
+    assert upstream.requests == {"archive": 4}
+
+
+def test_songticker(upstream):
+    """Test the current show from the fake songticker."""
+    assert now.get_show() == "punk-rock-pyjama"
+    assert upstream.requests == {"songticker": 1}
+
+
+def test_libretime(upstream):
+    """Test the schedule from fake LibreTime."""
+    assert future.get_show(NOW + timedelta(days=6)) == "jazz-zyt"
+    assert future.get_show(NOW + timedelta(days=6, hours=5)) == "punk-rock-pyjama"
+    assert future.get_show(NOW + timedelta(days=8)) == ""
+    assert upstream.requests == {"libretime": 1}
+
+    data = requests.get(
+        f"{upstream.url}/api/live-info-v2/format/json",
+        timeout=1,
+    ).json()
+    assert data["shows"]["current"]["name"] == "Punk Rock Pyjama"
+    assert len(data["shows"]["next"]) == 5  # noqa: PLR2004
+
+
+def test_errors_and_payload():
+    """Test failing requests, padding and the latency."""
+    with fake.FakeUpstream(error_rate=1, error_status=500, padding=100) as upstream:
+        resp = requests.get(f"{upstream.url}/api/broadcasts/1993/03/01", timeout=1)
+        assert resp.status_code == 500  # noqa: PLR2004
+        resp = requests.get(f"{upstream.url}/missing", timeout=1)
+        assert resp.status_code == 404  # noqa: PLR2004
+        upstream.error_rate = 0
+        resp = requests.get(f"{upstream.url}/api/broadcasts/1993/03/01", timeout=1)
+        assert resp.json()["data"][0]["attributes"]["details"] == "x" * 100
+    assert upstream.requests == {"archive": 2}
+
+    first = fake.FakeUpstream(latency=0.1, jitter=0.1, error_rate=0.5, seed=1)
+    second = fake.FakeUpstream(latency=0.1, jitter=0.1, error_rate=0.5, seed=1)
+    delays = [first._delay() for _ in range(10)]  # noqa: SLF001
+    assert delays == [second._delay() for _ in range(10)]  # noqa: SLF001
+    assert all(0.1 <= latency <= 0.2 for latency, _ in delays)  # noqa: PLR2004
+    assert {fail for _, fail in delays} == {True, False}
+    first.stop()
+    second.stop()
+
+
+def test_redirect():
+    """Test that the strategies get pointed back at the real APIs."""
+    url = past._url(NOW)  # noqa: SLF001
+    with fake.FakeUpstream() as upstream, upstream.redirect():
+        assert past._url(NOW).startswith(upstream.url)  # noqa: SLF001
+    assert past._url(NOW) == url  # noqa: SLF001
+
+
+def test_main(monkeypatch, capsys):
+    """Test serving from the command line until interrupted."""
+
+    def interrupt(self):  # noqa: ARG001
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(ThreadingHTTPServer, "serve_forever", interrupt)
+    fake.main(["--port", "0", "--latency", "0.01"])
+    assert capsys.readouterr().out.startswith(
+        "Serving fake upstream APIs on http://127.0.0.1:",
+    )
+
+    monkeypatch.setattr(sys, "argv", ["cridlib.fake", "--port", "0"])
+    monkeypatch.delitem(sys.modules, "cridlib.fake")
+    runpy.run_module("cridlib.fake", run_name="__main__")
@@ -1,6 +1,8 @@
 """Tests for high-level get API."""
 
+import asyncio
 from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
 
 from freezegun import freeze_time
 
@@ -52,3 +54,116 @@ def test_get_future(libretime_mock):  # noqa: ARG001
         )
     assert crid.show is None
     assert str(crid) == "crid://rabe.ch/v1#t=clock=19930308T131200.00Z"
+
+
+def test_get_known_show(requests_mock):
+    """Test meth:`get` with a known show."""
+    crid = cridlib.get(
+        timestamp=datetime(1993, 3, 1, 13, 12, 00, tzinfo=timezone.utc),
+        fragment="myid=1234",
+        show="Der Morgen",
+    )
+    assert str(crid) == (
+        "crid://rabe.ch/v1/der-morgen#t=clock=19930301T131200.00Z&myid=1234"
+    )
+    crid = cridlib.get(show="")
+    assert crid.show is None
+    assert requests_mock.call_count == 0
+
+
+def test_get_escaped_fragment(archiv_mock):  # noqa: ARG001
+    """Test that fragments get escaped like in a parsed CRID."""
+    timestamp = datetime(1993, 3, 1, 13, 12, 00, tzinfo=timezone.utc)
+    with freeze_time("1993-03-02 00:00:00 UTC"):
+        crid = cridlib.get(timestamp, fragment="a b")
+        (many,) = cridlib.get_many([timestamp], fragment="a b")
+    assert str(crid) == "crid://rabe.ch/v1/test#t=clock=19930301T131200.00Z&a%20b"
+    assert many == crid
+    assert cridlib.parse(str(crid)) == crid
+
+
+def test_get_many(klangbecken_mock, archiv_mock, libretime_mock):
+    """Test meth:`get_many` for a mix of current, past and future shows."""
+    timestamps = [
+        datetime(1993, 3, 1, 11, 15, 00, tzinfo=timezone.utc),
+        datetime(1993, 3, 1, 5, 12, 00, tzinfo=timezone.utc),
+        None,
+        datetime(1993, 3, 1, 11, 15, 00, tzinfo=timezone.utc),
+        datetime(1993, 3, 1, 0, 0, 00, tzinfo=timezone.utc),
+        datetime(1993, 3, 1, 5, 12, 00, tzinfo=timezone.utc),
+    ]
+    with freeze_time("1993-03-01 06:00:00 UTC"):
+        crids = cridlib.get_many(timestamps, fragment="myid=1234")
+    assert [str(crid) for crid in crids] == [
+        "crid://rabe.ch/v1/info#t=clock=19930301T111500.00Z&myid=1234",
+        "crid://rabe.ch/v1/test#t=clock=19930301T051200.00Z&myid=1234",
+        "crid://rabe.ch/v1/test#t=clock=19930301T060000.00Z&myid=1234",
+        "crid://rabe.ch/v1/info#t=clock=19930301T111500.00Z&myid=1234",
+        "crid://rabe.ch/v1/test#t=clock=19930301T000000.00Z&myid=1234",
+        "crid://rabe.ch/v1/test#t=clock=19930301T051200.00Z&myid=1234",
+    ]
+    assert crids[0] is crids[3]
+    assert klangbecken_mock.call_count == 1
+    assert archiv_mock.call_count == 2  # noqa: PLR2004
+    assert libretime_mock.call_count == 1
+
+
+def test_get_many_matches_get(archiv_mock):  # noqa: ARG001
+    """Test that meth:`get_many` returns the same CRIDs as meth:`get`."""
+    timestamp = datetime(1993, 3, 1, 13, 12, 00, 123456, tzinfo=timezone.utc)
+    with freeze_time("1993-03-02 00:00:00 UTC"):
+        (crid,) = cridlib.get_many([timestamp])
+        expected = cridlib.get(timestamp)
+    assert str(crid) == str(expected)
+    assert crid.show == expected.show
+    assert crid.start == expected.start
+
+
+def test_get_many_same_instant(archiv_mock):
+    """Test that equal instants in different timezones keep their own clock."""
+    timestamps = [
+        datetime(1993, 3, 1, 0, 0, tzinfo=timezone.utc),
+        datetime(1993, 3, 1, 1, 0, tzinfo=ZoneInfo("Europe/Zurich")),
+    ]
+    with freeze_time("1993-03-02 00:00:00 UTC"):
+        crids = cridlib.get_many(timestamps)
+        assert [str(crid) for crid in crids] == [
+            str(cridlib.get(timestamp)) for timestamp in timestamps
+        ]
+    assert [str(crid) for crid in crids] == [
+        "crid://rabe.ch/v1/test#t=clock=19930301T000000.00Z",
+        "crid://rabe.ch/v1/test#t=clock=19930301T010000.00Z",
+    ]
+    assert archiv_mock.call_count == 3  # noqa: PLR2004
+
+
+def test_get_many_concurrent(archiv_mock):  # noqa: ARG001
+    """Test meth:`get_many` with parallel lookups."""
+    timestamps = [
+        datetime(1993, 3, 1, 13, minute, 00, tzinfo=timezone.utc)
+        for minute in range(10)
+    ]
+    with freeze_time("1993-03-02 00:00:00 UTC"):
+        crids = cridlib.get_many(timestamps, max_workers=4)
+    assert [crid.show for crid in crids] == ["test"] * 10
+    assert [crid.start.minute for crid in crids if crid.start] == list(range(10))
+
+
+def test_aget(archiv_mock, klangbecken_mock, libretime_mock):  # noqa: ARG001
+    """Test meth:`aget` for past, current and future shows."""
+    with freeze_time("1993-03-02 00:00:00 UTC", real_asyncio=True):
+        crid = asyncio.run(
+            cridlib.aget(
+                timestamp=datetime(1993, 3, 1, 13, 12, 00, tzinfo=timezone.utc),
+                fragment="myid=1234",
+            ),
+        )
+    assert str(crid) == "crid://rabe.ch/v1/test#t=clock=19930301T131200.00Z&myid=1234"
+
+    assert asyncio.run(cridlib.aget()).show == "test"
+
+    with freeze_time("1993-03-01 00:00:00 UTC", real_asyncio=True):
+        crid = asyncio.run(
+            cridlib.aget(datetime(1993, 3, 1, 11, 15, 00, tzinfo=timezone.utc)),
+        )
+    assert str(crid) == "crid://rabe.ch/v1/info#t=clock=19930301T111500.00Z"
@@ -0,0 +1,82 @@
+"""Tests for lazy imports."""
+
+import json
+import subprocess
+import sys
+
+HEAVY_MODULES = [
+    "asyncio",
+    "requests",
+    "slugify",
+    "uritools",
+    "urllib3",
+    "xml.etree.ElementTree",
+    "zoneinfo",
+]
+
+PARSE_ONLY = f"""
+import json, sys
+import cridlib
+crid = cridlib.parse("crid://rabe.ch/v1/klangbecken#t=clock=19930301T131200.00Z")
+crid.start
+print(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))
+"""
+
+
+def test_parse_only_imports():
+    """Test that parsing CRIDs does not load the HTTP stack."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", PARSE_ONLY],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    assert json.loads(result.stdout) == []
+
+
+INDEX_ONLY = f"""
+import json, sys
+from cridlib.index import BroadcastIndex, build_index, from_raar
+list(from_raar({{"data": []}}))
+print(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))
+"""
+
+
+def test_index_imports():
+    """Test that the index imports on its own without the HTTP stack."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", INDEX_ONLY],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    assert json.loads(result.stdout) == []
+
+
+HTTP_MODULES = ["asyncio", "requests", "uritools", "urllib3"]
+
+KNOWN_SHOW = f"""
+import json, sys
+from datetime import datetime
+import cridlib
+from cridlib.cli import main
+cridlib.get(datetime(1993, 3, 1, 13, 12), show="Der Morgen")
+main(["get", "--show", "Der Morgen"])
+loaded = [name for name in {HTTP_MODULES!r} if name in sys.modules]
+print(json.dumps(loaded), file=sys.stderr)
+"""
+
+
+def test_known_show_imports():
+    """Test that getting CRIDs for known shows does not load the HTTP stack."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", KNOWN_SHOW],
+        capture_output=True,
+        check=True,
+        input="1993-03-01T13:12:00\n",
+        text=True,
+    )
+    assert result.stdout == (
+        "crid://rabe.ch/v1/der-morgen#t=clock=19930301T131200.00Z\n"
+    )
+    assert json.loads(result.stderr) == []
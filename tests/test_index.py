@@ -0,0 +1,115 @@
+"""Tests for the local broadcast index."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from cridlib.index import BroadcastIndex, build_index, from_libretime, from_raar
+
+RAAR_EXPORT = {
+    "data": [
+        {
+            "attributes": {
+                "label": "Klangbecken",
+                "started_at": "1993-03-01T00:00:00+01:00",
+                "finished_at": "1993-03-01T08:00:00+01:00",
+            },
+        },
+        {"attributes": {"label": "no times"}},
+        {
+            "attributes": {
+                "label": "Der Morgen",
+                "started_at": "1993-03-01T08:00:00+01:00",
+                "finished_at": "1993-03-01T11:00:00+01:00",
+            },
+        },
+        {
+            "attributes": {
+                "label": "Klangbecken",
+                "started_at": "1993-03-01T14:00:00+01:00",
+                "finished_at": "1993-03-02T00:00:00+01:00",
+            },
+        },
+    ],
+}
+
+
+def _dt(hour, minute=0):
+    return datetime(1993, 3, 1, hour, minute, tzinfo=timezone.utc)
+
+
+def test_build_index(tmp_path):
+    path = tmp_path / "broadcasts.idx"
+    assert build_index(path, from_raar(RAAR_EXPORT)) == 3  # noqa: PLR2004
+    with BroadcastIndex(path) as index:
+        assert len(index) == 3  # noqa: PLR2004
+        assert index.start == _dt(0).replace(day=28, month=2, hour=23)
+        assert index.end == _dt(23)
+        assert index.get(_dt(0)) == "klangbecken"
+        assert index.get(_dt(7)) == "der-morgen"
+        # gap between broadcasts and half-open intervals
+        assert index.get(_dt(10)) is None
+        assert index.get(_dt(12, 59)) is None
+        assert index.get(_dt(13)) == "klangbecken"
+        assert index.get(_dt(0).replace(day=28, month=2)) is None
+        assert index.covers(_dt(10))
+        assert not index.covers(_dt(23))
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_build_index_replaces(tmp_path):
+    path = tmp_path / "broadcasts.idx"
+    build_index(path, from_raar(RAAR_EXPORT))
+    index = BroadcastIndex(path)
+    build_index(path, [(_dt(0), _dt(1), "first"), (_dt(0), _dt(1), "second")])
+    # the loaded index keeps its contents
+    assert index.get(_dt(0)) == "klangbecken"
+    index.close()
+    with BroadcastIndex(path) as index:
+        assert len(index) == 1
+        assert index.get(_dt(0)) == "second"
+
+
+def test_build_index_empty(tmp_path):
+    path = tmp_path / "broadcasts.idx"
+    assert build_index(path, []) == 0
+    with BroadcastIndex(path) as index:
+        assert len(index) == 0
+        assert index.get(_dt(0)) is None
+        assert not index.covers(_dt(0))
+
+
+def test_from_libretime(tmp_path):
+    path = tmp_path / "broadcasts.idx"
+    build_index(
+        path,
+        from_libretime(
+            {
+                "shows": {
+                    "next": [
+                        {
+                            "url": "https://rabe.ch/info",
+                            "starts": "1993-03-01 11:00:00",
+                            "ends": "1993-03-01 11:30:00",
+                        },
+                    ],
+                },
+            },
+        ),
+    )
+    with BroadcastIndex(path) as index:
+        assert index.get(_dt(11, 15)) == "info"
+
+
+def test_invalid_index(tmp_path):
+    path = tmp_path / "broadcasts.idx"
+    path.write_bytes(b"CRID")
+    with pytest.raises(ValueError, match="is not a broadcast index"):
+        BroadcastIndex(path)
+
+    build_index(path, [])
+    data = bytearray(path.read_bytes())
+    data[8:16] = data[8:16][::-1]
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="other byte order"):
+        BroadcastIndex(path)
@@ -0,0 +1,94 @@
+"""Tests for instrumentation hooks."""
+
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from freezegun import freeze_time
+
+import cridlib
+from cridlib import instrument
+from cridlib.util import _InstrumentedRetry
+
+
+@pytest.fixture(name="events")
+def fixture_events():
+    events = []
+    instrument.set_hook(events.append)
+    return events
+
+
+def _summary(events):
+    return [(event.kind, event.name, event.outcome) for event in events]
+
+
+def test_past(archiv_mock, events):  # noqa: ARG001
+    timestamp = datetime(1993, 3, 1, 13, 12, tzinfo=timezone.utc)
+    with freeze_time("1993-03-02 00:00:00 UTC"):
+        cridlib.get(timestamp)
+    assert _summary(events) == [
+        ("cache", "past", "miss"),
+        ("request", "archiv.rabe.ch", "200"),
+        ("parse", "past", "ok"),
+        ("resolve", "past", "ok"),
+        ("canonicalize", "show", "ok"),
+    ]
+    assert all(
+        event.duration is not None and event.duration >= 0
+        for event in events
+        if event.kind != "cache"
+    )
+
+
+def test_now_and_future(klangbecken_mock, libretime_mock, events):  # noqa: ARG001
+    with freeze_time("1993-03-01 00:00:00 UTC"):
+        cridlib.get()
+        cridlib.get(datetime(1993, 3, 1, 11, 15, tzinfo=timezone.utc))
+        cridlib.get(datetime(1993, 3, 1, 11, 20, tzinfo=timezone.utc))
+    assert _summary(events) == [
+        ("cache", "now", "miss"),
+        ("request", "songticker.rabe.ch", "200"),
+        ("parse", "now", "ok"),
+        ("resolve", "now", "ok"),
+        ("canonicalize", "show", "ok"),
+        ("cache", "future", "miss"),
+        ("request", "airtime.service.int.rabe.ch", "200"),
+        ("parse", "future", "ok"),
+        ("resolve", "future", "ok"),
+        ("canonicalize", "show", "ok"),
+        ("cache", "future", "hit"),
+        ("resolve", "future", "ok"),
+        ("canonicalize", "show", "ok"),
+    ]
+
+
+def test_failures(events, caplog):
+    with pytest.raises(ValueError), instrument.timed("parse", "test"):  # noqa: PT011
+        raise ValueError
+    assert _summary(events) == [("parse", "test", "ValueError")]
+
+    def _failing(event):
+        raise RuntimeError(event)
+
+    instrument.set_hook(_failing)
+    instrument.emit("cache", "test", outcome="hit")
+    assert caplog.records[0].message == "Instrumentation hook failed for cache test"
+
+
+def test_retry(events):
+    retry = _InstrumentedRetry(total=3)
+    pool = MagicMock(host="archiv.rabe.ch")
+    retry = retry.increment(error=ConnectionError(), _pool=pool)
+    retry = retry.increment(response=MagicMock(status=503, retries=None), _pool=pool)
+    retry.increment()
+    assert _summary(events) == [
+        ("retry", "archiv.rabe.ch", "ConnectionError"),
+        ("retry", "archiv.rabe.ch", "503"),
+        ("retry", "", "unknown"),
+    ]
+    assert events[0].duration is None
+
+
+def test_disabled():
+    assert instrument.timed("parse", "test") is instrument.timed("cache", "test")
+    instrument.emit("cache", "test")
@@ -1,5 +1,6 @@
 """Test high level cridlib API."""
 
+import pickle
 from datetime import datetime
 
 import pytest
@@ -74,3 +75,138 @@ def test_crid_missing_media_fragment():
 )
 def test_canonicalize_show(show, expected):
     assert expected == cridlib.lib.canonicalize_show(show)
+
+
+def test_canonicalize_show_cached():
+    assert cridlib.lib.seed_slugs(["Klangbecken", "Info", "Klangbecken"]) == 2  # noqa: PLR2004
+    assert cridlib.lib.canonicalize_show("Info") == "info"
+    assert cridlib.lib.canonicalize_show("Der Morgen") == "der-morgen"
+    assert cridlib.lib.slug_cache_info() == (2, 3, 4096, 3)
+    cridlib.lib.clear_slug_cache()
+    assert cridlib.lib.slug_cache_info() == (0, 0, 4096, 0)
+
+
+def test_crid_from_parts():
+    crid = cridlib.lib.CRID.from_parts(
+        "test",
+        datetime(1993, 3, 1, 13, 12, 0, 129999),
+        fragment="myid=1234",
+    )
+    assert str(crid) == "crid://rabe.ch/v1/test#t=clock=19930301T131200.12Z&myid=1234"
+    assert crid.version == "v1"
+    assert crid.show == "test"
+    assert crid.start == datetime(1993, 3, 1, 13, 12, 0, 120000)
+    assert crid.path == cridlib.lib.CRID(str(crid)).path
+
+    crid = cridlib.lib.CRID.from_parts(None, datetime(1993, 3, 1, 13, 12))
+    assert str(crid) == "crid://rabe.ch/v1#t=clock=19930301T131200.00Z"
+    assert crid.show is None
+
+
+@pytest.mark.parametrize(
+    ("fragment", "expected"),
+    [
+        ("myid=1234", "myid=1234"),
+        ("a b", "a%20b"),
+        ("a%20b", "a%2520b"),
+        ("ü#x", "%C3%BC%23x"),
+    ],
+)
+def test_crid_from_parts_escaped_fragment(fragment, expected):
+    crid = cridlib.lib.CRID.from_parts("test", datetime(1993, 3, 1, 13, 12), fragment)
+    assert str(crid) == f"crid://rabe.ch/v1/test#t=clock=19930301T131200.00Z&{expected}"
+    assert crid.fragment == f"t=clock=19930301T131200.00Z&{fragment}"
+    assert cridlib.lib.CRID(str(crid)) == crid
+
+
+@pytest.mark.parametrize(
+    "crid_str",
+    [
+        "crid://rabe.ch/v1",
+        "crid://rabe.ch/v1/test",
+        "crid://rabe.ch/v1/test#t=clock=19930301T131200.00Z",
+        "crid://rabe.ch/v1/test_2#t=clock=19930301T131200.99Z&myid=1234&t=x",
+        "crid://rabe.ch/v1#t=clock=19930301T131200.00Z",
+        # unusual CRIDs that get parsed the slow way
+        "crid://rabe.ch/v1/v1",
+        "crid://rabe.ch/v1/test.mp3#t=clock=19930301T131200.00Z",
+        "crid://rabe.ch/v1/%C3%A0-suivre#t=clock=19930301T131200.00Z",
+        "crid://rabe.ch/v1/test#myid=1234&t=clock=19930301T131200.00Z",
+    ],
+)
+def test_crid_fast_path_matches_generic(crid_str):
+    crid = cridlib.lib.CRID(crid_str)
+    generic = cridlib.lib.CRID.__new__(cridlib.lib.CRID)
+    generic._parse_uri(crid_str)  # noqa: SLF001
+    assert str(crid) == str(generic)
+    assert crid.scheme == generic.scheme
+    assert crid.authority == generic.authority
+    assert crid.path == generic.path
+    assert crid.fragment == generic.fragment
+    assert crid.version == generic.version
+    assert crid.show == generic.show
+    assert crid.start == generic.start
+
+
+@pytest.mark.parametrize(
+    "crid_str",
+    [
+        "crid://rabe.ch/v1/test#t=clock=19931301T131200.00Z",
+        "crid://rabe.ch/v1/test#t=clock=19931301T131200.00Z&myid=%20",
+    ],
+)
+def test_crid_malformed_media_fragment(crid_str):
+    with pytest.raises(cridlib.lib.CRIDMalformedMediaFragmentError):
+        cridlib.lib.CRID(crid_str)
+
+
+def test_crid_invalid_date():
+    for clock in ("19930230T131200.00Z", "19930229T131200.00Z", "19930431T131200.00Z"):
+        with pytest.raises(cridlib.lib.CRIDMalformedMediaFragmentError):
+            cridlib.lib.CRID(f"crid://rabe.ch/v1/test#t=clock={clock}")
+    crid = cridlib.lib.CRID("crid://rabe.ch/v1/test#t=clock=19960229T131200.00Z")
+    assert crid.start == datetime(1996, 2, 29, 13, 12)
+
+
+def test_crid_immutable():
+    crid = cridlib.lib.CRID("crid://rabe.ch/v1/test#t=clock=19930301T131200.00Z")
+    with pytest.raises(AttributeError):
+        crid._show = "other"  # type: ignore[misc]  # noqa: SLF001
+    with pytest.raises(cridlib.lib.CRIDImmutableError):
+        del crid._show  # noqa: SLF001
+    with pytest.raises(AttributeError):
+        crid.__dict__  # noqa: B018
+    assert crid.show == "test"
+
+
+def test_crid_value_semantics():
+    crid_str = "crid://rabe.ch/v1/test#t=clock=19930301T131200.00Z"
+    crid = cridlib.lib.CRID(crid_str)
+    same = cridlib.lib.CRID.from_parts("test", datetime(1993, 3, 1, 13, 12))
+    other = cridlib.lib.CRID(f"{crid_str}&myid=1234")
+    assert crid == same
+    assert crid != other
+    assert crid != crid_str
+    assert hash(crid) == hash(same)
+    assert {crid, same, other} == {crid, other}
+    assert pickle.loads(pickle.dumps(crid)) == crid  # noqa: S301
+
+
+def test_crid_ordering():
+    crids = [
+        cridlib.lib.CRID("crid://rabe.ch/v1/test#t=clock=19930301T131200.00Z"),
+        cridlib.lib.CRID("crid://rabe.ch/v1/info#t=clock=19930301T131200.00Z"),
+        cridlib.lib.CRID("crid://rabe.ch/v1/test"),
+        cridlib.lib.CRID("crid://rabe.ch/v1#t=clock=19930301T131200.00Z"),
+        cridlib.lib.CRID("crid://rabe.ch/v1/test#t=clock=19930301T120000.00Z"),
+    ]
+    assert [str(crid) for crid in sorted(crids)] == [
+        "crid://rabe.ch/v1#t=clock=19930301T131200.00Z",
+        "crid://rabe.ch/v1/info#t=clock=19930301T131200.00Z",
+        "crid://rabe.ch/v1/test",
+        "crid://rabe.ch/v1/test#t=clock=19930301T120000.00Z",
+        "crid://rabe.ch/v1/test#t=clock=19930301T131200.00Z",
+    ]
+    assert crids[1] <= crids[0]
+    with pytest.raises(TypeError):
+        assert crids[0] < "crid://rabe.ch/v1"
@@ -1,6 +1,18 @@
 """Test parse high-level api."""
 
+from typing import TYPE_CHECKING
+
+import pytest
+
 import cridlib
+from cridlib.lib import (
+    CRIDMalformedMediaFragmentError,
+    CRIDMissingMediaFragmentError,
+    CRIDSchemeAuthorityMismatchError,
+)
+
+if TYPE_CHECKING:
+    from cridlib.parse import InvalidCRID
 
 
 def test_parse():
@@ -9,3 +21,75 @@ def test_parse():
     # hour zero case
     value = "crid://rabe.ch/v1/show#t=clock=19930301T131200.00Z"
     cridlib.parse(value)
+
+
+def test_parse_many():
+    """Test parse_many with the default raise policy."""
+    crids = cridlib.parse_many(
+        [
+            "crid://rabe.ch/v1/show#t=clock=19930301T131200.00Z\n",
+            "\n",
+            "crid://rabe.ch/v1/other\n",
+            "crid://example.org/v1/show\n",
+        ],
+    )
+    assert str(next(crids)) == "crid://rabe.ch/v1/show#t=clock=19930301T131200.00Z"
+    assert str(next(crids)) == "crid://rabe.ch/v1/other"
+    with pytest.raises(CRIDSchemeAuthorityMismatchError) as exc_info:
+        next(crids)
+    assert exc_info.value.__notes__ == ["line 4: crid://example.org/v1/show"]
+
+
+def test_parse_many_skip():
+    """Test parse_many skipping invalid values."""
+    crids = cridlib.parse_many(
+        ["crid://rabe.ch/vX/show", "crid://rabe.ch/v1/show"],
+        on_error="skip",
+    )
+    assert [str(crid) for crid in crids] == ["crid://rabe.ch/v1/show"]
+
+
+def test_parse_many_impossible_date():
+    """Test that dates that don't exist are invalid with every policy."""
+    values = [
+        "crid://rabe.ch/v1/show#t=clock=19930230T131200.00Z",
+        "crid://rabe.ch/v1/show#t=clock=19930228T131200.00Z",
+    ]
+    with pytest.raises(CRIDMalformedMediaFragmentError):
+        list(cridlib.parse_many(values))
+    assert [str(crid) for crid in cridlib.parse_many(values, on_error="skip")] == [
+        values[1],
+    ]
+    errors: list[InvalidCRID] = []
+    assert len(list(cridlib.parse_many(values, on_error="collect", errors=errors))) == 1
+    assert [error.lineno for error in errors] == [1]
+    assert isinstance(errors[0].error, CRIDMalformedMediaFragmentError)
+
+
+def test_parse_many_invalid_policy():
+    """Test that bad policies fail before parsing anything."""
+    with pytest.raises(ValueError, match="errors list is needed"):
+        cridlib.parse_many([], on_error="collect")
+    with pytest.raises(ValueError, match="unknown on_error policy: ignore"):
+        cridlib.parse_many([], on_error="ignore")  # type: ignore[arg-type]
+
+
+def test_parse_file(tmp_path):
+    """Test parse_file collecting invalid lines."""
+    path = tmp_path / "crids.txt"
+    path.write_text(
+        "crid://rabe.ch/v1/show#t=clock=19930301T131200.00Z\n"
+        "crid://rabe.ch/v1/show#t=wrong=10\n"
+        "\n"
+        "crid://rabe.ch/v1\n",
+    )
+    errors: list[InvalidCRID] = []
+    crids = list(cridlib.parse_file(path, on_error="collect", errors=errors))
+    assert [str(crid) for crid in crids] == [
+        "crid://rabe.ch/v1/show#t=clock=19930301T131200.00Z",
+        "crid://rabe.ch/v1",
+    ]
+    assert len(errors) == 1
+    assert errors[0].lineno == 2  # noqa: PLR2004
+    assert errors[0].value == "crid://rabe.ch/v1/show#t=wrong=10"
+    assert isinstance(errors[0].error, CRIDMissingMediaFragmentError)
@@ -0,0 +1,20 @@
+"""Test prefetch high-level api."""
+
+from datetime import datetime, timezone
+
+from freezegun import freeze_time
+
+import cridlib
+
+
+def test_prefetch(archiv_day_mock, requests_mock):  # noqa: ARG001
+    """Test that get() is served from memory after prefetch()."""
+    with freeze_time("1993-03-10 00:00:00 UTC"):
+        cridlib.prefetch(
+            datetime(1993, 3, 1, 0, 0, tzinfo=timezone.utc),
+            datetime(1993, 3, 1, 12, 0, tzinfo=timezone.utc),
+        )
+        request_count = requests_mock.call_count
+        crid = cridlib.get(datetime(1993, 3, 1, 8, 30, tzinfo=timezone.utc))
+    assert str(crid) == "crid://rabe.ch/v1/der-morgen#t=clock=19930301T083000.00Z"
+    assert requests_mock.call_count == request_count
@@ -0,0 +1,96 @@
+"""Tests for concurrent show resolution."""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from cridlib import resolve
+
+NOW = datetime(1993, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class _Tracker:
+    """Fake strategy lookup that records how many calls run at once."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running: dict[str, int] = {}
+        self.peak: dict[str, int] = {}
+        self.calls: list[datetime] = []
+        self.threads: set[int] = set()
+
+    def get_show(self, timestamp, now_):
+        _name = self.start(timestamp, now_)
+        time.sleep(0.01)
+        return self.stop(_name, timestamp)
+
+    async def aget_show(self, timestamp, now_):
+        _name = self.start(timestamp, now_)
+        await asyncio.sleep(0.01)
+        return self.stop(_name, timestamp)
+
+    def start(self, timestamp, now_):
+        _name = resolve.strategy.name(timestamp, now_)
+        with self.lock:
+            self.calls.append(timestamp)
+            self.threads.add(threading.get_ident())
+            self.running[_name] = self.running.get(_name, 0) + 1
+            self.peak[_name] = max(self.peak.get(_name, 0), self.running[_name])
+        return _name
+
+    def stop(self, name, timestamp):
+        with self.lock:
+            self.running[name] -= 1
+        return f"{name}-{timestamp.hour:02d}{timestamp.minute:02d}"
+
+
+@pytest.fixture(name="tracker")
+def fixture_tracker():
+    tracker = _Tracker()
+    with (
+        patch("cridlib.strategy.get_show", tracker.get_show),
+        patch("cridlib.strategy.aget_show", tracker.aget_show),
+    ):
+        yield tracker
+
+
+TIMESTAMPS = [
+    *(NOW - timedelta(minutes=minute) for minute in range(1, 13)),
+    NOW,
+    *(NOW + timedelta(minutes=minute) for minute in range(1, 5)),
+    NOW - timedelta(minutes=1),
+]
+EXPECTED = [
+    *(f"past-11{60 - minute:02d}" for minute in range(1, 13)),
+    "now-1200",
+    *(f"future-12{minute:02d}" for minute in range(1, 5)),
+    "past-1159",
+]
+
+
+def test_resolve_shows(tracker):
+    shows = resolve.resolve_shows(TIMESTAMPS, now=NOW, max_workers=8, max_per_host=3)
+    assert shows == EXPECTED
+    assert len(tracker.calls) == len(set(TIMESTAMPS))
+    assert tracker.peak["past"] <= 3  # noqa: PLR2004
+    assert tracker.peak["future"] <= 3  # noqa: PLR2004
+
+
+def test_aresolve_shows(tracker):
+    shows = asyncio.run(resolve.aresolve_shows(TIMESTAMPS, now=NOW, max_per_host=2))
+    assert shows == EXPECTED
+    assert len(tracker.calls) == len(set(TIMESTAMPS))
+    assert tracker.peak["past"] == 2  # noqa: PLR2004
+    assert tracker.threads == {threading.get_ident()}
+
+
+def test_resolve_shows_default_now(tracker):
+    with patch("cridlib.resolve.datetime") as mock_datetime:
+        mock_datetime.now.return_value = NOW
+        assert resolve.resolve_shows([NOW]) == ["now-1200"]
+        assert asyncio.run(resolve.aresolve_shows([NOW])) == ["now-1200"]
+    assert len(tracker.calls) == 2  # noqa: PLR2004
@@ -0,0 +1,83 @@
+"""Tests for utility functions."""
+
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+from urllib3.exceptions import MaxRetryError
+
+from cridlib import util
+
+DEFAULT_RETRIES = 5
+POOL_MAXSIZE = 32
+
+
+def test_get_session_is_shared():
+    session = util.get_session()
+    assert util.get_session() is session
+    adapter = session.get_adapter("https://archiv.rabe.ch/")
+    assert adapter.max_retries.total == DEFAULT_RETRIES  # type: ignore[attr-defined]
+    assert session.get_adapter("http://localhost/") is adapter
+
+
+def test_get_session_after_fork():
+    session = util.get_session()
+    with patch("cridlib.util.os.getpid", return_value=os.getpid() + 1):
+        assert util.get_session() is not session
+    util._after_fork_in_child()  # noqa: SLF001
+    assert util.get_session() is not session
+
+
+def test_configure_session():
+    session = util.get_session()
+    util.configure_session(retries=1, pool_maxsize=POOL_MAXSIZE, keep_alive=False)
+    configured = util.get_session()
+    assert configured is not session
+    adapter = configured.get_adapter("https://archiv.rabe.ch/")
+    assert adapter.max_retries.total == 1  # type: ignore[attr-defined]
+    assert adapter._pool_maxsize == POOL_MAXSIZE  # type: ignore[attr-defined]  # noqa: SLF001
+    assert configured.headers["Connection"] == "close"
+
+    util.reset_session()
+    adapter = util.get_session().get_adapter("https://archiv.rabe.ch/")
+    assert adapter.max_retries.total == DEFAULT_RETRIES  # type: ignore[attr-defined]
+
+
+def test_configure_session_unknown():
+    with pytest.raises(TypeError, match="unknown session settings: foo"):
+        util.configure_session(foo=1)
+
+
+def test_close_session():
+    session = util.get_session()
+    with patch.object(session, "close") as mock_close:
+        util.close_session()
+    mock_close.assert_called_once()
+    assert util.get_session() is not session
+    util.close_session()
+    util.close_session()
+
+
+def test_deadline():
+    assert util.time_left() is None
+    assert util.request_timeout(10) == 10  # noqa: PLR2004
+    with util.deadline(None):
+        assert util.time_left() is None
+    with util.deadline(5):
+        assert 0 < util.request_timeout(10) <= 5  # noqa: PLR2004
+        with util.deadline(10):
+            assert util.request_timeout(10) <= 5  # noqa: PLR2004
+        with util.deadline(0), pytest.raises(TimeoutError, match="deadline passed"):
+            util.request_timeout(10)
+    assert util.time_left() is None
+
+
+def test_retry_deadline():
+    retry = util._InstrumentedRetry(total=3, backoff_factor=1)  # noqa: SLF001
+    pool = MagicMock(host="archiv.rabe.ch")
+    with util.deadline(5):
+        retry = retry.increment(error=ConnectionError(), _pool=pool)
+        # the second retry has a backoff of 2s
+        with util.deadline(1), pytest.raises(MaxRetryError):
+            retry.increment(error=ConnectionError(), _pool=pool)
+        retry.increment(error=ConnectionError(), _pool=pool)